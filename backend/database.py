@@ -1,100 +1,1066 @@
+import atexit
+import bisect
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import date as date_cls
 
+from backend import profiling
+from backend.fileio import atomic_write_json, atomic_write_text, fsync_dir, read_json_with_backup
+from backend.profiling import traced
+from backend.search import SearchIndex
+
 # Path to local JSON cache
 CACHE_FILE = "cache/tasks.json"
+SQLITE_FILE = "cache/tasks.db"
+SETTINGS_FILE = "cache/settings.json"
+
+# Storage engine, chosen by the "storage" key in settings.json or the
+# TODO_STORAGE environment variable:
+#   "json"    – rewrites tasks.json on each change (default)
+#   "journal" – appends one JSON line per change and compacts in the background
+#   "sqlite"  – cache/tasks.db, indexed and updated in place
+#   "postgres" – shared PostgreSQL database ("postgres_dsn" / TODO_PG_DSN)
+ENGINES = ("json", "journal", "sqlite", "postgres")
+DEFAULT_ENGINE = "json"
+
+# Upper bound of pooled PostgreSQL connections ("postgres_pool_size")
+PG_POOL_SIZE = 4
+
+# Journal size after which it is folded into a new tasks.json snapshot
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Default flush policy of the background writer ("flush" in settings.json)
+FLUSH_IDLE_MS = 300
+FLUSH_MAX_PENDING = 50
 
 # Ensure cache directory exists
 os.makedirs("cache", exist_ok=True)
 
-def _load():
-    if not os.path.exists(CACHE_FILE):
-        return {"tasks": [], "users": []}
+
+def _empty():
+    return {"meta": {"next_task_id": 1, "next_user_id": 1}, "tasks": [], "users": []}
+
+
+class _Store:
+    """Process-wide in-memory copy of CACHE_FILE.
+
+    The file is parsed once; reads are served from memory. Mutations are
+    expressed as small operation dicts (see ``apply``), queued in ``pending``
+    and written out by ``commit()``. Before every access the on-disk stamp is
+    compared with the one we last read or wrote, so edits made outside the
+    process are picked up instead of being overwritten with stale data;
+    ``commit()`` checks it again and replays the queued operations on top of
+    a file that changed while they waited for the writer.
+
+    Tasks are kept in ``by_id`` (id -> task, insertion order) with a
+    ``by_date`` index (ISO date -> tasks of that day) plus a sorted list of
+    the dates for range queries.
+
+    ``meta`` holds the id counters (``next_task_id``, ``next_user_id``). They
+    are saved in the file header and only ever grow, so an id freed by a
+    delete is never handed out again.
+
+    This class persists by rewriting the whole snapshot; ``_JournalStore``
+    appends the pending operations instead.
+
+    ``commit()`` may run on a background thread (see ``_BackgroundWriter``):
+    pending changes are taken and serialized under ``lock``, and the disk
+    write happens outside it, so readers are not blocked by I/O. File
+    writes are ordered by ``io_lock``; take it before ``lock``, never after:
+    ``commit()`` must not be called while holding ``lock`` unless the thread
+    already holds ``io_lock`` (which is reentrant for that case).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + ".journal"
+        self.lock = threading.RLock()
+        self.io_lock = threading.RLock()
+        self.pending = []
+        self._writing = False
+        self._loaded = False
+        self._stamp = None
+        # Вызывается (под lock), когда файл изменили извне и он перечитан
+        self.on_reload = None
+        self.users = []
+        self.meta = {"next_task_id": 1, "next_user_id": 1}
+        self.by_id = {}
+        self.by_date = {}
+        self.dates = []
+
+    def _file_stamp(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _disk_stamp(self):
+        return (self._file_stamp(self.path), self._file_stamp(self.journal_path))
+
+    def _read_file(self) -> bool:
+        """Load the snapshot and replay the journal; True if the journal was repaired."""
+        data = read_json_with_backup(self.path)
+        if data is None:
+            data = _empty()
+        # Старый формат README: просто список задач с ключом "date" и без location
+        if isinstance(data, list):
+            tasks = []
+            for t in data:
+                t = dict(t)
+                if "task_date" not in t:
+                    t["task_date"] = t.pop("date")
+                t.setdefault("location", None)
+                t.setdefault("done", False)
+                tasks.append(t)
+            data = {"tasks": tasks, "users": []}
+        self.users = list(data.get("users", []))
+        self.by_id = {t["id"]: t for t in data.get("tasks", [])}
+        meta = data.get("meta") or {}
+        # Файл без заголовка (старый формат) или правленный вручную: счётчики
+        # не меньше max(id) + 1, иначе новая задача заняла бы чужой id
+        self.meta = dict(meta)
+        self.meta["next_task_id"] = max(int(meta.get("next_task_id", 1)), max(self.by_id, default=0) + 1)
+        self.meta["next_user_id"] = max(int(meta.get("next_user_id", 1)),
+                                        max((u["id"] for u in self.users), default=0) + 1)
+        self._reindex()
+        # Журнал мог остаться от движка "journal" — всегда доигрываем его
+        ops, repaired = self._read_journal()
+        for op in ops:
+            self.apply(op, record=False)
+        return repaired
+
+    def _read_journal(self):
+        """(operations, repaired): the journal's complete lines.
+
+        A line torn by a crash is cut off the file (and a last line missing
+        only its newline gets one), so the next append starts on a fresh line
+        instead of gluing itself to the broken bytes.
+        """
+        if not os.path.exists(self.journal_path):
+            return [], False
+        ops = []
+        good = 0
+        fix = None
+        with open(self.journal_path, "rb") as f:
+            for raw in f:
+                line = raw.strip()
+                if line:
+                    try:
+                        ops.append(json.loads(line))
+                    except ValueError:
+                        # Оборванная строка после сбоя — всё, что дальше, не записалось
+                        fix = "truncate"
+                        break
+                good += len(raw)
+                if not raw.endswith(b"\n"):
+                    fix = "newline"
+        if fix is None:
+            return ops, False
+        try:
+            with open(self.journal_path, "r+b") as f:
+                if fix == "truncate":
+                    f.truncate(good)
+                else:
+                    f.seek(good)
+                    f.write(b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            return ops, False
+        return ops, True
+
+    def ensure_loaded(self):
+        with self.lock:
+            if self._loaded and (self.pending or self._writing):
+                # Есть незаписанные изменения — память главнее диска
+                return self
+            stamp = self._disk_stamp()
+            if not self._loaded or stamp != self._stamp:
+                reloaded = self._loaded
+                with profiling.span("store.read", "io"):
+                    if self._read_file():
+                        stamp = self._disk_stamp()
+                self.pending = []
+                self._loaded = True
+                self._stamp = stamp
+                if reloaded and self.on_reload is not None:
+                    self.on_reload()
+            return self
+
+    def snapshot(self):
+        return {"meta": self.meta, "tasks": list(self.by_id.values()), "users": self.users}
+
+    # ---- Indexes ----
+
+    def _reindex(self):
+        self.by_date = {}
+        for t in self.by_id.values():
+            self.by_date.setdefault(t["task_date"], []).append(t)
+        self.dates = sorted(self.by_date)
+
+    def _index_add(self, task):
+        day = self.by_date.get(task["task_date"])
+        if day is None:
+            self.by_date[task["task_date"]] = [task]
+            bisect.insort(self.dates, task["task_date"])
+        else:
+            day.append(task)
+
+    def _index_remove(self, task):
+        day = self.by_date.get(task["task_date"])
+        if day is None:
+            return
+        day.remove(task)
+        if not day:
+            del self.by_date[task["task_date"]]
+            i = bisect.bisect_left(self.dates, task["task_date"])
+            if i < len(self.dates) and self.dates[i] == task["task_date"]:
+                del self.dates[i]
+
+    def dates_between(self, start: str, end: str):
+        """Dates that have tasks, start <= d <= end (ISO strings compare as dates)."""
+        lo = bisect.bisect_left(self.dates, start)
+        hi = bisect.bisect_right(self.dates, end)
+        return self.dates[lo:hi]
+
+    # ---- Mutations ----
+
+    def apply(self, op: dict, record: bool = True):
+        """Apply one operation to the in-memory state.
+
+        Operations carry final values (the new ``done`` flag, explicit ids),
+        so replaying a journal on top of a snapshot that already contains
+        them is harmless.
+        """
+        kind = op["op"]
+        if kind == "add_task":
+            task = dict(op["task"])
+            if task["id"] in self.by_id:
+                return
+            self.meta["next_task_id"] = max(self.meta["next_task_id"], task["id"] + 1)
+            self.by_id[task["id"]] = task
+            self._index_add(task)
+        elif kind == "set_done":
+            task = self.by_id.get(op["id"])
+            if task is None:
+                return
+            task["done"] = op["done"]
+        elif kind == "set_text":
+            task = self.by_id.get(op["id"])
+            if task is None:
+                return
+            task["text"] = op["text"]
+        elif kind == "delete_task":
+            task = self.by_id.pop(op["id"], None)
+            if task is None:
+                return
+            self._index_remove(task)
+        elif kind == "add_user":
+            if any(u["id"] == op["user"]["id"] for u in self.users):
+                return
+            self.meta["next_user_id"] = max(self.meta["next_user_id"], op["user"]["id"] + 1)
+            self.users.append(dict(op["user"]))
+        else:
+            raise ValueError(f"Unknown operation: {kind}")
+        if record:
+            self.pending.append(op)
+
+    # ---- Persistence ----
+
+    def write_snapshot(self):
+        with self.io_lock, self.lock:
+            self.ensure_loaded()
+            atomic_write_json(self.path, self.snapshot(), ensure_ascii=False, indent=2)
+            # Снимок уже содержит всё из журнала
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.pending = []
+            self._stamp = self._disk_stamp()
+
+    def _serialize(self, ops):
+        """Under ``lock``: what commit() writes for the taken ``ops``.
+
+        Here a shallow copy of the snapshot; json.dumps then runs outside the
+        lock in ``_write_payload``.
+        """
+        return {
+            "meta": dict(self.meta),
+            "tasks": [dict(t) for t in self.by_id.values()],
+            "users": [dict(u) for u in self.users],
+        }
+
+    def _write_payload(self, payload):
+        atomic_write_json(self.path, payload, ensure_ascii=False, indent=2)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def _after_commit(self):
+        pass
+
+    def commit(self):
+        with self.io_lock:
+            with self.lock:
+                if not self._loaded or not self.pending:
+                    return
+                ops, self.pending = self.pending, []
+                stamp = self._disk_stamp()
+                if stamp != self._stamp:
+                    # Пока изменения ждали записи, файл изменили извне:
+                    # перечитываем его и накатываем ops сверху (в них конечные
+                    # значения), иначе запись затёрла бы чужие правки
+                    with profiling.span("store.read", "io"):
+                        if self._read_file():
+                            stamp = self._disk_stamp()
+                    ops = self._rebase(ops)
+                    self._stamp = stamp
+                    if self.on_reload is not None:
+                        self.on_reload()
+                payload = self._serialize(ops)
+                self._writing = True
+            try:
+                with profiling.span("store.write", "io", ops=len(ops)):
+                    self._write_payload(payload)
+            except BaseException:
+                with self.lock:
+                    # Вернём операции в очередь — следующий commit повторит запись
+                    self.pending[:0] = ops
+                raise
+            finally:
+                with self.lock:
+                    self._writing = False
+                    self._stamp = self._disk_stamp()
+        self._after_commit()
+
+    def _rebase(self, ops):
+        """Under ``lock``: re-apply ``ops`` on top of a freshly read file.
+
+        A task added outside the process may have taken the id of one of
+        ours; ours then gets a new id (and so do the later ops that refer to
+        it) instead of being dropped as a duplicate.
+        """
+        moved = {}
+        rebased = []
+        for op in ops:
+            if op["op"] == "add_task":
+                task = op["task"]
+                other = self.by_id.get(task["id"])
+                if other is not None and other != task:
+                    moved[task["id"]] = self.meta["next_task_id"]
+                    op = {"op": "add_task", "task": dict(task, id=moved[task["id"]])}
+            elif op.get("id") in moved:
+                op = dict(op, id=moved[op["id"]])
+            self.apply(op, record=False)
+            rebased.append(op)
+        return rebased
+
+    def reset(self):
+        """Drop the in-memory copy; the next access re-reads the file."""
+        with self.lock:
+            self._loaded = False
+            self._stamp = None
+            self.pending = []
+            self.users = []
+            self.meta = {"next_task_id": 1, "next_user_id": 1}
+            self.by_id = {}
+            self.by_date = {}
+            self.dates = []
+
+
+class _JournalStore(_Store):
+    """Append-only variant: each commit writes one JSON line per operation.
+
+    Startup replays the journal on top of the tasks.json snapshot. Once the
+    journal grows past JOURNAL_COMPACT_BYTES a background thread folds it
+    into a fresh snapshot, so the cost of a single change does not depend on
+    how many tasks are stored.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._compacting = False
+
+    def _serialize(self, ops):
+        return "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops)
+
+    def _write_payload(self, payload: str):
+        data = memoryview(payload.encode("utf-8"))
+        # Без буфера: при ошибке в файле нет ничего, кроме уже отрезанного
+        with open(self.journal_path, "ab", buffering=0) as f:
+            start = f.tell()
+            try:
+                while data:
+                    data = data[f.write(data):]
+                os.fsync(f.fileno())
+            except BaseException:
+                # Недописанный хвост отрезаем: commit() вернёт ops в очередь,
+                # и повтор должен начаться с новой строки
+                try:
+                    f.truncate(start)
+                except OSError:
+                    pass
+                raise
+
+    def _after_commit(self):
+        try:
+            size = os.path.getsize(self.journal_path)
+        except OSError:
+            return
+        if size >= JOURNAL_COMPACT_BYTES and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self._compact, name="journal-compact", daemon=True).start()
+
+    def _compact(self):
+        try:
+            with self.io_lock:
+                with self.lock:
+                    payload = json.dumps(self.snapshot(), ensure_ascii=False)
+                    self._writing = True
+                try:
+                    # Снимок пишем без self.lock: UI продолжает работать с памятью.
+                    # io_lock не даёт журналу расти, так что всё, что в нём есть,
+                    # уже вошло в снимок — журнал можно просто удалить.
+                    with profiling.span("journal.compact", "io"):
+                        atomic_write_text(self.path, payload)
+                        os.remove(self.journal_path)
+                        fsync_dir(os.path.dirname(self.journal_path))
+                finally:
+                    with self.lock:
+                        self._writing = False
+                        self._stamp = self._disk_stamp()
+        except OSError:
+            # Журнал остаётся целым; попробуем при следующем превышении порога
+            pass
+        finally:
+            self._compacting = False
+
+
+class FlushPolicy:
+    """When the background writer persists queued changes.
+
+    - ``immediate``: on every change;
+    - otherwise after ``idle_ms`` without new changes, or as soon as
+      ``max_pending`` changes are waiting, whichever comes first.
+
+    Bursts of clicks therefore cost one write, and a long burst is still
+    written at least every ``max_pending`` changes.
+    """
+
+    def __init__(self, idle_ms: int = FLUSH_IDLE_MS, max_pending: int = FLUSH_MAX_PENDING,
+                 immediate: bool = False):
+        self.idle_ms = max(0, int(idle_ms))
+        self.max_pending = max(1, int(max_pending))
+        self.immediate = bool(immediate)
+
+    @classmethod
+    def from_settings(cls, data):
+        """Build from the ``"flush"`` object of settings.json (missing keys -> defaults)."""
+        if not isinstance(data, dict):
+            return cls()
+        return cls(
+            idle_ms=data.get("idle_ms", FLUSH_IDLE_MS),
+            max_pending=data.get("max_pending", FLUSH_MAX_PENDING),
+            immediate=data.get("immediate", False),
+        )
+
+
+class _BackgroundWriter:
+    """Persists a store on a dedicated thread so callers never wait for disk I/O.
+
+    ``schedule()`` only marks the store dirty; the thread writes according to
+    its ``FlushPolicy``, and changes made while a write is queued or running
+    are picked up by the same next write. ``on_saved()`` and
+    ``on_error(exc)`` are called on the writer thread.
+    """
+
+    def __init__(self, store: _Store, on_saved=None, on_error=None, policy: FlushPolicy | None = None):
+        self.store = store
+        self.on_saved = on_saved
+        self.on_error = on_error
+        self.policy = policy or FlushPolicy()
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._last_change = 0.0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="tasks-writer", daemon=True)
+        self._thread.start()
+
+    def schedule(self):
+        with self._cond:
+            self._dirty = True
+            self._last_change = time.monotonic()
+            self._cond.notify()
+
+    def set_policy(self, policy: FlushPolicy):
+        with self._cond:
+            self.policy = policy
+            self._cond.notify()
+
+    def _due(self):
+        """Under ``_cond``: seconds until the next write is due (0 = now)."""
+        policy = self.policy
+        if policy.immediate or len(self.store.pending) >= policy.max_pending:
+            return 0.0
+        return max(0.0, self._last_change + policy.idle_ms / 1000.0 - time.monotonic())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                # Ждём паузы в изменениях (каждый schedule() сдвигает срок)
+                delay = self._due()
+                while delay > 0 and not self._stopped:
+                    self._cond.wait(delay)
+                    delay = self._due()
+                if self._stopped:
+                    return
+                self._dirty = False
+            try:
+                self.store.commit()
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+            else:
+                if self.on_saved:
+                    self.on_saved()
+
+    def flush(self):
+        """Write everything applied so far, synchronously, on the calling thread."""
+        self.store.commit()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+
+def _make_store(path: str, engine: str) -> _Store:
+    if engine == "journal":
+        return _JournalStore(path)
+    return _Store(path)
+
+
+def _iso(value: "str|date_cls") -> str:
+    if isinstance(value, date_cls):
+        return value.isoformat()
+    return value
+
+
+def _task_fields(item):
+    """(task_date, text, location) from a dict or a 2-/3-tuple, date as ISO string."""
+    if isinstance(item, dict):
+        task_date, text, location = item["task_date"], item["text"], item.get("location")
+    elif len(item) == 2:
+        (task_date, text), location = item, None
+    else:
+        task_date, text, location = item
+    return _iso(task_date), text, location
+
+
+def _match_location(tasks, location):
+    if location:
+        return [t for t in tasks if t["location"] == location or t["location"] is None]
+    return tasks
+
+
+class JsonBackend:
+    """Backend over tasks.json (``_Store``) or tasks.json + journal (``_JournalStore``)."""
+
+    def __init__(self, path: str = CACHE_FILE, engine: str = "json"):
+        self.engine = engine
+        self.store = _make_store(path, engine)
+        self.writer = None
+        self._tx_depth = 0
+
+    def _load(self):
+        profiling.count("_load")
+        return self.store.ensure_loaded()
+
+    def _save(self):
+        """Persist after a mutation; call it after releasing ``store.lock``."""
+        profiling.count("_save")
+        # Внутри transaction() запись откладывается до выхода из блока
+        if self._tx_depth:
+            return
+        if self.writer is not None:
+            self.writer.schedule()
+        else:
+            self.store.commit()
+
+    def start_background_writes(self, on_saved=None, on_error=None, policy: FlushPolicy | None = None):
+        if self.writer is None:
+            self.writer = _BackgroundWriter(self.store, on_saved, on_error, policy)
+        elif policy is not None:
+            self.writer.set_policy(policy)
+        return True
+
+    def flush(self):
+        self.store.commit()
+
+    @contextmanager
+    def transaction(self):
+        # io_lock раньше lock: commit() внутри блока берёт io_lock, а фоновый
+        # писатель, держащий io_lock, ждёт lock — иначе взаимная блокировка
+        with self.store.io_lock, self.store.lock:
+            self._load()
+            if not self._tx_depth:
+                # Точка отката должна быть на диске: при ошибке перечитываем файл
+                self.store.commit()
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if not self._tx_depth:
+                    # Ничего ещё не записано — откат это просто перечитать файл
+                    self.store.reset()
+                raise
+            self._tx_depth -= 1
+            self._save()
+
+    def create_tables(self):
+        if not os.path.exists(self.store.path):
+            self.store.write_snapshot()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+        else:
+            self.store.commit()
+
+    # ---- USERS ----
+
+    def add_user(self, username, password):
+        with self.store.lock:
+            store = self._load()
+            # Check duplicate
+            for u in store.users:
+                if u["username"] == username:
+                    return False
+            new_id = store.meta["next_user_id"]
+            store.apply({"op": "add_user", "user": {"id": new_id, "username": username, "password": password}})
+        self._save()
+        return new_id
+
+    def get_user(self, username):
+        with self.store.lock:
+            store = self._load()
+            for u in store.users:
+                if u["username"] == username:
+                    return dict(u)
+            return None
+
+    # ---- TASKS ----
+
+    def add_task(self, task_date: str, text: str, location: str | None = None):
+        return self.add_tasks([(task_date, text, location)])[0]
+
+    def add_tasks(self, items):
+        ids = []
+        with self.store.lock:
+            store = self._load()
+            for task_date, text, location in items:
+                new_id = store.meta["next_task_id"]
+                store.apply({"op": "add_task", "task": {
+                    "id": new_id,
+                    "task_date": task_date,
+                    "text": text,
+                    "location": location,
+                    "done": False
+                }})
+                ids.append(new_id)
+        self._save()
+        return ids
+
+    def list_tasks(self, task_date: str, location: str | None = None):
+        with self.store.lock:
+            store = self._load()
+            # Копии, чтобы вызывающий код не мог испортить кэш
+            tasks = [dict(t) for t in store.by_date.get(task_date, ())]
+        return _match_location(tasks, location)
+
+    def list_tasks_range(self, start: str, end: str, location: str | None = None):
+        result = {}
+        with self.store.lock:
+            store = self._load()
+            for day in store.dates_between(start, end):
+                tasks = _match_location([dict(t) for t in store.by_date[day]], location)
+                if tasks:
+                    result[day] = tasks
+        return result
+
+    def count_tasks_range(self, start: str, end: str, location: str | None = None):
+        result = {}
+        with self.store.lock:
+            store = self._load()
+            for day in store.dates_between(start, end):
+                tasks = _match_location(store.by_date[day], location)
+                if tasks:
+                    result[day] = (len(tasks), sum(1 for t in tasks if t["done"]))
+        return result
+
+    def toggle_task(self, task_id: int):
+        self.toggle_tasks([task_id])
+
+    def toggle_tasks(self, task_ids):
+        with self.store.lock:
+            store = self._load()
+            for task_id in task_ids:
+                t = store.by_id.get(task_id)
+                if t is not None:
+                    store.apply({"op": "set_done", "id": task_id, "done": not t["done"]})
+        self._save()
+
+    def update_task_text(self, task_id: int, text: str):
+        with self.store.lock:
+            store = self._load()
+            if task_id in store.by_id:
+                store.apply({"op": "set_text", "id": task_id, "text": text})
+        self._save()
+
+    def delete_task(self, task_id: int):
+        self.delete_tasks([task_id])
+
+    def delete_tasks(self, task_ids):
+        with self.store.lock:
+            store = self._load()
+            for task_id in task_ids:
+                if task_id in store.by_id:
+                    store.apply({"op": "delete_task", "id": task_id})
+        self._save()
+
+
+def _setting(key: str, env: str, default=None):
+    """Environment variable first, then settings.json, then ``default``."""
+    value = os.environ.get(env)
+    if value:
+        return value
     try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {"tasks": [], "users": []}
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+            value = json.load(f).get(key)
+    except (OSError, ValueError, AttributeError):
+        value = None
+    return default if value in (None, "") else value
 
-def _save(data):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def _configured_engine() -> str:
+    engine = _setting("storage", "TODO_STORAGE")
+    return engine if engine in ENGINES else DEFAULT_ENGINE
+
+
+def _migrate_json(backend):
+    """One-shot import of tasks.json (+ journal) into an empty SQL backend."""
+    if not (os.path.exists(CACHE_FILE) or os.path.exists(CACHE_FILE + ".bak")):
+        # Импортировать нечего, но миграцию отмечаем: tasks.json, появившийся
+        # позже (после пробы движка json), не должен вливаться в живую базу
+        backend.import_data([], [])
+        return
+    store = _Store(CACHE_FILE).ensure_loaded()
+    backend.import_data(list(store.by_id.values()), store.users, store.meta)
+
+
+def _make_backend(engine: str):
+    if engine == "sqlite":
+        from backend.sqlite_backend import SqliteBackend
+        backend = SqliteBackend(SQLITE_FILE)
+        if backend.needs_migration():
+            _migrate_json(backend)
+        return backend
+    if engine == "postgres":
+        from backend.postgres_backend import PostgresBackend
+        backend = PostgresBackend(
+            _setting("postgres_dsn", "TODO_PG_DSN"),
+            max_connections=int(_setting("postgres_pool_size", "TODO_PG_POOL_SIZE", PG_POOL_SIZE)),
+        )
+        if backend.needs_migration():
+            _migrate_json(backend)
+        return backend
+    backend = JsonBackend(CACHE_FILE, engine)
+    # Файл изменили извне — индекс поиска знает старый текст задач
+    backend.store.on_reload = _reset_search
+    return backend
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_atexit_registered = False
+
+# Поисковый индекс активного движка: строится в памяти при первом поиске
+_search = None
+_search_lock = threading.Lock()
+_search_gen = 0          # растёт с каждым изменением задач
+# Индекс строит один поток, остальные ждут его результата
+_search_build_lock = threading.Lock()
+# Глубина transaction() в текущем потоке (см. _load_search_index)
+_tx_local = threading.local()
+
+
+def get_backend():
+    """The active backend, created on first use from settings/TODO_STORAGE."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _make_backend(_configured_engine())
+    return _backend
+
+
+def configure(engine: str | None = None):
+    """Switch the active backend (None re-reads settings/TODO_STORAGE)."""
+    global _backend
+    engine = engine or _configured_engine()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown storage engine: {engine}")
+    with _backend_lock:
+        backend = _make_backend(engine)
+        if _backend is not None:
+            _backend.close()
+        _backend = backend
+        _reset_search()
+    return _backend
 
 
 # ---- USERS ----
 
+@traced("db.add_user", "backend")
 def add_user(username, password):
-    data = _load()
-    # Check duplicate
-    for u in data["users"]:
-        if u["username"] == username:
-            return False
-    new_id = (max([u["id"] for u in data["users"]] or [0]) + 1)
-    data["users"].append({"id": new_id, "username": username, "password": password})
-    _save(data)
-    return new_id
+    return get_backend().add_user(username, password)
 
+@traced("db.get_user", "backend")
 def get_user(username):
-    data = _load()
-    for u in data["users"]:
-        if u["username"] == username:
-            return u
-    return None
+    return get_backend().get_user(username)
 
 
 # ---- TASKS ----
 
+@traced("db.create_tables", "backend")
 def create_tables():
     """
-    No DB tables needed. Ensures cache file exists.
+    Ensures storage exists: the cache file for JSON engines, the schema
+    (and the one-time import of tasks.json) for SQL engines.
     """
-    if not os.path.exists(CACHE_FILE):
-        _save({"tasks": [], "users": []})
+    get_backend().create_tables()
 
 
+@traced("db.add_task", "backend")
 def add_task(task_date: "str|date_cls", text: str, location: str | None = None):
-    if isinstance(task_date, date_cls):
-        task_date = task_date.isoformat()
+    task_date = _iso(task_date)
+    task_id = get_backend().add_task(task_date, text, location)
+    _search_update("add", {"id": task_id, "task_date": task_date, "text": text, "location": location, "done": False})
+    return task_id
 
-    data = _load()
-    new_id = (max([t["id"] for t in data["tasks"]] or [0]) + 1)
 
-    data["tasks"].append({
-        "id": new_id,
-        "task_date": task_date,
-        "text": text,
-        "location": location,
-        "done": False
-    })
+@traced("db.list_tasks", "backend")
+def list_tasks(task_date: "str|date_cls", location: str | None = None):
+    return get_backend().list_tasks(_iso(task_date), location)
 
-    _save(data)
-    return new_id
 
+@traced("db.list_tasks_range", "backend")
+def list_tasks_range(start: "str|date_cls", end: "str|date_cls", location: str | None = None):
+    """Tasks for every day in [start, end], grouped by day.
 
-def list_tasks(task_date: "str|date_cls", location: str | None = None):
-    if isinstance(task_date, date_cls):
-        task_date = task_date.isoformat()
+    Returns an ordered dict ``{"YYYY-MM-DD": [task, ...]}`` containing only the
+    days that have tasks, sorted by date.
+    """
+    return get_backend().list_tasks_range(_iso(start), _iso(end), location)
 
-    data = _load()
-    tasks = [t for t in data["tasks"] if t["task_date"] == task_date]
 
-    if location:
-        tasks = [t for t in tasks if t["location"] == location or t["location"] is None]
+@traced("db.count_tasks_range", "backend")
+def count_tasks_range(start: "str|date_cls", end: "str|date_cls", location: str | None = None):
+    """Per-day task counts for [start, end] in one pass, without copying tasks.
 
-    return tasks
+    Returns ``{"YYYY-MM-DD": (total, done)}`` for the days that have tasks.
+    """
+    return get_backend().count_tasks_range(_iso(start), _iso(end), location)
 
 
+@traced("db.toggle_task", "backend")
 def toggle_task(task_id: int):
-    data = _load()
-    for t in data["tasks"]:
-        if t["id"] == task_id:
-            t["done"] = not t["done"]
-            break
-    _save(data)
+    get_backend().toggle_task(task_id)
+    _search_update("toggle", task_id)
+
+
+@traced("db.update_task_text", "backend")
+def update_task_text(task_id: int, text: str):
+    get_backend().update_task_text(task_id, text)
+    _search_update("set_text", task_id, text)
 
 
+@traced("db.delete_task", "backend")
 def delete_task(task_id: int):
-    data = _load()
-    data["tasks"] = [t for t in data["tasks"] if t["id"] != task_id]
-    _save(data)
\ No newline at end of file
+    get_backend().delete_task(task_id)
+    _search_update("remove", task_id)
+
+
+# ---- BATCH ----
+
+@traced("db.add_tasks", "backend")
+def add_tasks(items):
+    """Add many tasks in one persistence step; returns their ids in order.
+
+    Each item is a dict with task_date/text[/location] or a
+    ``(task_date, text[, location])`` tuple.
+    """
+    items = [_task_fields(i) for i in items]
+    ids = get_backend().add_tasks(items)
+    for task_id, (task_date, text, location) in zip(ids, items):
+        _search_update("add", {"id": task_id, "task_date": task_date, "text": text, "location": location, "done": False})
+    return ids
+
+
+@traced("db.toggle_tasks", "backend")
+def toggle_tasks(task_ids):
+    task_ids = list(task_ids)
+    get_backend().toggle_tasks(task_ids)
+    for task_id in task_ids:
+        _search_update("toggle", task_id)
+
+
+@traced("db.delete_tasks", "backend")
+def delete_tasks(task_ids):
+    task_ids = list(task_ids)
+    get_backend().delete_tasks(task_ids)
+    for task_id in task_ids:
+        _search_update("remove", task_id)
+
+
+def _configured_flush_policy() -> FlushPolicy:
+    try:
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f).get("flush")
+    except (OSError, ValueError, AttributeError):
+        data = None
+    try:
+        return FlushPolicy.from_settings(data)
+    except (TypeError, ValueError):
+        return FlushPolicy()
+
+
+def start_background_writes(on_saved=None, on_error=None, policy: FlushPolicy | None = None) -> bool:
+    """Move disk writes of the JSON engines to a background thread.
+
+    Mutations keep updating the in-memory store immediately; the file is
+    written by a single writer thread according to ``policy`` (default: the
+    "flush" object in settings.json). ``on_saved()`` / ``on_error(exc)`` are
+    called from that thread. SQL engines write in place already and return
+    False. Call ``flush()`` before the process exits.
+    """
+    global _atexit_registered
+    started = get_backend().start_background_writes(on_saved, on_error, policy or _configured_flush_policy())
+    if started and not _atexit_registered:
+        atexit.register(flush)
+        _atexit_registered = True
+    return started
+
+
+@traced("db.flush", "backend")
+def flush():
+    """Persist every pending change now."""
+    if _backend is not None:
+        _backend.flush()
+
+
+def transaction():
+    """Group several calls into one persistence step (one write / one commit).
+
+    Usage:
+        with transaction():
+            for tid in old_ids:
+                delete_task(tid)
+            add_tasks(schedule)
+
+    If the block raises, none of its changes are persisted.
+    """
+    return _transaction(get_backend())
+
+
+@contextmanager
+def _transaction(backend):
+    _tx_local.depth = getattr(_tx_local, "depth", 0) + 1
+    try:
+        with backend.transaction():
+            yield backend
+    except BaseException:
+        # Откат вернул данные назад, а индекс уже принял изменения — перестроим
+        _reset_search()
+        raise
+    finally:
+        _tx_local.depth -= 1
+
+
+# ---- SEARCH ----
+
+def _reset_search():
+    global _search, _search_gen
+    with _search_lock:
+        _search = None
+        _search_gen += 1
+
+
+def _search_update(method: str, *args):
+    """Mirror one task change into the search index (if it is built)."""
+    global _search_gen
+    with _search_lock:
+        _search_gen += 1
+        if _search is not None:
+            getattr(_search, method)(*args)
+
+
+def _load_search_index() -> SearchIndex:
+    """Build the index from storage; concurrent first searches wait for one build."""
+    if getattr(_tx_local, "depth", 0):
+        # Поток держит блокировку хранилища (transaction): ждать строящий
+        # поток нельзя — он сам ждёт эту блокировку. Строим здесь же.
+        return _build_search_index()
+    with _search_build_lock:
+        return _build_search_index()
+
+
+def _build_search_index() -> SearchIndex:
+    global _search
+    backend = get_backend()
+    while True:
+        with _search_lock:
+            if _search is not None:
+                return _search
+            gen = _search_gen
+        # Чтение и сборка — без блокировки: изменения задач не ждут поиск
+        with profiling.span("search.build", "backend"):
+            index = SearchIndex()
+            index.build(t for day in backend.list_tasks_range("0001-01-01", "9999-12-31").values()
+                        for t in day)
+        with _search_lock:
+            # Пока строили, задачи менялись — индекс мог их пропустить; ещё раз
+            if _search_gen == gen:
+                _search = index
+                return index
+
+
+@traced("db.search_tasks", "backend")
+def search_tasks(query: str, done: bool | None = None, start: "str|date_cls|None" = None,
+                 end: "str|date_cls|None" = None, limit: int = 200):
+    """Tasks whose text contains every word of ``query`` as a word prefix.
+
+    ``done`` filters by status (None = any), ``start``/``end`` by date
+    (inclusive). Returns at most ``limit`` tasks sorted by date. The first
+    call builds the index (about a second per 100k tasks, so the GUI warms
+    it up in the background); later ones take milliseconds.
+    """
+    store = getattr(get_backend(), "store", None)
+    if store is not None:
+        # Файл изменили извне — перечитается, а on_reload сбросит индекс
+        store.ensure_loaded()
+    index = _search or _load_search_index()
+    return index.search(query, done=done,
+                        start=_iso(start) if start else None,
+                        end=_iso(end) if end else None,
+                        limit=limit)
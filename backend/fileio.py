@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+
+
+def fsync_dir(path: str):
+    # На Windows каталоги так открыть нельзя — там достаточно os.replace
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(path or ".", os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path: str, obj, backup: bool = True, **dump_kwargs):
+    """Write ``obj`` to ``path`` so that a crash never leaves a truncated file.
+
+    The JSON goes to a temp file in the same directory, is fsynced and then
+    renamed over ``path``. With ``backup`` the previous version is kept as
+    ``path + ".bak"`` (one generation, rotated on every write).
+    """
+    atomic_write_text(path, json.dumps(obj, **dump_kwargs), backup)
+
+
+def atomic_write_text(path: str, text: str, backup: bool = True):
+    """``atomic_write_json`` for an already serialized document."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if backup and os.path.exists(path):
+            # Если упадём между двумя rename, основной файл восстановится из .bak
+            os.replace(path, path + ".bak")
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    fsync_dir(directory)
+
+
+def read_json_with_backup(path: str):
+    """Read ``path``; fall back to ``path + ".bak"`` if it is missing or corrupt.
+
+    A corrupt main file is kept aside as ``path + ".corrupt"`` rather than
+    deleted. Returns None when neither file can be read.
+    """
+    bak = path + ".bak"
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            try:
+                os.replace(path, path + ".corrupt")
+            except OSError:
+                pass
+    if os.path.exists(bak):
+        try:
+            with open(bak, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return None
@@ -1,90 +1,307 @@
+import random
+import threading
+import time
+from datetime import date as date_cls, timedelta
+
 import requests
-from datetime import date as date_cls
+from requests.adapters import HTTPAdapter
+
+from backend.ttl_cache import TTLCache
 
 # Uwaga/Note: Open‑Meteo to publiczne API BEZ klucza – nic nie trzeba wklejać.
 # Для этого проекта ключ API не требуется: используем публичные эндпоинты.
 GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Кеш геокодирования: координаты города не меняются, поэтому срок длинный.
+# «Не найдено» тоже кешируем, но коротко — вдруг в базе появится.
+GEOCODE_CACHE_FILE = "cache/geocode.json"
+GEOCODE_CACHE_SIZE = 1000
+GEOCODE_TTL = 30 * 24 * 3600
+GEOCODE_MISS_TTL = 24 * 3600
+
+_geocode_cache = TTLCache(GEOCODE_CACHE_SIZE, GEOCODE_CACHE_FILE)
+
+# Кеш дневных прогнозов по (lat, lon, дата). Прошедший день больше не
+# меняется — храним, пока не вытеснит LRU; сегодня и будущее обновляются
+# через FORECAST_TTL секунд.
+FORECAST_CACHE_FILE = "cache/forecast.json"
+FORECAST_CACHE_SIZE = 5000
+FORECAST_TTL = 3 * 3600
+PAST_DAY_TTL = 10 * 365 * 24 * 3600
+# Open-Meteo отдаёт прогноз на 16 дней вперёд (включая сегодня)
+# и не больше 92 дней назад (как past_days)
+FORECAST_DAYS = 16
+FORECAST_PAST_DAYS = 92
+DAILY_FIELDS = {
+    "tmax": "temperature_2m_max",
+    "tmin": "temperature_2m_min",
+    "precipitation": "precipitation_sum",
+    # UWAGA/ВНИМАНИЕ: poprawna nazwa parametru to "wind_speed_10m_max"
+    # (nie "windspeed_10m_max"). Błędna nazwa powoduje 400 Bad Request
+    # w Open‑Meteo. Zob. https://open-meteo.com/en/docs#api_form
+    "wind_max": "wind_speed_10m_max",
+}
+
+_forecast_cache = TTLCache(FORECAST_CACHE_SIZE, FORECAST_CACHE_FILE)
+
 
 class WeatherError(Exception):
     pass
 
 
-def geocode_location(location: str, timeout: float = 8.0):
-    if not location:
+class WeatherClient:
+    """HTTP client for the Open-Meteo endpoints over one pooled ``requests.Session``.
+
+    Connections are kept alive and reused (up to ``pool_size`` per host), so
+    only the first request pays for the TCP+TLS handshake. Connection errors,
+    timeouts and 5xx answers are retried up to ``retries`` times, sleeping
+    a random delay up to ``backoff * 2**attempt`` (capped at ``max_backoff``)
+    between attempts. 4xx answers are not retried.
+
+    ``timeouts`` maps an endpoint ("geocoding", "forecast") to a requests
+    timeout, i.e. seconds or a (connect, read) tuple. ``urls`` overrides the
+    endpoint URLs, e.g. to point the client at a local stub server.
+    """
+
+    DEFAULT_TIMEOUTS = {"geocoding": (3.05, 8.0), "forecast": (3.05, 10.0)}
+
+    def __init__(self, urls: dict | None = None, timeouts: dict | None = None, pool_size: int = 4,
+                 retries: int = 2, backoff: float = 0.25, max_backoff: float = 4.0):
+        self.urls = {"geocoding": GEOCODING_URL, "forecast": FORECAST_URL, **(urls or {})}
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        # Повторы делаем сами (с разбросом), адаптер только держит соединения
+        adapter = HTTPAdapter(pool_connections=len(self.urls), pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _delay(self, attempt: int) -> float:
+        # "Full jitter": одновременные клиенты не повторяют запрос в один момент
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get_json(self, endpoint: str, params: dict, timeout=None):
+        """GET the endpoint and return the decoded JSON; raises ``requests.RequestException``."""
+        url = self.urls[endpoint]
+        timeout = timeout if timeout is not None else self.timeouts[endpoint]
+        attempt = 0
+        while True:
+            try:
+                r = self.session.get(url, params=params, timeout=timeout)
+                if r.status_code < 500 or attempt >= self.retries:
+                    r.raise_for_status()
+                    return r.json()
+                r.close()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> WeatherClient:
+    """The shared client (created on first use)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = WeatherClient()
+    return _client
+
+
+def set_client(client: WeatherClient | None):
+    """Replace the shared client (None: a default one is created on next use)."""
+    global _client
+    with _client_lock:
+        old, _client = _client, client
+    if old is not None and old is not client:
+        old.close()
+
+
+def _geocode_key(location: str, language: str) -> str:
+    # "  Kraków " и "kraków" — одна запись
+    return f"{language}:{' '.join(location.split()).casefold()}"
+
+
+def _cached_place(place):
+    if place is None:
+        raise WeatherError("Nie znaleziono lokalizacji.")
+    return dict(place)
+
+
+def geocode_location(location: str, timeout: float | None = None, language: str = "pl"):
+    """Coordinates of ``location`` (lat, lon, name, country).
+
+    Answers, including "not found", are cached in memory and in
+    ``cache/geocode.json``. If the network fails, an expired entry is used.
+    """
+    if not location or not location.strip():
         raise WeatherError("Pusta lokalizacja.")
-    params = {"name": location, "count": 1, "language": "pl", "format": "json"}
+    key = _geocode_key(location, language)
+    cached = _geocode_cache.get(key)
+    if cached is not None and cached[1]:
+        return _cached_place(cached[0])
+    params = {"name": location.strip(), "count": 1, "language": language, "format": "json"}
     try:
-        r = requests.get(GEOCODING_URL, params=params, timeout=timeout)
-        r.raise_for_status()
-        data = r.json()
-        if not data.get("results"):
-            raise WeatherError("Nie znaleziono lokalizacji.")
-        res = data["results"][0]
-        return {
-            "lat": res["latitude"],
-            "lon": res["longitude"],
-            "name": res.get("name"),
-            "country": res.get("country"),
-        }
+        data = get_client().get_json("geocoding", params, timeout)
     except requests.RequestException as e:
+        # Нет сети — устаревшие координаты лучше, чем ничего
+        if cached is not None:
+            return _cached_place(cached[0])
         raise WeatherError(f"Błąd geokodowania: {e}")
+    if not data.get("results"):
+        _geocode_cache.put(key, None, GEOCODE_MISS_TTL)
+        _geocode_cache.save()
+        raise WeatherError("Nie znaleziono lokalizacji.")
+    res = data["results"][0]
+    place = {
+        "lat": res["latitude"],
+        "lon": res["longitude"],
+        "name": res.get("name"),
+        "country": res.get("country"),
+    }
+    _geocode_cache.put(key, place, GEOCODE_TTL)
+    _geocode_cache.save()
+    return dict(place)
 
 
-def get_weather(location: str, day: "date|str"):
-    """Zwraca prognozę dzienną dla podanej lokalizacji i daty.
-
-    Wynik: dict z polami: date, location_name, tmax, tmin, precipitation, wind_max
-    """
-    loc = geocode_location(location)
+def _day(day: "date|str") -> date_cls:
     if isinstance(day, str):
-        day_str = day
-    elif isinstance(day, date_cls):
-        day_str = day.isoformat()
-    else:
-        raise WeatherError("Nieprawidłowa data.")
+        try:
+            return date_cls.fromisoformat(day)
+        except ValueError:
+            raise WeatherError("Nieprawidłowa data.")
+    if isinstance(day, date_cls):
+        return day
+    raise WeatherError("Nieprawidłowa data.")
+
 
+def _forecast_key(loc: dict, day_str: str) -> str:
+    return f"{loc['lat']:.4f},{loc['lon']:.4f}:{day_str}"
+
+
+def _fetch_daily(loc: dict, start: str, end: str) -> dict:
+    """One forecast request for [start, end]; returns {date: row without location_name}."""
     params = {
         "latitude": loc["lat"],
         "longitude": loc["lon"],
-        "daily": [
-            "temperature_2m_max",
-            "temperature_2m_min",
-            "precipitation_sum",
-            # UWAGA/ВНИМАНИЕ: poprawna nazwa parametru to "wind_speed_10m_max"
-            # (nie "windspeed_10m_max"). Błędna nazwa powoduje 400 Bad Request
-            # w Open‑Meteo. Zob. https://open-meteo.com/en/docs#api_form
-            "wind_speed_10m_max",
-        ],
+        "daily": list(DAILY_FIELDS.values()),
         "timezone": "auto",
-        "start_date": day_str,
-        "end_date": day_str,
+        "start_date": start,
+        "end_date": end,
         # Gdy podajemy start_date i end_date, NIE dodajemy forecast_days –
         # te parametry się wykluczają i wywołują błąd 400.
     }
-    try:
-        r = requests.get(FORECAST_URL, params=params, timeout=10.0)
-        r.raise_for_status()
-        data = r.json()
-        daily = data.get("daily") or {}
-        times = (daily.get("time") or [])
-        if not times:
-            raise WeatherError("Brak danych pogodowych dla tej daty.")
-        return {
-            "date": times[0],
-            "location_name": f"{loc.get('name', '')}, {loc.get('country', '')}".strip(', '),
-            "tmax": _first(daily.get("temperature_2m_max")),
-            "tmin": _first(daily.get("temperature_2m_min")),
-            "precipitation": _first(daily.get("precipitation_sum")),
-            "wind_max": _first(daily.get("wind_speed_10m_max")),
-        }
-    except requests.RequestException as e:
-        raise WeatherError(f"Błąd pobierania pogody: {e}")
+    daily = get_client().get_json("forecast", params).get("daily") or {}
+    rows = {}
+    for i, day_str in enumerate(daily.get("time") or []):
+        row = {"date": day_str}
+        for field, name in DAILY_FIELDS.items():
+            row[field] = _nth(daily.get(name), i)
+        rows[day_str] = row
+    return rows
+
+
+def get_weather_range(location: str, start: "date|str", end: "date|str", ttl: float | None = None):
+    """Daily forecasts for every day in [start, end] with one request.
+
+    Returns {"YYYY-MM-DD": dict(date, location_name, tmax, tmin,
+    precipitation, wind_max)}. Days outside the forecast window
+    (FORECAST_PAST_DAYS back, FORECAST_DAYS ahead) and days Open-Meteo has
+    no data for are absent.
+
+    Days are served from a cache keyed by (lat, lon, date). Past days never
+    expire; today and later days are refetched after ``ttl`` seconds
+    (FORECAST_TTL by default). Only the span of days that are missing or
+    stale is requested. If the request fails, stale days are returned as
+    they are.
+    """
+    today = date_cls.today()
+    days = _window_days(start, end, today)
+    if not days:
+        # Весь диапазон вне окна прогноза — незачем даже геокодировать
+        return {}
+    loc = geocode_location(location)
+
+    cached = {d: _forecast_cache.get(_forecast_key(loc, d)) for d in days}
+    stale = [d for d in days if cached[d] is None or not cached[d][1]]
+    rows = {d: c[0] for d, c in cached.items() if c is not None}
+    if stale:
+        try:
+            fetched = _fetch_daily(loc, stale[0], stale[-1])
+        except requests.RequestException as e:
+            # Нет сети: отдаём то, что есть в кеше (даже устаревшее)
+            if not rows:
+                raise WeatherError(f"Błąd pobierania pogody: {e}")
+        else:
+            today_str = today.isoformat()
+            past = {_forecast_key(loc, d): row for d, row in fetched.items() if d < today_str}
+            upcoming = {_forecast_key(loc, d): row for d, row in fetched.items() if d >= today_str}
+            _forecast_cache.put_many(past, PAST_DAY_TTL)
+            _forecast_cache.put_many(upcoming, FORECAST_TTL if ttl is None else ttl)
+            _forecast_cache.save()
+            rows.update(fetched)
+
+    location_name = _location_name(loc)
+    return {d: {**rows[d], "location_name": location_name} for d in days if d in rows}
+
+
+def cached_weather_range(location: str, start: "date|str", end: "date|str"):
+    """``get_weather_range`` from the caches only (stale days included).
+
+    Never touches the network, so the GUI can show known forecasts at once
+    and refresh them in the background. Unknown places give {}.
+    """
+    if not location or not location.strip():
+        return {}
+    cached = _geocode_cache.get(_geocode_key(location, "pl"))
+    if cached is None or cached[0] is None:
+        return {}
+    loc = cached[0]
+    location_name = _location_name(loc)
+    rows = {}
+    for d in _window_days(start, end, date_cls.today()):
+        hit = _forecast_cache.get(_forecast_key(loc, d))
+        if hit is not None:
+            rows[d] = {**hit[0], "location_name": location_name}
+    return rows
+
+
+def _window_days(start, end, today: date_cls):
+    """ISO days of [start, end] that fall inside the forecast window."""
+    first = max(_day(start), today - timedelta(days=FORECAST_PAST_DAYS))
+    last = min(_day(end), today + timedelta(days=FORECAST_DAYS - 1))
+    return [(first + timedelta(days=n)).isoformat() for n in range((last - first).days + 1)]
+
+
+def _location_name(loc: dict) -> str:
+    return f"{loc.get('name', '')}, {loc.get('country', '')}".strip(', ')
+
+
+def get_weather(location: str, day: "date|str"):
+    """Zwraca prognozę dzienną dla podanej lokalizacji i daty.
+
+    Wynik: dict z polami: date, location_name, tmax, tmin, precipitation, wind_max
+    """
+    day_str = _day(day).isoformat()
+    row = get_weather_range(location, day_str, day_str).get(day_str)
+    if row is None:
+        raise WeatherError("Brak danych pogodowych dla tej daty.")
+    return row
 
 
-def _first(arr, default=None):
+def _nth(arr, i, default=None):
     try:
-        return arr[0]
+        return arr[i]
     except Exception:
         return default
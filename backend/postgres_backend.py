@@ -0,0 +1,249 @@
+import threading
+from contextlib import contextmanager
+
+from backend.sql_common import row_to_task, tasks_by_date
+
+try:
+    import psycopg2
+    from psycopg2.extras import execute_values
+    from psycopg2.pool import ThreadedConnectionPool
+except ImportError:  # psycopg2-binary есть в requirements.txt, но движок опционален
+    psycopg2 = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id        BIGSERIAL PRIMARY KEY,
+    task_date DATE    NOT NULL,
+    text      TEXT    NOT NULL,
+    location  TEXT,
+    done      BOOLEAN NOT NULL DEFAULT FALSE
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_date ON tasks (task_date);
+
+CREATE TABLE IF NOT EXISTS users (
+    id       BIGSERIAL PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_TASK_COLUMNS = "id, to_char(task_date, 'YYYY-MM-DD'), text, location, done"
+
+SQL_INSERT_TASK = "INSERT INTO tasks (task_date, text, location) VALUES (%s, %s, %s) RETURNING id"
+SQL_IMPORT_TASKS = ("INSERT INTO tasks (id, task_date, text, location, done) VALUES %s "
+                    "ON CONFLICT (id) DO NOTHING")
+# %(loc)s встречается трижды — именованный параметр передаётся один раз;
+# ::text нужен, иначе Postgres не выведет тип NULL-параметра в "IS NULL"
+SQL_SELECT_DAY = (f"SELECT {_TASK_COLUMNS} FROM tasks WHERE task_date = %(day)s "
+                  "AND (%(loc)s::text IS NULL OR location = %(loc)s OR location IS NULL) ORDER BY id")
+SQL_SELECT_RANGE = (f"SELECT {_TASK_COLUMNS} FROM tasks WHERE task_date BETWEEN %(start)s AND %(end)s "
+                    "AND (%(loc)s::text IS NULL OR location = %(loc)s OR location IS NULL) "
+                    "ORDER BY task_date, id")
+SQL_COUNT_RANGE = ("SELECT to_char(task_date, 'YYYY-MM-DD'), COUNT(*), COUNT(*) FILTER (WHERE done) "
+                   "FROM tasks WHERE task_date BETWEEN %(start)s AND %(end)s "
+                   "AND (%(loc)s::text IS NULL OR location = %(loc)s OR location IS NULL) "
+                   "GROUP BY task_date")
+SQL_INSERT_TASKS = "INSERT INTO tasks (task_date, text, location) VALUES %s RETURNING id"
+SQL_TOGGLE = "UPDATE tasks SET done = NOT done WHERE id = %s"
+SQL_TOGGLE_MANY = "UPDATE tasks SET done = NOT done WHERE id = ANY(%s)"
+SQL_SET_TEXT = "UPDATE tasks SET text = %s WHERE id = %s"
+SQL_DELETE = "DELETE FROM tasks WHERE id = %s"
+SQL_DELETE_MANY = "DELETE FROM tasks WHERE id = ANY(%s)"
+SQL_INSERT_USER = ("INSERT INTO users (username, password) VALUES (%s, %s) "
+                   "ON CONFLICT (username) DO NOTHING RETURNING id")
+SQL_IMPORT_USERS = "INSERT INTO users (id, username, password) VALUES %s ON CONFLICT DO NOTHING"
+SQL_SELECT_USER = "SELECT id, username, password FROM users WHERE username = %s"
+SQL_GET_META = "SELECT value FROM meta WHERE key = %s"
+SQL_SET_META = ("INSERT INTO meta (key, value) VALUES (%s, %s) "
+                "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value")
+# После импорта с явными id сдвигаем последовательности, иначе BIGSERIAL выдаст занятый id
+# (учитывая next_*_id из tasks.json, чтобы не выдать id удалённых задач)
+SQL_SYNC_SEQUENCE = ("SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                     "GREATEST((SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), %s), false)")
+
+# Rows per INSERT ... VALUES statement for imports and add_tasks
+BATCH_SIZE = 1000
+
+
+class PostgresBackend:
+    """PostgreSQL implementation of the ``backend.database`` API.
+
+    Connections come from a bounded ``ThreadedConnectionPool`` that lives for
+    the whole process, so a click reuses an open connection instead of paying
+    for a new TCP/auth handshake. Each call runs in its own transaction.
+    When every connection is checked out, callers wait for one to come back.
+    """
+
+    engine = "postgres"
+
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 4):
+        if psycopg2 is None:
+            raise RuntimeError("The postgres storage engine needs psycopg2 (pip install psycopg2-binary).")
+        if not dsn:
+            raise RuntimeError("The postgres storage engine needs a DSN (postgres_dsn / TODO_PG_DSN).")
+        self.dsn = dsn
+        self.pool = ThreadedConnectionPool(min_connections, max_connections, dsn)
+        # ThreadedConnectionPool не ждёт: при исчерпании getconn() бросает
+        # PoolError. Семафор на то же число соединений заставляет ждать.
+        self._slots = threading.BoundedSemaphore(max_connections)
+        # Соединение, закреплённое за потоком на время transaction()
+        self._local = threading.local()
+
+    @contextmanager
+    def _connection(self):
+        with self._slots:
+            conn = self.pool.getconn()
+            broken = False
+            try:
+                yield conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            finally:
+                # Оборванное соединение не возвращаем в пул
+                self.pool.putconn(conn, close=broken or bool(conn.closed))
+
+    @contextmanager
+    def _cursor(self):
+        pinned = getattr(self._local, "conn", None)
+        if pinned is not None:
+            # Внутри transaction(): без commit, его сделает внешний блок
+            with pinned.cursor() as cur:
+                yield cur
+            return
+        with self._connection() as conn:
+            # "with conn" — commit при успехе, rollback при исключении
+            with conn:
+                with conn.cursor() as cur:
+                    yield cur
+
+    def close(self):
+        self.pool.closeall()
+
+    def start_background_writes(self, on_saved=None, on_error=None, policy=None):
+        # Каждый вызов — короткая транзакция на сервере через соединение из
+        # пула; копить изменения локально незачем
+        return False
+
+    def flush(self):
+        pass
+
+    @contextmanager
+    def transaction(self):
+        if getattr(self._local, "conn", None) is not None:
+            yield self
+            return
+        with self._connection() as conn:
+            self._local.conn = conn
+            try:
+                with conn:
+                    yield self
+            finally:
+                self._local.conn = None
+
+    def create_tables(self):
+        with self._cursor() as cur:
+            cur.execute(SCHEMA)
+
+    # ---- Migration ----
+
+    def needs_migration(self) -> bool:
+        self.create_tables()
+        with self._cursor() as cur:
+            cur.execute(SQL_GET_META, ("json_migrated",))
+            return cur.fetchone() is None
+
+    def import_data(self, tasks, users, meta=None):
+        """Copy the JSON data in, ids included, in one server transaction.
+
+        Rows go in ``BATCH_SIZE`` per INSERT (execute_values); ids already
+        present are skipped. Explicit ids bypass the BIGSERIAL sequences, so
+        each is then moved past both the largest id and the JSON counter in
+        ``meta`` (ids of deleted tasks stay unused). Sets ``json_migrated``.
+        """
+        with self._cursor() as cur:
+            execute_values(cur, SQL_IMPORT_TASKS, [
+                (t["id"], t["task_date"], t["text"], t.get("location"), bool(t.get("done")))
+                for t in tasks
+            ], page_size=BATCH_SIZE)
+            execute_values(cur, SQL_IMPORT_USERS, [
+                (u["id"], u["username"], u["password"]) for u in users
+            ], page_size=BATCH_SIZE)
+            meta = meta or {}
+            for table, key in (("tasks", "next_task_id"), ("users", "next_user_id")):
+                cur.execute(SQL_SYNC_SEQUENCE.format(table=table), (table, meta.get(key, 1)))
+            cur.execute(SQL_SET_META, ("json_migrated", "1"))
+
+    # ---- USERS ----
+
+    def add_user(self, username, password):
+        with self._cursor() as cur:
+            cur.execute(SQL_INSERT_USER, (username, password))
+            row = cur.fetchone()
+        return row[0] if row else False
+
+    def get_user(self, username):
+        with self._cursor() as cur:
+            cur.execute(SQL_SELECT_USER, (username,))
+            row = cur.fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "username": row[1], "password": row[2]}
+
+    # ---- TASKS ----
+
+    def add_task(self, task_date: str, text: str, location: str | None = None):
+        with self._cursor() as cur:
+            cur.execute(SQL_INSERT_TASK, (task_date, text, location))
+            return cur.fetchone()[0]
+
+    def add_tasks(self, items):
+        items = list(items)
+        if not items:
+            return []
+        with self._cursor() as cur:
+            rows = execute_values(cur, SQL_INSERT_TASKS, items, page_size=BATCH_SIZE, fetch=True)
+        return [r[0] for r in rows]
+
+    def list_tasks(self, task_date: str, location: str | None = None):
+        with self._cursor() as cur:
+            cur.execute(SQL_SELECT_DAY, {"day": task_date, "loc": location or None})
+            rows = cur.fetchall()
+        return [row_to_task(r) for r in rows]
+
+    def list_tasks_range(self, start: str, end: str, location: str | None = None):
+        with self._cursor() as cur:
+            cur.execute(SQL_SELECT_RANGE, {"start": start, "end": end, "loc": location or None})
+            rows = cur.fetchall()
+        return tasks_by_date(rows)
+
+    def count_tasks_range(self, start: str, end: str, location: str | None = None):
+        with self._cursor() as cur:
+            cur.execute(SQL_COUNT_RANGE, {"start": start, "end": end, "loc": location or None})
+            rows = cur.fetchall()
+        return {day: (total, done) for day, total, done in rows}
+
+    def toggle_task(self, task_id: int):
+        with self._cursor() as cur:
+            cur.execute(SQL_TOGGLE, (task_id,))
+
+    def toggle_tasks(self, task_ids):
+        with self._cursor() as cur:
+            cur.execute(SQL_TOGGLE_MANY, (list(task_ids),))
+
+    def update_task_text(self, task_id: int, text: str):
+        with self._cursor() as cur:
+            cur.execute(SQL_SET_TEXT, (text, task_id))
+
+    def delete_task(self, task_id: int):
+        with self._cursor() as cur:
+            cur.execute(SQL_DELETE, (task_id,))
+
+    def delete_tasks(self, task_ids):
+        with self._cursor() as cur:
+            cur.execute(SQL_DELETE_MANY, (list(task_ids),))
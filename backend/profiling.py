@@ -0,0 +1,149 @@
+"""Lightweight timing spans and counters, dumped as a Chrome trace.
+
+Off by default. Enable with ``TODO_PROFILE=1`` (trace goes to
+``cache/trace.json``), ``TODO_PROFILE=<path>``, or ``python main.py --profile``.
+Open the dump in chrome://tracing or https://ui.perfetto.dev.
+
+- ``span(name)`` / ``@traced(name)`` record a complete ("X") event;
+- ``action(name)`` is a span for one user action (click, key press); the
+  counters bumped while it runs (``count("_load")``, ``count("_save")``) are
+  attached to its args;
+- when disabled, ``traced`` costs one global lookup per call.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_TRACE_FILE = "cache/trace.json"
+
+_enabled = False
+_trace_path = None
+_events = []
+_totals = {}
+_lock = threading.Lock()
+_local = threading.local()
+_t0 = time.perf_counter()
+
+
+def _now_us() -> float:
+    return (time.perf_counter() - _t0) * 1e6
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(path: str | None = None):
+    """Start recording; the trace is written to ``path`` at exit."""
+    global _enabled, _trace_path
+    if not _enabled:
+        atexit.register(dump)
+    _enabled = True
+    _trace_path = path or DEFAULT_TRACE_FILE
+
+
+def enable_from_env():
+    value = os.environ.get("TODO_PROFILE", "")
+    if value and value != "0":
+        enable(None if value == "1" else value)
+
+
+def _record(name: str, cat: str, start_us: float, args: dict | None):
+    event = {
+        "name": name, "cat": cat, "ph": "X",
+        "ts": round(start_us, 1), "dur": round(_now_us() - start_us, 1),
+        "pid": os.getpid(), "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = args
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def span(name: str, cat: str = "app", **args):
+    if not _enabled:
+        yield
+        return
+    start = _now_us()
+    try:
+        yield
+    finally:
+        _record(name, cat, start, args)
+
+
+def traced(name: str | None = None, cat: str = "app"):
+    """Decorator form of ``span``; the name defaults to the function's qualname."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = _now_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(label, cat, start, None)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def action(name: str, **args):
+    """Span for one user action, with the counters bumped during it."""
+    if not _enabled:
+        yield
+        return
+    outer = getattr(_local, "counters", None)
+    counters = _local.counters = {}
+    start = _now_us()
+    try:
+        yield
+    finally:
+        _local.counters = outer
+        if outer is not None:
+            for key, n in counters.items():
+                outer[key] = outer.get(key, 0) + n
+        _record(name, "action", start, {**args, **counters})
+
+
+def count(name: str, n: int = 1):
+    if not _enabled:
+        return
+    counters = getattr(_local, "counters", None)
+    if counters is not None:
+        counters[name] = counters.get(name, 0) + n
+    with _lock:
+        _totals[name] = _totals.get(name, 0) + n
+
+
+def dump(path: str | None = None):
+    """Write the Chrome trace (plus counter totals) and print a short summary."""
+    path = path or _trace_path or DEFAULT_TRACE_FILE
+    with _lock:
+        events = list(_events)
+        totals = dict(_totals)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"counters": totals}}, f)
+
+    # Итог по именам: число вызовов и суммарное время
+    summary = {}
+    for e in events:
+        calls, total = summary.get(e["name"], (0, 0.0))
+        summary[e["name"]] = (calls + 1, total + e["dur"])
+    print(f"[profile] {len(events)} events -> {path}", file=sys.stderr)
+    for name, (calls, total) in sorted(summary.items(), key=lambda kv: -kv[1][1])[:15]:
+        print(f"[profile] {name:32} {calls:6d} calls {total / 1000:9.1f} ms", file=sys.stderr)
+    if totals:
+        print("[profile] counters: " + ", ".join(f"{k}={v}" for k, v in sorted(totals.items())), file=sys.stderr)
+    return path
@@ -0,0 +1,157 @@
+import bisect
+import gc
+import heapq
+import re
+import threading
+from contextlib import contextmanager
+
+# Слова: буквы/цифры любого алфавита (ru/pl/en)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str):
+    return _TOKEN_RE.findall(text.casefold())
+
+
+@contextmanager
+def _gc_paused():
+    # Сотни тысяч мелких множеств/списков: без паузы сборщик мусора
+    # многократно обходит их во время сборки и вдвое замедляет её
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class SearchIndex:
+    """Incremental inverted index over task text.
+
+    - ``postings``: token -> set of task ids; ``vocab`` is the sorted token
+      list, so a prefix is a bisect range instead of a scan over all tokens;
+    - ``docs``: task id -> [task_date, done, text, location] for the done and
+      date filters and for returning results without touching storage.
+
+    Every query term is a prefix ("bu mil" finds "buy milk"); all terms must
+    match. Thread-safe: searches run on a worker thread while the GUI thread
+    applies add/toggle/delete.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = {}
+        self.vocab = []
+        self.docs = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ---- Maintenance ----
+
+    def _link(self, task_id: int, text: str):
+        for token in set(tokenize(text)):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                bisect.insort(self.vocab, token)
+            ids.add(task_id)
+
+    def _unlink(self, task_id: int, text: str):
+        for token in set(tokenize(text)):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                i = bisect.bisect_left(self.vocab, token)
+                if i < len(self.vocab) and self.vocab[i] == token:
+                    del self.vocab[i]
+
+    def add(self, task: dict):
+        with self.lock:
+            if task["id"] in self.docs:
+                self.remove(task["id"])
+            self.docs[task["id"]] = [task["task_date"], bool(task.get("done")), task["text"], task.get("location")]
+            self._link(task["id"], task["text"])
+
+    def remove(self, task_id: int):
+        with self.lock:
+            doc = self.docs.pop(task_id, None)
+            if doc is not None:
+                self._unlink(task_id, doc[2])
+
+    def toggle(self, task_id: int):
+        with self.lock:
+            doc = self.docs.get(task_id)
+            if doc is not None:
+                doc[1] = not doc[1]
+
+    def set_text(self, task_id: int, text: str):
+        with self.lock:
+            doc = self.docs.get(task_id)
+            if doc is not None:
+                self._unlink(task_id, doc[2])
+                doc[2] = text
+                self._link(task_id, text)
+
+    def build(self, tasks):
+        """Bulk (re)build; one sort of the vocabulary instead of insort per token."""
+        with self.lock, _gc_paused():
+            self.postings, self.docs = {}, {}
+            for t in tasks:
+                self.docs[t["id"]] = [t["task_date"], bool(t.get("done")), t["text"], t.get("location")]
+                for token in set(tokenize(t["text"])):
+                    self.postings.setdefault(token, set()).add(t["id"])
+            self.vocab = sorted(self.postings)
+
+    # ---- Query ----
+
+    def _prefix_range(self, prefix: str):
+        lo = bisect.bisect_left(self.vocab, prefix)
+        hi = bisect.bisect_left(self.vocab, prefix + "\U0010ffff")
+        return lo, hi
+
+    def _matching_ids(self, prefix: str):
+        lo, hi = self._prefix_range(prefix)
+        if hi - lo == 1:
+            return self.postings[self.vocab[lo]]
+        ids = set()
+        for token in self.vocab[lo:hi]:
+            ids |= self.postings[token]
+        return ids
+
+    def search(self, query: str, done: bool | None = None, start: str | None = None,
+               end: str | None = None, limit: int = 200):
+        """Tasks matching every term of ``query`` (as prefixes), sorted by date, at most ``limit``."""
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return []
+        with self.lock:
+            # Сначала самый избирательный термин (меньше всего слов с таким префиксом)
+            ranges = sorted(((self._prefix_range(t), t) for t in terms), key=lambda r: r[0][1] - r[0][0])
+            if any(hi == lo for (lo, hi), _ in ranges):
+                return []
+            candidates = self._matching_ids(ranges[0][1])
+            for (lo, hi), term in ranges[1:]:
+                if len(candidates) <= 64:
+                    # Кандидатов мало — проверяем их текст напрямую
+                    candidates = {i for i in candidates
+                                  if any(tok.startswith(term) for tok in tokenize(self.docs[i][2]))}
+                else:
+                    candidates = candidates & self._matching_ids(term)
+                if not candidates:
+                    return []
+
+            docs = self.docs
+
+            def keep(i):
+                d = docs[i]
+                return ((done is None or d[1] == done)
+                        and (start is None or d[0] >= start)
+                        and (end is None or d[0] <= end))
+            hits = heapq.nsmallest(limit, (i for i in candidates if keep(i)), key=lambda i: (docs[i][0], i))
+            return [{"id": i, "task_date": docs[i][0], "text": docs[i][2],
+                     "location": docs[i][3], "done": docs[i][1]} for i in hits]
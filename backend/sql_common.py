@@ -0,0 +1,17 @@
+def row_to_task(row):
+    """Task dict from an ``(id, task_date, text, location, done)`` row."""
+    return {
+        "id": row[0],
+        "task_date": row[1],
+        "text": row[2],
+        "location": row[3],
+        "done": bool(row[4]),
+    }
+
+
+def tasks_by_date(rows):
+    """{"YYYY-MM-DD": [task, ...]} from rows already ordered by date, id."""
+    result = {}
+    for t in map(row_to_task, rows):
+        result.setdefault(t["task_date"], []).append(t)
+    return result
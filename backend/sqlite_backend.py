@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from backend.sql_common import row_to_task, tasks_by_date
+
+# Схема: задачи индексированы по дате, id никогда не переиспользуются (AUTOINCREMENT)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_date TEXT    NOT NULL,
+    text      TEXT    NOT NULL,
+    location  TEXT,
+    done      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_date ON tasks(task_date);
+
+CREATE TABLE IF NOT EXISTS users (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT    NOT NULL UNIQUE,
+    password TEXT    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache reuses the compiled form on every call.
+SQL_INSERT_TASK = "INSERT INTO tasks (task_date, text, location, done) VALUES (?, ?, ?, 0)"
+SQL_IMPORT_TASK = "INSERT OR IGNORE INTO tasks (id, task_date, text, location, done) VALUES (?, ?, ?, ?, ?)"
+# Фильтр по локации: задачи этой локации плюс задачи без локации
+SQL_SELECT_DAY = ("SELECT id, task_date, text, location, done FROM tasks "
+                  "WHERE task_date = ?1 AND (?2 IS NULL OR location = ?2 OR location IS NULL) ORDER BY id")
+SQL_SELECT_RANGE = ("SELECT id, task_date, text, location, done FROM tasks "
+                    "WHERE task_date BETWEEN ?1 AND ?2 AND (?3 IS NULL OR location = ?3 OR location IS NULL) "
+                    "ORDER BY task_date, id")
+SQL_COUNT_RANGE = ("SELECT task_date, COUNT(*), SUM(done) FROM tasks "
+                    "WHERE task_date BETWEEN ?1 AND ?2 AND (?3 IS NULL OR location = ?3 OR location IS NULL) "
+                    "GROUP BY task_date")
+SQL_TOGGLE = "UPDATE tasks SET done = 1 - done WHERE id = ?"
+SQL_SET_TEXT = "UPDATE tasks SET text = ? WHERE id = ?"
+SQL_DELETE = "DELETE FROM tasks WHERE id = ?"
+SQL_INSERT_USER = "INSERT INTO users (username, password) VALUES (?, ?)"
+SQL_IMPORT_USER = "INSERT OR IGNORE INTO users (id, username, password) VALUES (?, ?, ?)"
+SQL_SELECT_USER = "SELECT id, username, password FROM users WHERE username = ?"
+# Счётчик AUTOINCREMENT: переносим next_*_id из tasks.json, чтобы не выдать удалённый id
+SQL_BUMP_SEQUENCE = "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?"
+SQL_INSERT_SEQUENCE = "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)"
+SQL_GET_META = "SELECT value FROM meta WHERE key = ?"
+SQL_SET_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+
+class SqliteBackend:
+    """SQLite implementation of the ``backend.database`` API.
+
+    One connection (WAL mode) is shared by the process and serialized with a
+    lock, so it can be used from the UI thread and from background workers.
+    """
+
+    engine = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.RLock()
+        self._tx_depth = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    @contextmanager
+    def _write(self):
+        """One write transaction, or a part of the enclosing ``transaction()``."""
+        with self.lock:
+            if self._tx_depth:
+                yield self.conn
+            else:
+                with self.conn:
+                    yield self.conn
+
+    def start_background_writes(self, on_saved=None, on_error=None, policy=None):
+        # Изменения пишутся точечно и сразу; фоновый писатель не нужен
+        return False
+
+    def flush(self):
+        pass
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self._tx_depth += 1
+            try:
+                if self._tx_depth == 1:
+                    with self.conn:
+                        yield self
+                else:
+                    yield self
+            finally:
+                self._tx_depth -= 1
+
+    def create_tables(self):
+        # Схема создаётся в __init__; здесь только для единообразия API
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    # ---- Migration ----
+
+    def needs_migration(self) -> bool:
+        with self.lock:
+            row = self.conn.execute(SQL_GET_META, ("json_migrated",)).fetchone()
+        return row is None
+
+    def import_data(self, tasks, users, meta=None):
+        """Bulk-load tasks/users keeping their ids; marks the migration as done.
+
+        ``meta`` carries the JSON id counters so ids never handed out before
+        the migration (deleted tasks) stay unused afterwards.
+        """
+        with self.lock, self.conn:
+            self.conn.executemany(SQL_IMPORT_TASK, (
+                (t["id"], t["task_date"], t["text"], t.get("location"), int(bool(t.get("done"))))
+                for t in tasks
+            ))
+            self.conn.executemany(SQL_IMPORT_USER, (
+                (u["id"], u["username"], u["password"]) for u in users
+            ))
+            meta = meta or {}
+            for table, key in (("tasks", "next_task_id"), ("users", "next_user_id")):
+                last_id = meta.get(key, 1) - 1
+                if last_id > 0 and not self.conn.execute(SQL_BUMP_SEQUENCE, (last_id, table)).rowcount:
+                    self.conn.execute(SQL_INSERT_SEQUENCE, (table, last_id))
+            self.conn.execute(SQL_SET_META, ("json_migrated", "1"))
+
+    # ---- USERS ----
+
+    def add_user(self, username, password):
+        with self.lock:
+            try:
+                with self._write():
+                    cur = self.conn.execute(SQL_INSERT_USER, (username, password))
+            except sqlite3.IntegrityError:
+                return False
+            return cur.lastrowid
+
+    def get_user(self, username):
+        with self.lock:
+            row = self.conn.execute(SQL_SELECT_USER, (username,)).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "username": row[1], "password": row[2]}
+
+    # ---- TASKS ----
+
+    def add_task(self, task_date: str, text: str, location: str | None = None):
+        with self._write():
+            cur = self.conn.execute(SQL_INSERT_TASK, (task_date, text, location))
+        return cur.lastrowid
+
+    def add_tasks(self, items):
+        # executemany не отдаёт lastrowid для каждой строки — вставляем в одной транзакции
+        with self._write():
+            return [self.conn.execute(SQL_INSERT_TASK, item).lastrowid for item in items]
+
+    def list_tasks(self, task_date: str, location: str | None = None):
+        with self.lock:
+            rows = self.conn.execute(SQL_SELECT_DAY, (task_date, location or None)).fetchall()
+        return [row_to_task(r) for r in rows]
+
+    def list_tasks_range(self, start: str, end: str, location: str | None = None):
+        with self.lock:
+            rows = self.conn.execute(SQL_SELECT_RANGE, (start, end, location or None)).fetchall()
+        return tasks_by_date(rows)
+
+    def count_tasks_range(self, start: str, end: str, location: str | None = None):
+        with self.lock:
+            rows = self.conn.execute(SQL_COUNT_RANGE, (start, end, location or None)).fetchall()
+        return {day: (total, done) for day, total, done in rows}
+
+    def toggle_task(self, task_id: int):
+        with self._write():
+            self.conn.execute(SQL_TOGGLE, (task_id,))
+
+    def toggle_tasks(self, task_ids):
+        with self._write():
+            self.conn.executemany(SQL_TOGGLE, ((i,) for i in task_ids))
+
+    def update_task_text(self, task_id: int, text: str):
+        with self._write():
+            self.conn.execute(SQL_SET_TEXT, (text, task_id))
+
+    def delete_task(self, task_id: int):
+        with self._write():
+            self.conn.execute(SQL_DELETE, (task_id,))
+
+    def delete_tasks(self, task_ids):
+        with self._write():
+            self.conn.executemany(SQL_DELETE, ((i,) for i in task_ids))
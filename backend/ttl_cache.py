@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from backend.fileio import atomic_write_json
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire, optionally kept in a JSON file.
+
+    Keys are strings (they go into JSON as object keys). Every entry stores
+    its own absolute expiry time, so entries with different TTLs (for example
+    a found city and a name that does not resolve) live in the same cache.
+
+    ``get`` returns ``(value, fresh)`` or None: an expired entry is still
+    returned with ``fresh=False`` so a caller can fall back to it when the
+    network is down. Expired entries are dropped only by LRU eviction.
+
+    The file is read on first access and rewritten atomically by ``save``.
+    """
+
+    def __init__(self, max_entries: int, path: str | None = None, clock=time.time):
+        self.max_entries = max_entries
+        self.path = path
+        self.clock = clock
+        self.lock = threading.Lock()
+        # Сохранения по очереди: иначе старый снимок мог бы перезаписать новый
+        self._save_lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> [expires_at, value]
+        self._loaded = path is None
+        self._dirty = False
+
+    def __len__(self):
+        with self.lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Порядок в файле — от давно использованных к недавним
+        for key, entry in (data.get("entries") or {}).items() if isinstance(data, dict) else ():
+            if isinstance(entry, list) and len(entry) == 2:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        with self.lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[0] > self.clock()
+
+    def put(self, key: str, value, ttl: float):
+        self.put_many({key: value}, ttl)
+
+    def put_many(self, items: dict, ttl: float):
+        with self.lock:
+            self._ensure_loaded()
+            expires = self.clock() + ttl
+            for key, value in items.items():
+                self._entries[key] = [expires, value]
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._loaded = True
+            self._dirty = True
+
+    def save(self):
+        """Write the entries to ``path`` if they changed since the last save."""
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self.lock:
+                if not self._dirty:
+                    return
+                data = {"entries": dict(self._entries)}
+                self._dirty = False
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                atomic_write_json(self.path, data, backup=False, ensure_ascii=False)
+            except OSError:
+                # Кеш — не данные пользователя: не записался, значит, запросим ещё раз
+                with self.lock:
+                    self._dirty = True
@@ -0,0 +1,299 @@
+"""Headless benchmarks for the storage backends and the main window.
+
+Generates synthetic ``cache/tasks.json`` datasets (tasks spread over several
+years), times the backend calls and the right-panel rebuilds under the
+offscreen Qt platform, and writes the results as JSON. With ``--baseline``
+the run is compared against a previous results file.
+
+    python bench/run.py                          # 1k, 10k, 100k; json engine
+    python bench/run.py --sizes 1000,10000 --engine sqlite --no-ui
+    python bench/run.py --out bench/baseline.json
+    python bench/run.py --baseline bench/baseline.json --fail-on-regression
+
+Datasets go to a temporary directory unless ``--data-dir`` is given; the
+user's own cache/ (tasks, settings) is never touched.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+# Данные равномерно по трём годам
+FIRST_DAY = date(2023, 1, 1)
+YEARS = 3
+LOCATIONS = (None, None, None, None, "Warszawa", "Kraków", "Berlin")
+DEFAULT_THRESHOLD = 0.2
+
+
+# ---- Dataset ----
+
+def generate_dataset(path: str, size: int, seed: int = 0):
+    """Write a tasks.json snapshot with ``size`` tasks; returns the list of dates used."""
+    rng = random.Random(seed + size)
+    span_days = 365 * YEARS
+    tasks = []
+    for i in range(1, size + 1):
+        day = FIRST_DAY + timedelta(days=rng.randrange(span_days))
+        tasks.append({
+            "id": i,
+            "task_date": day.isoformat(),
+            "text": f"Task #{i} " + rng.choice(("call", "buy", "write", "read", "fix", "plan")),
+            "location": rng.choice(LOCATIONS),
+            "done": rng.random() < 0.3,
+        })
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": {"next_task_id": size + 1, "next_user_id": 1}, "tasks": tasks, "users": []},
+                  f, ensure_ascii=False)
+
+
+def _random_days(rng, n):
+    return [(FIRST_DAY + timedelta(days=rng.randrange(365 * YEARS))) for _ in range(n)]
+
+
+# ---- Timing ----
+
+def _stats(samples_ms):
+    return {
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "min_ms": round(min(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+        "n": len(samples_ms),
+    }
+
+
+def _timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        t = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - t) * 1000)
+    return _stats(samples)
+
+
+def _once(fn):
+    t = time.perf_counter()
+    result = fn()
+    return _stats([(time.perf_counter() - t) * 1000]), result
+
+
+# ---- Backend ----
+
+def bench_backend(db, engine: str, size: int, repeat: int):
+    rng = random.Random(size)
+    results = {}
+
+    # Холодный старт: создание движка и первое чтение (для SQL — ещё и импорт tasks.json)
+    def open_backend():
+        db.configure(engine)
+        db.create_tables()
+        return db.list_tasks(FIRST_DAY)
+    results["open+first_read"], _ = _once(open_backend)
+
+    days = _random_days(rng, repeat)
+    results["list_tasks"] = _timed(db.list_tasks, [(d,) for d in days])
+    results["list_tasks_range.week"] = _timed(
+        db.list_tasks_range, [(d - timedelta(days=d.weekday()), d - timedelta(days=d.weekday()) + timedelta(days=6))
+                              for d in days])
+    months = [(d.replace(day=1), (d.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1))
+              for d in days]
+    results["list_tasks_range.month"] = _timed(db.list_tasks_range, months)
+    results["count_tasks_range.month"] = _timed(db.count_tasks_range, months)
+    # Первый поиск строит индекс; дальше — запросы по префиксам
+    results["search.build"], _ = _once(lambda: db.search_tasks(""))
+    queries = [(rng.choice(("ca", "buy", "wri", "task 1", "fix #9", "pl")),) for _ in range(repeat)]
+    results["search_tasks"] = _timed(db.search_tasks, queries)
+
+    # Изменения — как в приложении: с фоновой записью (если движок её поддерживает),
+    # стоимость записи на диск меряется отдельно через flush
+    db.start_background_writes()
+    added = []
+    results["add_task"] = _timed(lambda d: added.append(db.add_task(d, "bench task")), [(d,) for d in days])
+    results["flush.after_add"], _ = _once(db.flush)
+    existing = rng.sample(range(1, size + 1), min(repeat, size))
+    results["toggle_task"] = _timed(db.toggle_task, [(i,) for i in existing])
+    results["flush.after_toggle"], _ = _once(db.flush)
+    results["delete_task"] = _timed(db.delete_task, [(i,) for i in added])
+    results["flush.after_delete"], _ = _once(db.flush)
+    return results
+
+
+# ---- UI ----
+
+def bench_ui(app, size: int, repeat: int, data_dir: str):
+    from PySide6.QtCore import QDate
+    from ui import main_window
+
+    # Настройки окна (тема при переключении) — во временный каталог
+    main_window.SETTINGS_PATH = os.path.join(data_dir, "cache", "settings.json")
+    # Погода ходит в сеть — в замеры не входит
+    main_window.save_setting("weather", False)
+    results = {}
+
+    def build():
+        w = main_window.MainWindow()
+        w.resize(1200, 800)
+        w.show()
+        app.processEvents()
+        return w
+    results["window_startup"], w = _once(build)
+
+    rng = random.Random(size)
+    dates = [QDate(d.year, d.month, d.day) for d in _random_days(rng, repeat)]
+
+    def select(qd):
+        w.calendar.setSelectedDate(qd)
+        app.processEvents()
+    results["select_day"] = _timed(select, [(qd,) for qd in dates])
+
+    for mode in ("day", "week", "month"):
+        populate = getattr(w, f"populate_{mode}_view")
+        w.view_mode = mode
+
+        def rebuild(qd, populate=populate):
+            w.calendar.blockSignals(True)
+            w.calendar.setSelectedDate(qd)
+            w.calendar.blockSignals(False)
+            populate()
+            app.processEvents()
+        results[f"populate_{mode}_view"] = _timed(rebuild, [(qd,) for qd in dates])
+
+    # toggle_theme анимирует затемнение (2 x 200 мс); меряем саму смену темы
+    def switch_theme():
+        w.theme = "light" if w.theme == "dark" else "dark"
+        w.apply_styles()
+        w.repaint()
+    results["toggle_theme"] = _timed(switch_theme, [()] * max(2, repeat // 5))
+
+    w.close()
+    w.deleteLater()
+    app.processEvents()
+    return results
+
+
+# ---- Comparison ----
+
+def compare(current: dict, baseline: dict, threshold: float):
+    """Per-metric ratio current/baseline (median); ``regressions`` lists the slow ones."""
+    rows, regressions = [], []
+    for size, groups in current["results"].items():
+        base_groups = baseline.get("results", {}).get(size, {})
+        for group, metrics in groups.items():
+            for name, cur in metrics.items():
+                base = base_groups.get(group, {}).get(name)
+                if not base or not base.get("median_ms"):
+                    continue
+                ratio = cur["median_ms"] / base["median_ms"]
+                status = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else "same"
+                row = {"size": size, "metric": f"{group}.{name}", "baseline_ms": base["median_ms"],
+                       "current_ms": cur["median_ms"], "ratio": round(ratio, 3), "status": status}
+                rows.append(row)
+                if status == "slower":
+                    regressions.append(row)
+    return {"threshold": threshold, "rows": rows, "regressions": regressions}
+
+
+def _print_results(report: dict):
+    for size, groups in report["results"].items():
+        print(f"\n== {size} tasks ({report['meta']['engine']}) ==")
+        for group, metrics in groups.items():
+            for name, s in metrics.items():
+                print(f"  {group + '.' + name:42} median {s['median_ms']:9.3f} ms   min {s['min_ms']:9.3f} ms   n={s['n']}")
+    comparison = report.get("comparison")
+    if comparison:
+        print(f"\n== vs baseline (threshold {comparison['threshold']:.0%}) ==")
+        for row in comparison["rows"]:
+            if row["status"] != "same":
+                print(f"  {row['size']:>7} {row['metric']:42} {row['baseline_ms']:9.3f} -> {row['current_ms']:9.3f} ms"
+                      f"  x{row['ratio']:.2f} {row['status']}")
+        print(f"  {len(comparison['regressions'])} regression(s)")
+
+
+# ---- CLI ----
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated dataset sizes (default: %(default)s)")
+    parser.add_argument("--engine", default="json", choices=("json", "journal", "sqlite"))
+    parser.add_argument("--repeat", type=int, default=20, help="samples per metric (default: %(default)s)")
+    parser.add_argument("--data-dir", help="where to generate datasets (default: a temporary directory)")
+    parser.add_argument("--keep-data", action="store_true", help="do not delete the generated datasets")
+    parser.add_argument("--no-ui", action="store_true", help="skip the MainWindow benchmarks")
+    parser.add_argument("--out", default=os.path.join(ROOT, "bench", "results.json"),
+                        help="results file (default: %(default)s)")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown counted as a regression (default: %(default)s)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # Движок задаётся флагом, а не окружением/настройками пользователя
+    os.environ.pop("TODO_STORAGE", None)
+
+    data_root = os.path.abspath(args.data_dir or tempfile.mkdtemp(prefix="todo-bench-"))
+    out_path = os.path.abspath(args.out)
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    cwd = os.getcwd()
+
+    app = None
+    if not args.no_ui:
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+    from backend import database as db
+
+    report = {
+        "meta": {
+            "engine": args.engine, "repeat": args.repeat, "sizes": sizes,
+            "python": platform.python_version(), "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    try:
+        for size in sizes:
+            data_dir = os.path.join(data_root, str(size))
+            shutil.rmtree(data_dir, ignore_errors=True)
+            generate_dataset(os.path.join(data_dir, db.CACHE_FILE), size)
+            # Пути движков относительные (cache/...) — работаем внутри каталога набора
+            os.chdir(data_dir)
+            groups = {"backend": bench_backend(db, args.engine, size, args.repeat)}
+            if app is not None:
+                groups["ui"] = bench_ui(app, size, args.repeat, data_dir)
+            db.flush()
+            report["results"][str(size)] = groups
+    finally:
+        os.chdir(cwd)
+        if not args.keep_data and not args.data_dir:
+            shutil.rmtree(data_root, ignore_errors=True)
+
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    _print_results(report)
+    print(f"\nresults -> {out_path}")
+
+    if args.fail_on_regression and report.get("comparison", {}).get("regressions"):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
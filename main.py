@@ -1,16 +1,54 @@
+import os
 import sys
+import time
+
+# Отметки времени старта (TODO_STARTUP_TIMING=1): от запуска процесса до первого кадра
+_T0 = time.perf_counter()
+STARTUP_TIMING = os.environ.get("TODO_STARTUP_TIMING", "") not in ("", "0")
+
+
+def _mark(label: str):
+    if STARTUP_TIMING:
+        print(f"[startup] {label}: {(time.perf_counter() - _T0) * 1000:.0f} ms", file=sys.stderr)
+
+
 from PySide6.QtWidgets import QApplication, QWidget
 from ui.main_window import MainWindow
-from backend.database import create_tables
+from backend import profiling
+from backend.database import create_tables, flush
+
+_mark("imports")
+
+
+def _parse_profile_flag(argv):
+    """--profile или --profile=<trace.json>; флаг убираем из argv для Qt."""
+    rest = []
+    for arg in argv:
+        if arg == "--profile":
+            profiling.enable()
+        elif arg.startswith("--profile="):
+            profiling.enable(arg.split("=", 1)[1])
+        else:
+            rest.append(arg)
+    return rest
+
 
 def main():
+    # Профилирование: TODO_PROFILE=1|<путь> или --profile[=<путь>]
+    profiling.enable_from_env()
+    sys.argv = _parse_profile_flag(sys.argv)
     create_tables()
+    _mark("create_tables")
 
     app = QApplication(sys.argv)
+    # Фоновый писатель откладывает запись — перед выходом сбрасываем всё на диск
+    app.aboutToQuit.connect(flush)
     window = MainWindow()
+    _mark("window built")
+    window.firstPainted.connect(lambda: _mark("first paint"))
     window.show()
 
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,75 @@
+"""Lock ordering of the JSON engines: a slow disk write must never deadlock callers."""
+import threading
+import time
+
+from backend import database
+
+TIMEOUT = 5.0
+
+
+def _run_with_timeout(fn):
+    errors = []
+
+    def target():
+        try:
+            fn()
+        except BaseException as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    t = threading.Thread(target=target, daemon=True)
+    t.start()
+    t.join(TIMEOUT)
+    assert not t.is_alive(), "deadlock: call did not return"
+    assert not errors, errors
+
+
+def _slow(monkeypatch, name, started):
+    real = getattr(database, name)
+
+    def slow(*args, **kwargs):
+        started.set()
+        time.sleep(0.3)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(database, name, slow)
+
+
+def test_transaction_during_slow_background_write(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.json")
+    backend = database.JsonBackend(path)
+    backend.create_tables()
+    writing = threading.Event()
+    _slow(monkeypatch, "atomic_write_json", writing)
+    backend.start_background_writes(policy=database.FlushPolicy(immediate=True))
+
+    backend.add_task("2025-01-01", "first")
+    assert writing.wait(TIMEOUT)
+
+    def tx():
+        with backend.transaction():
+            backend.add_task("2025-01-02", "second")
+    _run_with_timeout(tx)
+    _run_with_timeout(backend.close)
+
+    reread = database.JsonBackend(path)
+    assert [t["text"] for t in reread.list_tasks("2025-01-01")] == ["first"]
+    assert [t["text"] for t in reread.list_tasks("2025-01-02")] == ["second"]
+
+
+def test_journal_add_during_slow_compaction(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.json")
+    backend = database.JsonBackend(path, "journal")
+    backend.create_tables()
+    monkeypatch.setattr(database, "JOURNAL_COMPACT_BYTES", 1)
+    compacting = threading.Event()
+    _slow(monkeypatch, "atomic_write_text", compacting)
+
+    backend.add_task("2025-01-01", "first")
+    assert compacting.wait(TIMEOUT)
+    _run_with_timeout(lambda: backend.add_task("2025-01-01", "second"))
+    # Дождаться фонового сжатия, прежде чем читать файлы заново
+    _run_with_timeout(lambda: backend.store.io_lock.acquire() and backend.store.io_lock.release())
+    backend.close()
+
+    reread = database.JsonBackend(path, "journal")
+    assert [t["text"] for t in reread.list_tasks("2025-01-01")] == ["first", "second"]
@@ -0,0 +1,58 @@
+"""Journal engine: recovery from a line torn by a crash."""
+import os
+
+import pytest
+
+from backend import database
+
+
+def _texts(path):
+    backend = database.JsonBackend(path, "journal")
+    try:
+        return [t["text"] for t in backend.list_tasks("2025-01-01")]
+    finally:
+        backend.close()
+
+
+@pytest.mark.parametrize("tail", [b'{"op": "add_task", "ta', b'{"op": "set_done", "id": 1, "done": true}'],
+                         ids=["torn", "no-newline"])
+def test_append_after_torn_last_line_survives_restart(tmp_path, tail):
+    path = str(tmp_path / "tasks.json")
+    backend = database.JsonBackend(path, "journal")
+    backend.create_tables()
+    backend.add_task("2025-01-01", "one")
+    backend.add_task("2025-01-01", "two")
+    backend.close()
+    # Сбой посреди дозаписи
+    with open(os.path.splitext(path)[0] + ".journal", "ab") as f:
+        f.write(tail)
+
+    backend = database.JsonBackend(path, "journal")
+    backend.add_task("2025-01-01", "three")
+    backend.add_task("2025-01-01", "four")
+    backend.close()
+
+    assert _texts(path) == ["one", "two", "three", "four"]
+
+
+def test_failed_append_leaves_no_partial_line(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.json")
+    backend = database.JsonBackend(path, "journal")
+    backend.create_tables()
+    backend.add_task("2025-01-01", "one")
+    journal = os.path.splitext(path)[0] + ".journal"
+    size = os.path.getsize(journal)
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(database.os, "fsync", failing_fsync)
+    with pytest.raises(OSError):
+        backend.add_task("2025-01-01", "two")
+    assert os.path.getsize(journal) == size
+    monkeypatch.undo()
+
+    # Повтор: операция вернулась в очередь
+    backend.store.commit()
+    backend.close()
+    assert _texts(path) == ["one", "two"]
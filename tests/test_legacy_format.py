@@ -0,0 +1,23 @@
+"""tasks.json in the old README format: a bare list of tasks keyed by "date"."""
+import json
+
+from backend import database
+
+
+def test_old_readme_list_is_upgraded(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([
+        {"id": 1, "date": "2025-01-01", "text": "Buy groceries", "done": False},
+        {"id": 4, "date": "2025-01-02", "text": "Call mom", "done": True},
+    ]), encoding="utf-8")
+
+    backend = database.JsonBackend(str(path))
+    [task] = backend.list_tasks("2025-01-01")
+    assert task == {"id": 1, "task_date": "2025-01-01", "text": "Buy groceries", "location": None, "done": False}
+    assert backend.list_tasks("2025-01-02")[0]["done"] is True
+    # Следующий id — после максимального из файла
+    assert backend.add_task("2025-01-03", "new") == 5
+    backend.close()
+
+    reread = json.loads(path.read_text(encoding="utf-8"))
+    assert [t["task_date"] for t in reread["tasks"]] == ["2025-01-01", "2025-01-02", "2025-01-03"]
@@ -0,0 +1,43 @@
+"""One-shot import of tasks.json into the SQL engines."""
+from backend import database
+
+
+def _texts():
+    return [t["text"] for t in database.list_tasks("2025-01-01")]
+
+
+def test_json_file_created_later_is_not_imported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cache").mkdir()
+    monkeypatch.delenv("TODO_STORAGE", raising=False)
+
+    database.configure("sqlite")
+    database.create_tables()
+    database.add_task("2025-01-01", "in sqlite")
+
+    # Проба движка json: появляется tasks.json (id 1 совпадает, id 2 — нет)
+    database.configure("json")
+    database.create_tables()
+    database.add_tasks([("2025-01-01", "in json"), ("2025-01-01", "also in json")])
+
+    database.configure("sqlite")
+    assert _texts() == ["in sqlite"]
+    database.configure("json")
+    assert _texts() == ["in json", "also in json"]
+
+
+def test_existing_json_file_is_imported_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cache").mkdir()
+    monkeypatch.delenv("TODO_STORAGE", raising=False)
+
+    database.configure("json")
+    database.create_tables()
+    database.add_task("2025-01-01", "from json")
+
+    database.configure("sqlite")
+    database.create_tables()
+    assert _texts() == ["from json"]
+    database.add_task("2025-01-01", "in sqlite")
+    database.configure("sqlite")
+    assert _texts() == ["from json", "in sqlite"]
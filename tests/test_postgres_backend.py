@@ -0,0 +1,71 @@
+"""PostgresBackend against a real server; set TODO_PG_DSN to run."""
+import os
+import threading
+import uuid
+
+import pytest
+
+DSN = os.environ.get("TODO_PG_DSN")
+pytestmark = pytest.mark.skipif(not DSN, reason="TODO_PG_DSN is not set")
+
+psycopg2 = pytest.importorskip("psycopg2")
+from psycopg2.extensions import make_dsn  # noqa: E402
+
+from backend.postgres_backend import PostgresBackend  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    # Отдельная схема: тест не трогает таблицы настоящего приложения
+    schema = "todo_test_" + uuid.uuid4().hex[:8]
+    admin = psycopg2.connect(DSN)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+    b = PostgresBackend(make_dsn(DSN, options=f"-csearch_path={schema}"), max_connections=2)
+    b.create_tables()
+    try:
+        yield b
+    finally:
+        b.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def test_crud(backend):
+    task_id = backend.add_task("2025-01-01", "buy milk", "Kraków")
+    backend.toggle_task(task_id)
+    backend.update_task_text(task_id, "buy eggs")
+    [task] = backend.list_tasks("2025-01-01")
+    assert (task["text"], task["location"], task["done"]) == ("buy eggs", "Kraków", True)
+    backend.delete_task(task_id)
+    assert backend.list_tasks("2025-01-01") == []
+
+
+def test_more_threads_than_connections_wait_for_one(backend):
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(5):
+                backend.add_task("2025-01-02", f"task {n}.{i}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    assert not errors, errors
+    assert len(backend.list_tasks("2025-01-02")) == 40
+
+
+def test_transaction_keeps_its_connection(backend):
+    with backend.transaction():
+        backend.add_task("2025-01-03", "a")
+        # Вложенные вызовы идут через закреплённое соединение, а не ждут слот
+        with backend.transaction():
+            backend.add_task("2025-01-03", "b")
+    assert [t["text"] for t in backend.list_tasks("2025-01-03")] == ["a", "b"]
@@ -0,0 +1,13 @@
+"""Card text of the schedule panel."""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from ui.schedule_view import weather_text
+
+
+def test_weather_text_skips_missing_values():
+    assert weather_text("Kraków", None) == "Kraków"
+    assert weather_text("Kraków", {"tmax": 12.4, "tmin": 4.6, "precipitation": 0.5}) == "Kraków · 12°/5° · 0.5 mm"
+    assert weather_text("Kraków", {"tmax": 12.4, "tmin": None}) == "Kraków · 12°"
+    assert weather_text("Kraków", {"tmax": None, "tmin": None, "precipitation": None}) == "Kraków"
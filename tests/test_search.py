@@ -0,0 +1,72 @@
+"""Search index of the facade: external edits and single-flight building."""
+import json
+import os
+import threading
+
+from backend import database
+from backend.search import SearchIndex
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cache").mkdir()
+    monkeypatch.delenv("TODO_STORAGE", raising=False)
+    database.configure("json")
+    database.create_tables()
+
+
+def _texts(query):
+    return [t["text"] for t in database.search_tasks(query)]
+
+
+def _edit_text_on_disk(old, new):
+    path = database.CACHE_FILE
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for task in data["tasks"]:
+        if task["text"] == old:
+            task["text"] = new
+    st = os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    # Та же длина текста: штамп должен отличаться хотя бы временем
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_external_edit_is_seen_by_next_search(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    database.add_tasks([("2025-01-01", "buy milk")])
+    assert _texts("milk") == ["buy milk"]
+
+    _edit_text_on_disk("buy milk", "buy eggs")
+    assert _texts("milk") == []
+    assert _texts("eggs") == ["buy eggs"]
+
+
+def test_concurrent_first_searches_build_once(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    database.add_tasks([("2025-01-01", f"task {i}") for i in range(50)])
+    database.configure("json")
+
+    builds = []
+    real_build = SearchIndex.build
+
+    def counting_build(self, tasks):
+        builds.append(1)
+        return real_build(self, tasks)
+
+    monkeypatch.setattr(SearchIndex, "build", counting_build)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(len(database.search_tasks("task")))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert results == [50] * 4
+    assert len(builds) == 1
@@ -0,0 +1,42 @@
+"""Edits made to tasks.json by hand while our changes wait for the writer."""
+import json
+import os
+
+import pytest
+
+from backend import database
+
+
+def _add_on_disk(path, task_id, text):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["tasks"].append({"id": task_id, "task_date": "2025-01-01", "text": text,
+                          "location": None, "done": False})
+    st = os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.mark.parametrize("engine", ["json", "journal"])
+def test_queued_changes_do_not_overwrite_external_edit(tmp_path, engine):
+    path = str(tmp_path / "tasks.json")
+    backend = database.JsonBackend(path, engine)
+    backend.create_tables()
+    first = backend.add_task("2025-01-01", "first")
+    backend.store.write_snapshot()
+    backend.start_background_writes(policy=database.FlushPolicy(idle_ms=60_000))
+
+    ours = backend.add_task("2025-01-01", "ours")
+    backend.toggle_task(ours)
+    # Пока «ours» ждёт записи, кто-то дописал задачу в файл — с тем же id
+    _add_on_disk(path, ours, "theirs")
+    _add_on_disk(path, ours + 10, "theirs too")
+    backend.close()
+
+    reread = database.JsonBackend(path, engine)
+    tasks = {t["text"]: t for t in reread.list_tasks("2025-01-01")}
+    assert sorted(tasks) == ["first", "ours", "theirs", "theirs too"]
+    assert tasks["first"]["id"] == first
+    assert tasks["theirs"]["id"] == ours
+    assert tasks["ours"]["done"] and not tasks["theirs"]["done"]
@@ -0,0 +1,86 @@
+"""WeatherService: de-duplication, cancellation and shutdown without touching the network."""
+import os
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import shiboken6
+from PySide6.QtCore import QCoreApplication, QObject
+
+from ui import weather_service
+
+
+def _app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _pump(app, seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def _fake_range(calls):
+    def get_weather_range(location, start, end):
+        calls.append(location)
+        time.sleep(0.05)
+        return {start: {"date": start, "tmax": 1.0, "tmin": 0.0}}
+    return get_weather_range
+
+
+def test_identical_requests_share_one_fetch(monkeypatch):
+    app = _app()
+    calls = []
+    monkeypatch.setattr(weather_service, "get_weather_range", _fake_range(calls))
+    service = weather_service.WeatherService()
+    got = []
+    service.ready.connect(lambda *args: got.append(args))
+
+    for _ in range(3):
+        service.request("Kraków", "2025-01-01", "2025-01-07")
+    service.request(" kraków ", "2025-01-01", "2025-01-07")
+    _pump(app, 0.5)
+
+    assert calls == ["Kraków"]
+    assert len(got) == 1
+
+
+def test_cancel_after_job_finished_before_its_answer_is_delivered(monkeypatch):
+    app = _app()
+    calls = []
+    monkeypatch.setattr(weather_service, "get_weather_range", _fake_range(calls))
+    service = weather_service.WeatherService()
+    got = []
+    service.ready.connect(lambda *args: got.append(args))
+
+    service.request("Kraków", "2025-01-01", "2025-01-07")
+    # GUI-поток занят: задание успевает завершиться, ответ ждёт в очереди
+    time.sleep(0.2)
+    service.cancel_all()
+    _pump(app, 0.2)
+
+    assert got == []
+    assert service.pending() == 0
+
+
+def test_closing_the_owner_does_not_wait_for_running_fetches(monkeypatch):
+    app = _app()
+    started = threading.Event()
+
+    def slow_range(location, start, end):
+        started.set()
+        time.sleep(2.0)
+        return {}
+
+    monkeypatch.setattr(weather_service, "get_weather_range", slow_range)
+    window = QObject()
+    service = weather_service.WeatherService(window)
+    service.request("Kraków", "2025-01-01", "2025-01-07")
+    assert started.wait(1.0)
+
+    t = time.monotonic()
+    shiboken6.delete(window)
+    app.processEvents()
+    assert time.monotonic() - t < 0.5
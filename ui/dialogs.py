@@ -0,0 +1,134 @@
+from PySide6.QtWidgets import QDialog, QHBoxLayout, QLabel, QLineEdit, QPushButton, QVBoxLayout
+
+# Диалоги открываются только по действию пользователя — MainWindow
+# импортирует модуль лениво, чтобы не тратить на него время при старте.
+
+
+class AddTaskDialog(QDialog):
+    """Диалог добавления задачи, стилизованный под общую концепцию (light/pastel).
+
+    Параметры текста передаются для поддержки i18n.
+    """
+    def __init__(self, parent=None,
+                 title_text: str = "Новая задача",
+                 hint_text: str = "Введите текст задачи и нажмите Добавить",
+                 placeholder: str = "Например: Купить продукты в 18:00",
+                 location_placeholder: str = "Место (необязательно): например, Краков",
+                 btn_add_text: str = "Добавить",
+                 btn_cancel_text: str = "Отмена"):
+        super().__init__(parent)
+        self.setObjectName("addDialog")
+        self.setModal(True)
+        self.setWindowTitle(title_text)
+
+        wrap = QVBoxLayout()
+        wrap.setContentsMargins(16, 14, 16, 14)
+        wrap.setSpacing(10)
+
+        title = QLabel(title_text)
+        title.setObjectName("addTitle")
+        hint = QLabel(hint_text)
+        hint.setObjectName("addHint")
+
+        self.edit = QLineEdit()
+        self.edit.setObjectName("addInput")
+        self.edit.setPlaceholderText(placeholder)
+        self.edit.setMaxLength(500)
+
+        # Место задачи — по нему в расписании показывается погода
+        self.location_edit = QLineEdit()
+        self.location_edit.setObjectName("addInput")
+        self.location_edit.setPlaceholderText(location_placeholder)
+        self.location_edit.setMaxLength(100)
+
+        # Кнопки
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.btn_cancel = QPushButton(btn_cancel_text)
+        self.btn_cancel.setObjectName("btnSecondary")
+        self.btn_add = QPushButton(btn_add_text)
+        self.btn_add.setObjectName("btnPrimary")
+        self.btn_add.setEnabled(False)
+        buttons.setSpacing(8)
+        buttons.addWidget(self.btn_cancel)
+        buttons.addWidget(self.btn_add)
+
+        wrap.addWidget(title)
+        wrap.addWidget(hint)
+        wrap.addWidget(self.edit)
+        wrap.addWidget(self.location_edit)
+        wrap.addLayout(buttons)
+        self.setLayout(wrap)
+
+        # Логика
+        self.btn_cancel.clicked.connect(self.reject)
+        self.btn_add.clicked.connect(self._on_accept)
+        self.edit.textChanged.connect(self._on_text_changed)
+        self.edit.returnPressed.connect(self._on_return_pressed)
+        self.location_edit.returnPressed.connect(self._on_return_pressed)
+
+        # Установка размеров
+        self.resize(420, 200)
+
+    def _on_text_changed(self, text: str):
+        self.btn_add.setEnabled(bool(text.strip()))
+
+    def _on_return_pressed(self):
+        if self.btn_add.isEnabled():
+            self._on_accept()
+
+    def _on_accept(self):
+        if not self.edit.text().strip():
+            return
+        self.accept()
+
+    def text(self) -> str:
+        return self.edit.text()
+
+    def location(self) -> str | None:
+        return " ".join(self.location_edit.text().split()) or None
+
+
+class ConfirmDialog(QDialog):
+    """Подтверждение действия (удаление) в общем светлом стиле.
+
+    Использование:
+        dlg = ConfirmDialog("Удалить задачу", f"Удалить \u00AB{preview}\u00BB? Это действие нельзя отменить.", parent)
+        if dlg.exec() == QDialog.Accepted:
+            # выполнять удаление
+    """
+    def __init__(self, title: str, message: str, parent=None,
+                 cancel_text: str = "Отмена", ok_text: str = "Удалить"):
+        super().__init__(parent)
+        self.setObjectName("confirmDialog")
+        self.setModal(True)
+        self.setWindowTitle(title)
+
+        wrap = QVBoxLayout()
+        wrap.setContentsMargins(16, 14, 16, 14)
+        wrap.setSpacing(10)
+
+        lbl_title = QLabel(title)
+        lbl_title.setObjectName("confirmTitle")
+        lbl_msg = QLabel(message)
+        lbl_msg.setWordWrap(True)
+        lbl_msg.setObjectName("confirmMessage")
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.btn_cancel = QPushButton(cancel_text)
+        self.btn_cancel.setObjectName("btnSecondary")
+        self.btn_delete = QPushButton(ok_text)
+        self.btn_delete.setObjectName("btnDanger")
+        buttons.setSpacing(8)
+        buttons.addWidget(self.btn_cancel)
+        buttons.addWidget(self.btn_delete)
+
+        wrap.addWidget(lbl_title)
+        wrap.addWidget(lbl_msg)
+        wrap.addLayout(buttons)
+        self.setLayout(wrap)
+
+        self.btn_cancel.clicked.connect(self.reject)
+        self.btn_delete.clicked.connect(self.accept)
+        self.resize(460, 160)
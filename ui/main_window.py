@@ -1,140 +1,83 @@
+import json
+import os
+
 from PySide6.QtWidgets import (
     QMainWindow, QPushButton, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QListWidget, QListWidgetItem, QMessageBox, QGraphicsDropShadowEffect,
-    QCalendarWidget, QScrollArea, QFrame, QInputDialog, QMenu, QDialog,
-    QLineEdit, QComboBox
+    QListView, QAbstractItemView, QMessageBox,
+    QFrame, QMenu, QDialog,
+    QComboBox, QLineEdit
 )
-from PySide6.QtCore import QDate, Qt, QEvent
+from PySide6.QtCore import QDate, Qt, QEvent, QObject, QTimer, Signal
 from PySide6.QtCore import QLocale
-from backend.database import add_task, list_tasks, toggle_task, delete_task
-
-class AddTaskDialog(QDialog):
-    """Диалог добавления задачи, стилизованный под общую концепцию (light/pastel).
-
-    Параметры текста передаются для поддержки i18n.
-    """
-    def __init__(self, parent=None,
-                 title_text: str = "Новая задача",
-                 hint_text: str = "Введите текст задачи и нажмите Добавить",
-                 placeholder: str = "Например: Купить продукты в 18:00",
-                 btn_add_text: str = "Добавить",
-                 btn_cancel_text: str = "Отмена"):
-        super().__init__(parent)
-        self.setObjectName("addDialog")
-        self.setModal(True)
-        self.setWindowTitle(title_text)
-
-        wrap = QVBoxLayout()
-        wrap.setContentsMargins(16, 14, 16, 14)
-        wrap.setSpacing(10)
-
-        title = QLabel(title_text)
-        title.setObjectName("addTitle")
-        hint = QLabel(hint_text)
-        hint.setObjectName("addHint")
-
-        self.edit = QLineEdit()
-        self.edit.setObjectName("addInput")
-        self.edit.setPlaceholderText(placeholder)
-        self.edit.setMaxLength(500)
-
-        # Кнопки
-        buttons = QHBoxLayout()
-        buttons.addStretch()
-        self.btn_cancel = QPushButton(btn_cancel_text)
-        self.btn_cancel.setObjectName("btnSecondary")
-        self.btn_add = QPushButton(btn_add_text)
-        self.btn_add.setObjectName("btnPrimary")
-        self.btn_add.setEnabled(False)
-        buttons.setSpacing(8)
-        buttons.addWidget(self.btn_cancel)
-        buttons.addWidget(self.btn_add)
-
-        wrap.addWidget(title)
-        wrap.addWidget(hint)
-        wrap.addWidget(self.edit)
-        wrap.addLayout(buttons)
-        self.setLayout(wrap)
-
-        # Логика
-        self.btn_cancel.clicked.connect(self.reject)
-        self.btn_add.clicked.connect(self._on_accept)
-        self.edit.textChanged.connect(self._on_text_changed)
-        self.edit.returnPressed.connect(self._on_return_pressed)
-
-        # Установка размеров
-        self.resize(420, 160)
-
-    def _on_text_changed(self, text: str):
-        self.btn_add.setEnabled(bool(text.strip()))
-
-    def _on_return_pressed(self):
-        if self.btn_add.isEnabled():
-            self._on_accept()
-
-    def _on_accept(self):
-        if not self.edit.text().strip():
-            return
-        self.accept()
-
-    def text(self) -> str:
-        return self.edit.text()
-
-
-class ConfirmDialog(QDialog):
-    """Подтверждение действия (удаление) в общем светлом стиле.
-
-    Использование:
-        dlg = ConfirmDialog("Удалить задачу", f"Удалить \u00AB{preview}\u00BB? Это действие нельзя отменить.", parent)
-        if dlg.exec() == QDialog.Accepted:
-            # выполнять удаление
+from backend import profiling
+from backend.database import (
+    add_task, list_tasks, list_tasks_range, toggle_task, delete_task, update_task_text,
+    start_background_writes
+)
+from ui.task_model import TaskListModel
+from ui.schedule_view import DATE_ROLE, ScheduleDelegate, ScheduleModel, ScheduleView
+from ui.search import RESULT_LIMIT, SearchController
+from ui.shadows import ShadowHost, set_quality, set_shadow
+from ui.styles import stylesheet
+from ui.task_calendar import TaskCalendar
+from ui.translations import SUPPORTED as LANGUAGES, table as translation_table
+
+SETTINGS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache", "settings.json"))
+
+
+def read_settings() -> dict:
+    try:
+        with open(SETTINGS_PATH, "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_setting(key: str, value):
+    # Сохраняем остальные ключи (lang, theme, storage...) — переписываем только один
+    try:
+        os.makedirs(os.path.dirname(SETTINGS_PATH), exist_ok=True)
+        data = read_settings()
+        data[key] = value
+        with open(SETTINGS_PATH, "w") as f:
+            json.dump(data, f)
+    except OSError:
+        pass
+
+
+class StorageSignals(QObject):
+    """Мост от фонового потока записи к GUI-потоку.
+
+    Колбэки backend.database вызываются в потоке записи; emit() из чужого
+    потока Qt доставляет в GUI-поток через очередь событий.
     """
-    def __init__(self, title: str, message: str, parent=None,
-                 cancel_text: str = "Отмена", ok_text: str = "Удалить"):
-        super().__init__(parent)
-        self.setObjectName("confirmDialog")
-        self.setModal(True)
-        self.setWindowTitle(title)
-
-        wrap = QVBoxLayout()
-        wrap.setContentsMargins(16, 14, 16, 14)
-        wrap.setSpacing(10)
-
-        lbl_title = QLabel(title)
-        lbl_title.setObjectName("confirmTitle")
-        lbl_msg = QLabel(message)
-        lbl_msg.setWordWrap(True)
-        lbl_msg.setObjectName("confirmMessage")
-
-        buttons = QHBoxLayout()
-        buttons.addStretch()
-        self.btn_cancel = QPushButton(cancel_text)
-        self.btn_cancel.setObjectName("btnSecondary")
-        self.btn_delete = QPushButton(ok_text)
-        self.btn_delete.setObjectName("btnDanger")
-        buttons.setSpacing(8)
-        buttons.addWidget(self.btn_cancel)
-        buttons.addWidget(self.btn_delete)
-
-        wrap.addWidget(lbl_title)
-        wrap.addWidget(lbl_msg)
-        wrap.addLayout(buttons)
-        self.setLayout(wrap)
-
-        self.btn_cancel.clicked.connect(self.reject)
-        self.btn_delete.clicked.connect(self.accept)
-        self.resize(460, 160)
+    saved = Signal()
+    failed = Signal(str)
 
 class MainWindow(QMainWindow):
+    # Окно впервые отрисовано (после этого выполняется отложенная работа)
+    firstPainted = Signal()
+
     def __init__(self):
         super().__init__()
 
         self.setWindowTitle("To-do")
         self.setMinimumSize(1000, 640)
 
-        # Языки: ru, pl, en
-        self.translations = self._build_translations()
-        self.lang = "en" # язык по умолчанию
+        # --------- SETTINGS (cache/settings.json) ---------
+        # Читаем до построения интерфейса, чтобы тему и язык применить один раз
+        settings = read_settings()
+        # Языки: ru, pl, en; таблица строк грузится только для активного
+        self.lang = settings.get("lang") if settings.get("lang") in LANGUAGES else "en"
+        self.theme = settings.get("theme") if settings.get("theme") in ("light", "dark") else "dark"
+        # Качество теней: off | low | high
+        set_quality(settings.get("shadows", "high"))
+        # Погода для задач с местом (сеть); сервис создаётся после первого кадра
+        self.weather_enabled = settings.get("weather", True) is not False
+        self.weather = None
+        # Работа, не нужная для первого кадра (см. _after_first_paint)
+        self._deferred = []
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(16, 16, 16, 16)
@@ -155,41 +98,24 @@ class MainWindow(QMainWindow):
         content_wrap.setLayout(content)
         main_layout.addWidget(content_wrap, 1)
 
-        container = QWidget()
+        # Тень шапки рисует контейнер (см. _apply_shadow)
+        container = ShadowHost()
         container.setLayout(main_layout)
         self.setCentralWidget(container)
 
         # Режим отображения правой панели: day | week | month
         self.view_mode = "day"
 
-        # Применяем светлую, минималистичную тему с пастельными акцентами
-        self.theme = "dark"
+        # Тема из настроек — таблица стилей применяется один раз
+        self.btn_theme.setChecked(self.theme == "dark")
+        self.btn_theme.setText("☀️" if self.theme == "dark" else "🌙")
         self.apply_styles()
 
-        # --------- LOAD SAVED THEME (settings in cache folder) ---------
-        import os, json
-        cache_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache"))
-        os.makedirs(cache_dir, exist_ok=True)
-        settings_path = os.path.join(cache_dir, "settings.json")
-
-        if os.path.exists(settings_path):
-            try:
-                with open(settings_path, "r") as f:
-                    data = json.load(f)
-                    if data.get("theme") in ("light", "dark"):
-                        self.theme = data["theme"]
-                        self.btn_theme.setChecked(self.theme == "dark")
-                        self.btn_theme.setText("☀️" if self.theme == "dark" else "🌙")
-                        self.apply_styles()
-                    if data.get("lang") in ("ru", "pl", "en"):
-                        self.lang = data["lang"]
-                        # update combo to reflect saved language
-                        for i in range(self.lang_combo.count()):
-                            if self.lang_combo.itemData(i) == self.lang:
-                                self.lang_combo.setCurrentIndex(i)
-                                break
-            except Exception:
-                pass
+        # Выбрать сохранённый язык без сигнала: иначе _on_lang_changed
+        # перезаписал бы settings.json и перерисовал всё ещё до показа окна
+        self.lang_combo.blockSignals(True)
+        self.lang_combo.setCurrentIndex(max(0, self.lang_combo.findData(self.lang)))
+        self.lang_combo.blockSignals(False)
 
         # Применить язык к уже созданным виджетам
         self.set_language(self.lang, initial=True)
@@ -200,8 +126,33 @@ class MainWindow(QMainWindow):
         self.tasks_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tasks_list.customContextMenuRequested.connect(self.show_tasks_context_menu)
         self.tasks_list.installEventFilter(self)
+
+        # Запись на диск — в фоновом потоке: клики меняют данные в памяти сразу
+        self._save_error_shown = False
+        self.storage_signals = StorageSignals(self)
+        self.storage_signals.saved.connect(self.on_storage_saved)
+        self.storage_signals.failed.connect(self.on_storage_failed)
+        # Поток записи не нужен для первого кадра; до его запуска изменения
+        # пишутся синхронно
+        self._deferred.append(lambda: start_background_writes(
+            on_saved=self.storage_signals.saved.emit,
+            on_error=lambda e: self.storage_signals.failed.emit(str(e)),
+        ))
+        # Поисковый индекс загружается в фоне, чтобы первый запрос не ждал
+        self._deferred.append(self.search.warm_up)
+        # Клиент погоды тянет requests (~100 мс импорта) — тоже после первого кадра
+        if self.weather_enabled:
+            self._deferred.append(self._init_weather)
+        self.installEventFilter(self)
+        # Видимые данные (выбранный день) грузим сразу
         self.refresh_all()
 
+    def _after_first_paint(self):
+        deferred, self._deferred = self._deferred, []
+        for fn in deferred:
+            fn()
+        self.firstPainted.emit()
+
     def create_header(self):
         header = QWidget()
         header.setObjectName("headerBar")
@@ -260,14 +211,15 @@ class MainWindow(QMainWindow):
         return header
 
     def create_left_column(self):
-        box = QWidget()
+        box = ShadowHost()
         box.setObjectName("leftColumn")
         v = QVBoxLayout()
         v.setContentsMargins(0, 0, 0, 0)
         v.setSpacing(12)
 
         # Календарь месяца
-        self.calendar = QCalendarWidget()
+        # Дни с задачами отмечены; счётчики — один запрос на месяц
+        self.calendar = TaskCalendar()
         self.calendar.setObjectName("monthCalendar")
         self.calendar.selectionChanged.connect(self.on_calendar_changed)
 
@@ -292,11 +244,17 @@ class MainWindow(QMainWindow):
         header.addWidget(self.btn_delete)
         tv.addLayout(header)
 
-        self.tasks_list = QListWidget()
+        # Модель/представление: изменения применяются к строкам точечно
+        self.tasks_model = TaskListModel(self)
+        self.tasks_model.taskEdited.connect(self.on_task_item_changed)
+        self.tasks_list = QListView()
+        self.tasks_list.setObjectName("tasksList")
+        self.tasks_list.setModel(self.tasks_model)
         self.tasks_list.setAlternatingRowColors(True)
-        self.tasks_list.itemChanged.connect(self.on_task_item_changed)
+        self.tasks_list.setUniformItemSizes(True)
+        self.tasks_list.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
         # Обновлять доступность кнопки удаления при смене выбора
-        self.tasks_list.itemSelectionChanged.connect(self.update_delete_enabled)
+        self.tasks_list.selectionModel().currentChanged.connect(self.update_delete_enabled)
         tv.addWidget(self.tasks_list)
 
         tasks_card.setLayout(tv)
@@ -314,6 +272,31 @@ class MainWindow(QMainWindow):
         v.setContentsMargins(0, 0, 0, 0)
         v.setSpacing(12)
 
+        # Поиск: текст + фильтры статуса и периода; пока строка не пуста,
+        # правая панель показывает результаты вместо расписания
+        search_bar = QHBoxLayout()
+        search_bar.setSpacing(8)
+        self.search_box = QLineEdit()
+        self.search_box.setObjectName("searchBox")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_status = QComboBox()
+        self.search_status.setObjectName("searchFilter")
+        for done in (None, False, True):
+            self.search_status.addItem("", userData=done)
+        self.search_scope = QComboBox()
+        self.search_scope.setObjectName("searchFilter")
+        self.search_scope.addItem("", userData="all")
+        self.search_scope.addItem("", userData="view")
+        search_bar.addWidget(self.search_box, 1)
+        search_bar.addWidget(self.search_status)
+        search_bar.addWidget(self.search_scope)
+        self.search = SearchController(self)
+        self.search.results.connect(self.show_search_results)
+        self.search.failed.connect(lambda e: self.lbl_selected_date.setText(self.t("search_error").format(error=e)))
+        self.search_box.textChanged.connect(self.on_search_changed)
+        self.search_status.currentIndexChanged.connect(self.on_search_changed)
+        self.search_scope.currentIndexChanged.connect(self.on_search_changed)
+
         # Заголовок и описание дня
         head = QWidget()
         head.setObjectName("dayHeader")
@@ -328,26 +311,25 @@ class MainWindow(QMainWindow):
         hl.addWidget(self.lbl_selected_date)
         head.setLayout(hl)
 
-        # Прокручиваемая зона с карточками событий (используем задачи как события)
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
+        # Карточки событий (задачи как события) рисует делегат: виджеты
+        # не создаются, отрисовываются только видимые строки
+        self.schedule_model = ScheduleModel(self)
+        self.schedule_delegate = ScheduleDelegate(self)
+        scroll = ScheduleView()
         scroll.setObjectName("dayScroll")
-        self.day_container = QWidget()
-        self.day_container.setObjectName("dayContainer")
-        self.day_layout = QVBoxLayout()
-        self.day_layout.setContentsMargins(16, 12, 16, 12)
-        self.day_layout.setSpacing(10)
-        self.day_container.setLayout(self.day_layout)
-        scroll.setWidget(self.day_container)
+        scroll.setModel(self.schedule_model)
+        scroll.setItemDelegate(self.schedule_delegate)
+        scroll.clicked.connect(self.on_schedule_clicked)
+        self.schedule_view = scroll
 
         # Плавающая круглая кнопка «+»
         self.fab_add = QPushButton("+")
         self.fab_add.setFixedSize(48, 48)
-        self.fab_add.setStyleSheet("border-radius: 24px;")
         self.fab_add.setObjectName("fabAdd")
         self.fab_add.setToolTip("Добавить задачу")
         self.fab_add.clicked.connect(self.add_task_fab)
 
+        v.addLayout(search_bar)
         v.addWidget(head)
         v.addWidget(scroll, 1)
 
@@ -365,6 +347,7 @@ class MainWindow(QMainWindow):
     # (устаревшее) create_tasks_panel удалено — задачи теперь в левой колонке и FAB добавления
 
     # ---- Actions ----
+    @profiling.traced("ui.refresh_all", "ui")
     def refresh_all(self):
         self.load_tasks()
         self.populate_right_view()
@@ -375,62 +358,75 @@ class MainWindow(QMainWindow):
     def current_date_str(self):
         return self.current_date_qdate().toString("yyyy-MM-dd")
 
+    @profiling.action("action.select_day")
     def on_calendar_changed(self):
         self.refresh_all()
 
+    @profiling.traced("ui.load_tasks", "ui")
     def load_tasks(self):
-        # Во время заполнения временно блокируем сигналы, чтобы не вызывать on_task_item_changed
-        self.tasks_list.blockSignals(True)
-        self.tasks_list.clear()
-        # В новой концепции локация не используется — грузим по дате
-        tasks = list_tasks(self.current_date_str(), None)
-        for t in tasks:
-            item = QListWidgetItem(t["text"])
-            item.setData(Qt.UserRole, t["id"])  # id
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
-            item.setCheckState(Qt.Checked if t["done"] else Qt.Unchecked)
-            self.tasks_list.addItem(item)
-        self.tasks_list.blockSignals(False)
+        # Полная перезагрузка списка — только при смене дня/языка;
+        # добавление, отметка и удаление меняют модель точечно.
+        # Список — по дате; место задачи показывается в расписании (с погодой)
+        self.tasks_model.set_tasks(list_tasks(self.current_date_str(), None))
         self.update_delete_enabled()
 
     def add_task_fab(self):
         # Пользовательский диалог в едином стиле вместо стандартного QInputDialog
         # Локализованные тексты для диалога
+        from ui.dialogs import AddTaskDialog
+
         t = self.t
         dlg = AddTaskDialog(
             self,
             title_text=t("add_title"),
             hint_text=t("add_hint"),
             placeholder=t("add_placeholder"),
+            location_placeholder=t("add_location_placeholder"),
             btn_add_text=t("add_confirm"),
             btn_cancel_text=t("cancel"),
         )
         if dlg.exec() == QDialog.Accepted:
             txt = dlg.text().strip()
             if txt:
-                add_task(self.current_date_str(), txt, None)
-                self.refresh_all()
+                # Время диалога в замер не входит — только само добавление
+                with profiling.action("action.add_task"):
+                    date_str = self.current_date_str()
+                    location = dlg.location()
+                    tid = add_task(date_str, txt, location)
+                    task = {"id": tid, "task_date": date_str, "text": txt, "location": location, "done": False}
+                    self.tasks_model.insert_task(task)
+                    if self.search.active():
+                        self.search.run_now()
+                    else:
+                        # Выбранный день всегда внутри показанного диапазона (день/неделя/месяц)
+                        self.schedule_model.insert_task(task, self._schedule_header(date_str))
+                        if location:
+                            self._prefetch_weather([location])
+                    self.calendar.invalidate(date_str)
 
     def _selected_task_id(self):
-        item = self.tasks_list.currentItem()
-        if not item:
+        idx = self.tasks_list.currentIndex()
+        if not idx.isValid():
             return None
-        return item.data(Qt.UserRole)
+        return idx.data(Qt.UserRole)
 
     def toggle_task_clicked(self):
-        tid = self._selected_task_id()
-        if tid is None:
+        idx = self.tasks_list.currentIndex()
+        if not idx.isValid():
             return
-        toggle_task(int(tid))
-        self.refresh_all()
+        # setData сам вызовет on_task_item_changed через taskEdited
+        checked = idx.data(Qt.CheckStateRole) == Qt.Checked
+        self.tasks_model.setData(idx, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
 
     def delete_task_clicked(self):
         tid = self._selected_task_id()
         if tid is None:
             return
         # Подтверждение удаления (кастомный диалог в общем стиле)
-        item = self.tasks_list.currentItem()
-        text_preview = item.text() if item else self.t("this_task")
+        idx = self.tasks_list.currentIndex()
+        text_preview = idx.data(Qt.DisplayRole) if idx.isValid() else self.t("this_task")
+        from ui.dialogs import ConfirmDialog
+
         dlg = ConfirmDialog(
             self.t("delete_title"),
             self.t("delete_message").format(task=text_preview),
@@ -440,29 +436,41 @@ class MainWindow(QMainWindow):
         )
         if dlg.exec() != QDialog.Accepted:
             return
-        delete_task(int(tid))
-        self.refresh_all()
-
-    def update_delete_enabled(self):
-        has_selection = self.tasks_list.currentItem() is not None
+        with profiling.action("action.delete_task"):
+            delete_task(int(tid))
+            self.tasks_model.remove_task(int(tid))
+            self.schedule_model.remove_task(int(tid))
+            self.calendar.invalidate(self.current_date_str())
+            self.update_delete_enabled()
+
+    def update_delete_enabled(self, *args):
+        has_selection = self.tasks_list.currentIndex().isValid()
         if hasattr(self, "btn_delete"):
             self.btn_delete.setEnabled(has_selection)
 
     def show_tasks_context_menu(self, pos):
         # Выбрать элемент под курсором (если есть)
-        item = self.tasks_list.itemAt(pos)
-        if item is not None:
-            self.tasks_list.setCurrentItem(item)
+        idx = self.tasks_list.indexAt(pos)
+        if idx.isValid():
+            self.tasks_list.setCurrentIndex(idx)
         menu = QMenu(self)
         act_del = menu.addAction(self.t("delete"))
         # Отключить, если ничего не выбрано
-        act_del.setEnabled(self.tasks_list.currentItem() is not None)
+        act_del.setEnabled(self.tasks_list.currentIndex().isValid())
         action = menu.exec(self.tasks_list.mapToGlobal(pos))
         if action == act_del:
             self.delete_task_clicked()
 
     def eventFilter(self, obj, event):
+        if obj is self and event.type() == QEvent.Paint:
+            # Первый кадр: отложенную работу — после того, как он дорисуется
+            self.removeEventFilter(self)
+            QTimer.singleShot(0, self._after_first_paint)
+            return False
         if obj is self.tasks_list and event.type() == QEvent.KeyPress:
+            # Во время редактирования текста Backspace принадлежит редактору
+            if self.tasks_list.state() == QAbstractItemView.EditingState:
+                return super().eventFilter(obj, event)
             if event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
                 # Удаление выбранной задачи по Delete/Backspace
                 if self._selected_task_id() is not None:
@@ -470,18 +478,33 @@ class MainWindow(QMainWindow):
                     return True
         return super().eventFilter(obj, event)
 
-    def on_task_item_changed(self, item: QListWidgetItem):
-        # Переключение чекбокса меняет состояние done
-        tid = item.data(Qt.UserRole)
-        if tid is None:
+    @profiling.action("action.edit_task")
+    def on_task_item_changed(self, task_id: int, field: str, value):
+        # Модель уже обновила строку; сохраняем изменение в БД
+        if field == "done":
+            toggle_task(task_id)
+            self.calendar.invalidate(self.current_date_str())
+        elif field == "text":
+            update_task_text(task_id, value)
+        # В правой колонке перерисуется только эта карточка
+        self.schedule_model.update_task(task_id, **{field: value})
+        if self.search.active():
+            # Задача могла перестать (или начать) подходить под запрос
+            self.search.run_now()
+
+    def on_storage_saved(self):
+        self._save_error_shown = False
+
+    def on_storage_failed(self, message: str):
+        # Одно предупреждение на серию ошибок; изменения остаются в памяти
+        # и будут записаны при следующем успешном сохранении
+        if self._save_error_shown:
             return
-        # Чтобы избежать рекурсии/лишних апдейтов, просто дергаем toggle,
-        # который инвертирует состояние в БД до нужного.
-        toggle_task(int(tid))
-        # Обновим правую колонку (карточки)
-        self.populate_right_view()
+        self._save_error_shown = True
+        QMessageBox.warning(self, self.t("save_error_title"), self.t("save_error").format(error=message))
 
     # ---- View mode switching ----
+    @profiling.action("action.set_view_mode")
     def set_view_mode(self, mode: str):
         if mode not in ("day", "week", "month"):
             return
@@ -499,153 +522,148 @@ class MainWindow(QMainWindow):
         # Перерисовать правую панель
         self.populate_right_view()
 
+    @profiling.traced("ui.populate_right_view", "ui")
     def populate_right_view(self):
+        if self.weather is not None:
+            # Ответы для прежнего дня/периода больше не нужны
+            self.weather.cancel_all()
+        if self.search.active():
+            # Результаты поиска остаются на месте; период «показанный» мог смениться
+            self.search.run_now()
+            return
         if self.view_mode == "day":
             self.populate_day_view()
         elif self.view_mode == "week":
             self.populate_week_view()
         else:
             self.populate_month_view()
+        self._prefetch_weather()
 
+    @profiling.traced("ui.populate_day_view", "ui")
     def populate_day_view(self):
-        # Очистить текущие карточки
-        while self.day_layout.count():
-            item = self.day_layout.takeAt(0)
-            w = item.widget()
-            if w:
-                w.deleteLater()
         # Заголовок даты
         # Локализованное отображение даты
         # Локализуем названия дней/месяцев через QLocale
         self.lbl_selected_date.setText(QLocale().toString(self.current_date_qdate(), "ddd, d MMM yyyy"))
         # Загрузить задачи и отрисовать как карточки событий с пастельными маркерами
-        tasks = list_tasks(self.current_date_str(), None)
-        if not tasks:
-            empty = QLabel(self.t("empty_day"))
-            empty.setObjectName("muted")
-            self.day_layout.addWidget(empty)
-            return
-        colors = ["#FBCFE8", "#BBF7D0", "#FEF3C7", "#BFDBFE", "#E9D5FF"]
-        for idx, t in enumerate(tasks):
-            card = QWidget()
-            card.setObjectName("eventCard")
-            hl = QHBoxLayout()
-            hl.setContentsMargins(12, 10, 12, 10)
-            hl.setSpacing(10)
-
-            marker = QFrame()
-            marker.setFixedWidth(6)
-            marker.setObjectName("eventMarker")
-            marker.setStyleSheet(f"background: {colors[idx % len(colors)]}; border-radius: 3px;")
-
-            text = QLabel(t["text"])
-            if t["done"]:
-                f = text.font()
-                f.setStrikeOut(True)
-                text.setFont(f)
-                text.setStyleSheet("color: #9CA3AF;")
-
-            hl.addWidget(marker)
-            hl.addWidget(text, 1)
-
-            card.setLayout(hl)
-            card.setProperty("done", t["done"])  # для стилизации, если понадобится
-            self._apply_shadow(card, blur=18, y_offset=2, color=(0,0,0,30))
-            self.day_layout.addWidget(card)
-
-    def _clear_right_cards(self):
-        while self.day_layout.count():
-            item = self.day_layout.takeAt(0)
-            w = item.widget()
-            if w:
-                w.deleteLater()
-
-    def _add_group_header(self, date_q: QDate):
-        header = QLabel(QLocale().toString(date_q, "ddd, d MMM"))
-        header.setObjectName("muted")
-        # Небольшие отступы сверху
-        wrap = QWidget()
-        v = QVBoxLayout()
-        v.setContentsMargins(4, 8, 4, 0)
-        v.addWidget(header)
-        wrap.setLayout(v)
-        self.day_layout.addWidget(wrap)
-
-    def _add_task_card(self, text: str, done: bool, color: str):
-        card = QWidget()
-        card.setObjectName("eventCard")
-        hl = QHBoxLayout()
-        hl.setContentsMargins(12, 10, 12, 10)
-        hl.setSpacing(10)
-        marker = QFrame()
-        marker.setFixedWidth(6)
-        marker.setObjectName("eventMarker")
-        marker.setStyleSheet(f"background: {color}; border-radius: 3px;")
-        lbl = QLabel(text)
-        if done:
-            f = lbl.font()
-            f.setStrikeOut(True)
-            lbl.setFont(f)
-            lbl.setStyleSheet("color: #9CA3AF;")
-        hl.addWidget(marker)
-        hl.addWidget(lbl, 1)
-        card.setLayout(hl)
-        card.setProperty("done", done)
-        self._apply_shadow(card, blur=18, y_offset=2, color=(0,0,0,30))
-        self.day_layout.addWidget(card)
+        date_str = self.current_date_str()
+        tasks = list_tasks(date_str, None)
+        self.schedule_model.set_days([(date_str, "", tasks)], headers=False, empty_text=self.t("empty_day"))
 
-    def populate_week_view(self):
-        self._clear_right_cards()
+    def _schedule_header(self, date_str: str) -> str:
+        return QLocale().toString(QDate.fromString(date_str, "yyyy-MM-dd"), "ddd, d MMM")
+
+    def _set_schedule_range(self, by_day: dict, empty_key: str):
+        days = [(ds, self._schedule_header(ds), tasks) for ds, tasks in by_day.items()]
+        self.schedule_model.set_days(days, headers=True, empty_text=self.t(empty_key))
+
+    def _view_range(self):
+        """Первый и последний день, показанные в текущем режиме."""
         current = self.current_date_qdate()
-        # QDate.dayOfWeek(): 1=Mon .. 7=Sun
-        start = current.addDays(1 - current.dayOfWeek())
-        end = start.addDays(6)
+        if self.view_mode == "week":
+            # QDate.dayOfWeek(): 1=Mon .. 7=Sun
+            start = current.addDays(1 - current.dayOfWeek())
+            return start, start.addDays(6)
+        if self.view_mode == "month":
+            first = QDate(current.year(), current.month(), 1)
+            return first, first.addMonths(1).addDays(-1)
+        return current, current
+
+    @profiling.traced("ui.populate_week_view", "ui")
+    def populate_week_view(self):
+        start, end = self._view_range()
         self.lbl_selected_date.setText(self.t("week_range").format(start=QLocale().toString(start, 'd MMM'), end=QLocale().toString(end, 'd MMM yyyy')))
-        colors = ["#FBCFE8", "#BBF7D0", "#FEF3C7", "#BFDBFE", "#E9D5FF"]
-        any_tasks = False
-        for i in range(7):
-            d = start.addDays(i)
-            ds = d.toString("yyyy-MM-dd")
-            tasks = list_tasks(ds, None)
-            if not tasks:
-                continue
-            any_tasks = True
-            self._add_group_header(d)
-            for idx, t in enumerate(tasks):
-                self._add_task_card(t["text"], t["done"], colors[idx % len(colors)])
-        if not any_tasks:
-            empty = QLabel(self.t("empty_week"))
-            empty.setObjectName("muted")
-            self.day_layout.addWidget(empty)
+        # Одним запросом на всю неделю, сгруппировано по дням
+        by_day = list_tasks_range(start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd"), None)
+        self._set_schedule_range(by_day, "empty_week")
 
+    @profiling.traced("ui.populate_month_view", "ui")
     def populate_month_view(self):
-        self._clear_right_cards()
-        current = self.current_date_qdate()
-        first = QDate(current.year(), current.month(), 1)
-        last = first.addMonths(1).addDays(-1)
+        first, last = self._view_range()
         self.lbl_selected_date.setText(QLocale().toString(first, "MMMM yyyy"))
-        colors = ["#FBCFE8", "#BBF7D0", "#FEF3C7", "#BFDBFE", "#E9D5FF"]
-        any_tasks = False
-        d = first
-        while d <= last:
-            ds = d.toString("yyyy-MM-dd")
-            tasks = list_tasks(ds, None)
-            if tasks:
-                any_tasks = True
-                self._add_group_header(d)
-                for idx, t in enumerate(tasks):
-                    self._add_task_card(t["text"], t["done"], colors[idx % len(colors)])
-            d = d.addDays(1)
-        if not any_tasks:
-            empty = QLabel(self.t("empty_month"))
-            empty.setObjectName("muted")
-            self.day_layout.addWidget(empty)
+        by_day = list_tasks_range(first.toString("yyyy-MM-dd"), last.toString("yyyy-MM-dd"), None)
+        self._set_schedule_range(by_day, "empty_month")
+
+    # ---- Weather ----
+    def _init_weather(self):
+        from ui.weather_service import WeatherService
+
+        self.weather = WeatherService(self)
+        self.weather.ready.connect(self.on_weather_ready)
+        # Погода — дополнение к расписанию: без сети карточки просто без неё
+        self._prefetch_weather()
+
+    def _prefetch_weather(self, locations=None):
+        # Для каждого места в показанном периоде: известный прогноз — сразу
+        # (из кеша, без сети), обновление — в фоне одним запросом на весь период
+        if self.weather is None or self.search.active():
+            return
+        from backend.logic import cached_weather_range
+
+        start, end = (d.toString("yyyy-MM-dd") for d in self._view_range())
+        for location in locations or self.schedule_model.locations():
+            cached = cached_weather_range(location, start, end)
+            if cached:
+                self.schedule_model.set_weather(location, cached)
+            self.weather.request(location, start, end)
+
+    def on_weather_ready(self, location: str, start: str, end: str, rows: dict):
+        view = tuple(d.toString("yyyy-MM-dd") for d in self._view_range())
+        if self.search.active() or (start, end) != view:
+            return
+        self.schedule_model.set_weather(location, rows)
+
+    # ---- Search ----
+    def _search_params(self):
+        query = self.search_box.text().strip()
+        if not query:
+            return None
+        params = {"query": query, "done": self.search_status.currentData()}
+        if self.search_scope.currentData() == "view":
+            start, end = self._view_range()
+            params["start"], params["end"] = start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd")
+        return params
+
+    def on_search_changed(self, *args):
+        was_active = self.search.active()
+        self.search.request(self._search_params())
+        if was_active and not self.search.active():
+            # Строка очищена — вернуть расписание
+            self.populate_right_view()
+
+    @profiling.traced("ui.show_search_results", "ui")
+    def show_search_results(self, tasks: list):
+        # Задачи уже отсортированы по дате — группируем подряд идущие
+        days = []
+        for t in tasks:
+            if not days or days[-1][0] != t["task_date"]:
+                qd = QDate.fromString(t["task_date"], "yyyy-MM-dd")
+                days.append((t["task_date"], QLocale().toString(qd, "ddd, d MMM yyyy"), []))
+            days[-1][2].append(t)
+        self.schedule_model.set_days(days, headers=True, empty_text=self.t("search_empty"))
+        found = f"{len(tasks)}+" if len(tasks) >= RESULT_LIMIT else str(len(tasks))
+        self.lbl_selected_date.setText(self.t("search_found").format(n=found))
+
+    def on_schedule_clicked(self, index):
+        # Клик по найденной задаче (или дню) открывает этот день
+        date_str = index.data(DATE_ROLE)
+        if not self.search.active() or not date_str:
+            return
+        self.search_box.blockSignals(True)
+        self.search_box.clear()
+        self.search_box.blockSignals(False)
+        self.search.request(None)
+        qd = QDate.fromString(date_str, "yyyy-MM-dd")
+        if qd == self.calendar.selectedDate():
+            self.refresh_all()
+        else:
+            self.calendar.setSelectedDate(qd)
 
     # ---- Styles ----
     def toggle_theme(self):
         # Fade overlay
         overlay = QWidget(self)
-        overlay.setStyleSheet("background: #000;")
+        overlay.setObjectName("themeOverlay")
         overlay.setGeometry(self.rect())
         overlay.raise_()
         overlay.show()
@@ -662,6 +680,7 @@ class MainWindow(QMainWindow):
         self._anim_fade_in.setStartValue(0.0)
         self._anim_fade_in.setEndValue(1.0)
 
+        @profiling.action("action.toggle_theme")
         def apply_theme():
             if self.theme == "light":
                 self.theme = "dark"
@@ -672,16 +691,7 @@ class MainWindow(QMainWindow):
             self.apply_styles()
 
             # --------- SAVE THEME TO SETTINGS (in cache folder) ---------
-            import os, json
-            cache_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache"))
-            os.makedirs(cache_dir, exist_ok=True)
-            settings_path = os.path.join(cache_dir, "settings.json")
-
-            try:
-                with open(settings_path, "w") as f:
-                    json.dump({"theme": self.theme}, f)
-            except Exception:
-                pass
+            save_setting("theme", self.theme)
 
             # Fade out
             self._anim_fade_out = QPropertyAnimation(effect, b"opacity")
@@ -694,482 +704,41 @@ class MainWindow(QMainWindow):
         self._anim_fade_in.finished.connect(apply_theme)
         self._anim_fade_in.start()
 
+    @profiling.traced("ui.apply_styles", "ui")
     def apply_styles(self):
-        if self.theme == "light":
-            stylesheet = """
-            /* Base: светлая, минималистичная палитра */
-            QWidget { font-family: 'Inter', 'Segoe UI', system-ui, -apple-system, Arial; font-size: 14px; color: #1F2937; background: #F8FAFC; }
-
-            /* Header */
-            #headerBar { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
-            #headerBar QLabel#appTitle { color: #111827; font-size: 20px; font-weight: 700; letter-spacing: 0.2px; }
-            QPushButton#profileButton { background: #F3F4F6; border: 1px solid #E5E7EB; color: #6B7280; border-radius: 18px; padding: 6px 10px; }
-            QPushButton#profileButton:hover { background: #E5E7EB; }
-
-            /* Segmented control */
-            QPushButton#segButton { background: #F3F4F6; border: 1px solid #E5E7EB; color: #4B5563; border-radius: 8px; padding: 6px 12px; }
-            QPushButton#segButton:hover { background: #EAECEF; }
-            QPushButton#segButton:checked { background: #EEF2FF; color: #4F46E5; border-color: #C7D2FE; }
-
-            /* Language Combo — improved pastel/rounded design */
-            QComboBox#langCombo {
-                background: #FFFFFF;
-                border: 1.5px solid #D8DAE0;
-                color: #374151;
-                border-radius: 12px;
-                padding: 8px 40px 8px 14px;
-                min-width: 150px;
-                combobox-popup: 0;
-            }
-
-            QComboBox#langCombo:hover {
-                background: #F4F6FB;
-                border-color: #C7D2FE;
-            }
-
-            QComboBox#langCombo:focus {
-                border-color: #A5B4FC;
-            }
-
-            QComboBox#langCombo:disabled {
-                color: #9CA3AF;
-                background: #F3F4F6;
-            }
-
-            /* Dropdown arrow container */
-            QComboBox#langCombo::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 32px;
-                border-left: 1px solid #D8DAE0;
-                background: #F4F6FB;
-                border-top-right-radius: 12px;
-                border-bottom-right-radius: 12px;
-            }
-
-            QComboBox#langCombo::drop-down:hover {
-                background: #ECEFFF;
-                border-left: 1px solid #C7D2FE;
-            }
-
-            /* Arrow icons */
-            QComboBox#langCombo::down-arrow {
-                image: url(ui/assets/chevron-down.svg);
-                width: 14px;
-                height: 14px;
-                margin-top: 1px;
-            }
-
-            QComboBox#langCombo::down-arrow:on {
-                image: url(ui/assets/chevron-up.svg);
-                width: 14px;
-                height: 14px;
-                margin-top: 1px;
-            }
-
-            /* Opened state */
-            QComboBox#langCombo:on {
-                border-color: #A5B4FC;
-            }
-
-            QComboBox#langCombo::drop-down:on {
-                background: #EEF2FF;
-                border-left: 1px solid #A5B4FC;
-            }
-
-            /* Popup list */
-            QComboBox#langCombo QAbstractItemView {
-                background: #FFFFFF;
-                border: 1.5px solid #D8DAE0;
-                border-radius: 12px;
-                outline: none;
-                padding: 6px 0;
-            }
-
-            QComboBox#langCombo QAbstractItemView::item {
-                padding: 10px 14px;
-                color: #111827;
-                border-radius: 6px;
-            }
-
-            QComboBox#langCombo QAbstractItemView::item:hover {
-                background: #F4F6FB;
-            }
-
-            QComboBox#langCombo QAbstractItemView::item:selected {
-                background: #EEF2FF;
-                color: #4F46E5;
-            }
-
-            /* Left column */
-            #leftColumn { }
-            QCalendarWidget#monthCalendar { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
-            QCalendarWidget#monthCalendar QWidget#qt_calendar_navigationbar { background: #FFFFFF; }
-            QCalendarWidget#monthCalendar QToolButton { color: #374151; background: transparent; border: none; padding: 6px; }
-            QCalendarWidget#monthCalendar QToolButton:hover { background: #F3F4F6; border-radius: 6px; }
-            QCalendarWidget#monthCalendar QAbstractItemView:enabled { selection-background-color: #EDE9FE; selection-color: #4F46E5; background: #FFFFFF; color: #111827; outline: none; }
-
-            #tasksPanel { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
-            #tasksPanel QLabel#sectionTitle { font-weight: 700; color: #111827; }
-            QListWidget { border: 1px solid #E5E7EB; border-radius: 10px; padding: 6px; background: #FFFFFF; }
-            QListWidget::item { padding: 8px 10px; }
-            QListWidget::item:hover { background: #F9FAFB; }
-            QListWidget::item:selected { background: #EEF2FF; color: #4F46E5; }
-            QListWidget::item:alternate { background: #FAFAFA; }
-
-            /* Явный квадратный чекбокс у задач */
-            QListWidget::indicator {
-                width: 18px;
-                height: 18px;
-                margin-right: 8px; /* отступ от текста */
-            }
-            QListWidget::indicator:unchecked {
-                border: 2px solid #D1D5DB; /* явная рамка */
-                background: #FFFFFF;       /* белый фон */
-                border-radius: 3px;        /* почти квадратный, без сильного скругления */
-            }
-            QListWidget::indicator:unchecked:hover {
-                border-color: #9CA3AF;
-                background: #F9FAFB;
-            }
-            QListWidget::indicator:checked {
-                border: 2px solid #8B5CF6;
-                background: #8B5CF6;      /* заливка акцентом; галочка будет контрастной */
-                border-radius: 3px;
-            }
-            QListWidget::indicator:checked:hover {
-                background: #7C3AED;
-                border-color: #7C3AED;
-            }
-
-            /* Right column */
-            #dayHeader { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
-            QLabel#sectionTitle { font-weight: 700; color: #111827; }
-            QLabel#muted { color: #6B7280; }
-            #dayScroll { border: 1px solid #E5E7EB; border-radius: 12px; background: #FFFFFF; }
-            #dayContainer { background: transparent; }
-            #eventCard, QWidget#eventCard { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
-
-            /* FAB */
-            QPushButton#fabAdd { background: #8B5CF6; color: #FFFFFF; border: none; border-radius: 22px; font-size: 20px; font-weight: 700; padding: 8px 14px; }
-            QPushButton#fabAdd:hover { background: #7C3AED; }
-            QPushButton#fabAdd:pressed { background: #6D28D9; }
-
-            /* Add Task Dialog */
-            QDialog#addDialog { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 14px; }
-            QDialog#addDialog QLabel#addTitle { font-size: 16px; font-weight: 700; color: #111827; }
-            QDialog#addDialog QLabel#addHint { color: #6B7280; }
-            QLineEdit#addInput { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 10px; padding: 8px 10px; }
-            QLineEdit#addInput:focus { border-color: #C7D2FE; box-shadow: 0 0 0 3px rgba(99,102,241,0.15); }
-            QPushButton#btnPrimary { background: #8B5CF6; color: #FFFFFF; border: none; border-radius: 10px; padding: 8px 14px; font-weight: 600; }
-            QPushButton#btnPrimary:hover { background: #7C3AED; }
-            QPushButton#btnPrimary:pressed { background: #6D28D9; }
-            QPushButton#btnPrimary:disabled { background: #E5E7EB; color: #9CA3AF; }
-            QPushButton#btnSecondary { background: #F3F4F6; color: #374151; border: 1px solid #E5E7EB; border-radius: 10px; padding: 8px 14px; }
-            QPushButton#btnSecondary:hover { background: #EAECEF; }
-
-            /* Confirm Dialog (удаление) */
-            QDialog#confirmDialog { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 14px; }
-            QDialog#confirmDialog QLabel#confirmTitle { font-size: 16px; font-weight: 700; color: #111827; }
-            QDialog#confirmDialog QLabel#confirmMessage { color: #374151; }
-            QPushButton#btnDanger { background: #EF4444; color: #FFFFFF; border: none; border-radius: 10px; padding: 8px 14px; font-weight: 600; }
-            QPushButton#btnDanger:hover { background: #DC2626; }
-            QPushButton#btnDanger:pressed { background: #B91C1C; }
-            
-            /* Scrollbars (light) */
-            QScrollBar:vertical { background: transparent; width: 10px; margin: 2px; }
-            QScrollBar::handle:vertical { background: #E5E7EB; min-height: 24px; border-radius: 5px; }
-            QScrollBar::handle:vertical:hover { background: #D1D5DB; }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0; }
-            QScrollBar:horizontal { background: transparent; height: 10px; margin: 2px; }
-            QScrollBar::handle:horizontal { background: #E5E7EB; min-width: 24px; border-radius: 5px; }
-            QScrollBar::handle:horizontal:hover { background: #D1D5DB; }
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal { width: 0; }
-
-            QPushButton#themeButton {
-                background: #F3F4F6;
-                color: #6B7280;
-                border: 1px solid #E5E7EB;
-                border-radius: 10px;
-                padding: 6px 10px;
-            }
-            QPushButton#themeButton:hover { background: #EAECEF; }
-            """
-        else:
-            stylesheet = """
-            /* AMOLED DARK THEME — ultra deep black + subtle animations */
-            QWidget { 
-                font-family: 'Inter', 'Segoe UI', system-ui, -apple-system, Arial; 
-                font-size: 14px; 
-                color: #E5E7EB; 
-                background: #000000;
-            }
-
-            /* HEADER */
-            #headerBar { background: #000000; border: 1px solid #1A1A1A; border-radius: 14px; }
-            #headerBar QLabel#appTitle { color: #FFFFFF; }
-
-            /* SEGMENTED BUTTONS */
-            QPushButton#segButton { 
-                background: #0D0D0D;
-                border: 1px solid #1F1F1F;
-                color: #D1D5DB;
-                border-radius: 10px;
-                padding: 6px 12px;
-            }
-            QPushButton#segButton:hover { background: #1A1A1A; }
-            QPushButton#segButton:checked { 
-                background: #4F46E5;
-                color: #FFFFFF;
-                border-color: #6366F1;
-            }
-
-            /* LANGUAGE SELECTOR */
-            QComboBox#langCombo {
-                background: #0D0D0D;
-                border: 1.5px solid #4F46E5;
-                color: #E5E7EB;
-                border-radius: 12px;
-                padding: 8px 40px 8px 14px;
-                min-width: 150px;
-                combobox-popup: 0;
-            }
-            QComboBox#langCombo:hover {
-                background: #111111;
-                border-color: #6366F1;
-            }
-            QComboBox#langCombo::drop-down {
-                background: #0D0D0D;
-                width: 36px;
-                border: none;
-                border-top-right-radius: 12px;
-                border-bottom-right-radius: 12px;
-            }
-            QComboBox#langCombo::drop-down:hover {
-                background: #111111;
-            }
-            QComboBox#langCombo::down-arrow {
-                image: url(ui/assets/chevron-down-white.svg);
-                width: 14px;
-                height: 14px;
-                margin-top: 1px;
-            }
-            QComboBox#langCombo::down-arrow:on {
-                image: url(ui/assets/chevron-up-white.svg);
-                width: 14px;
-                height: 14px;
-                margin-top: 1px;
-            }
-
-            QComboBox#langCombo QAbstractItemView { 
-                background: #000000; 
-                color: #FFFFFF; 
-                border: 1px solid #1F1F1F; 
-                selection-background-color: #1A1A1A;
-            }
-
-            /* TASKS PANEL */
-            #tasksPanel { background: #000000; border: 1px solid #1F1F1F; border-radius: 14px; }
-
-            QListWidget {
-                background: #000000;
-                border: 1px solid #1A1A1A;
-                color: #F1F5F9;
-            }
-            QListWidget::item:hover { background: #111111; }
-            QListWidget::item:selected { background: #1A1A1A; }
-            QListWidget::item {
-                padding: 8px 10px;
-            }
-            QListWidget::item:alternate {
-                background: #080808;
-            }
-
-            /* CHECKBOXES */
-            QListWidget::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 4px;
-            }
-            QListWidget::indicator:unchecked {
-                background: #000000;
-                border: 2px solid #3A3A3A;
-            }
-            QListWidget::indicator:checked {
-                background: #6366F1;
-                border: 2px solid #6366F1;
-            }
-
-            /* DAY HEADER */
-            #dayHeader { background: #000000; border: 1px solid #1A1A1A; border-radius: 14px; }
-
-            /* EVENT CARDS */
-            #eventCard {
-                background: #000000;
-                border: 1px solid #1A1A1A;
-                border-radius: 14px;
-            }
-            #eventCard:hover {
-                background: #0A0A0A;
-                border-color: #333333;
-            }
-
-            /* FAB */
-            QPushButton#fabAdd {
-                background: #6366F1;
-                color: #FFFFFF;
-                border-radius: 24px;
-                font-size: 20px;
-                font-weight: bold;
-            }
-            QPushButton#fabAdd:hover {
-                background: #4F46E5;
-            }
-            QPushButton#fabAdd:pressed {
-                background: #4338CA;
-            }
-
-            /* THEME BUTTON */
-            QPushButton#themeButton {
-                background: #0D0D0D;
-                border: 1px solid #1F1F1F;
-                color: #E5E7EB;
-                border-radius: 10px;
-                padding: 6px 10px;
-            }
-            QPushButton#themeButton:hover {
-                background: #1A1A1A;
-            }
-
-            /* SCROLLBAR */
-            QScrollBar:vertical {
-                background: transparent;
-                width: 10px;
-            }
-            QScrollBar::handle:vertical {
-                background: #1F1F1F;
-                border-radius: 4px;
-                min-height: 24px;
-            }
-            QScrollBar::handle:vertical:hover { background: #333333; }
-            """
-        self.setStyleSheet(stylesheet)
+        # Одна и та же тема не переприменяется: setStyleSheet заново разбирает
+        # таблицу и переполирует все виджеты окна
+        if getattr(self, "_applied_theme", None) == self.theme:
+            return
+        self._applied_theme = self.theme
+        self.setStyleSheet(stylesheet(self.theme))
+        # Цвета карточек правой панели рисует делегат
+        self.schedule_delegate.set_theme(self.theme)
+        self.calendar.set_theme(self.theme)
+        self.schedule_view.viewport().update()
 
     # ---- Effects ----
     def _apply_shadow(self, widget: QWidget, radius: int = 12, y_offset: int = 4, blur: int = 22, color=(0, 0, 0, 40)):
-        try:
-            effect = QGraphicsDropShadowEffect(self)
-            effect.setBlurRadius(blur)
-            effect.setXOffset(0)
-            effect.setYOffset(y_offset)
-            from PySide6.QtGui import QColor
-            r, g, b, a = color
-            effect.setColor(QColor(r, g, b, a))
-            widget.setGraphicsEffect(effect)
-        except Exception:
-            pass
+        # Вместо QGraphicsDropShadowEffect (offscreen-рендер и размытие на каждой
+        # перерисовке) тень рисует родитель-ShadowHost из закешированной картинки
+        set_shadow(widget, radius=radius, y_offset=y_offset, blur=blur, color=color)
 
     # ---- I18N ----
-    def _build_translations(self):
-        return {
-            "ru": {
-                "seg_day": "День",
-                "seg_week": "Неделя",
-                "seg_month": "Месяц",
-                "tasks_title": "Задачи и заметки",
-                "delete": "Удалить",
-                "delete_tooltip": "Удалить выбранную задачу",
-                "schedule_title": "Расписание дня",
-                "fab_tooltip": "Добавить задачу",
-                "empty_day": "На этот день нет событий. Нажмите + чтобы добавить.",
-                "empty_week": "На эту неделю нет событий. Нажмите + чтобы добавить.",
-                "empty_month": "В этом месяце пока нет событий. Нажмите + чтобы добавить.",
-                "delete_title": "Удалить задачу",
-                "delete_message": "Удалить «{task}»? Это действие нельзя отменить.",
-                "cancel": "Отмена",
-                "this_task": "эту задачу",
-                "add_title": "Новая задача",
-                "add_hint": "Введите текст задачи и нажмите Добавить",
-                "add_placeholder": "Например: Купить продукты в 18:00",
-                "add_confirm": "Добавить",
-                "week_range": "Неделя: {start} – {end}",
-            },
-            "pl": {
-                "seg_day": "Dzień",
-                "seg_week": "Tydzień",
-                "seg_month": "Miesiąc",
-                "tasks_title": "Zadania i notatki",
-                "delete": "Usuń",
-                "delete_tooltip": "Usuń wybrane zadanie",
-                "schedule_title": "Plan dnia",
-                "fab_tooltip": "Dodaj zadanie",
-                "empty_day": "Brak wydarzeń na ten dzień. Kliknij + aby dodać.",
-                "empty_week": "Brak wydarzeń w tym tygodniu. Kliknij + aby dodać.",
-                "empty_month": "W tym miesiącu brak wydarzeń. Kliknij + aby dodać.",
-                "delete_title": "Usunąć zadanie",
-                "delete_message": "Usunąć \u00AB{task}\u00BB? Tej operacji nie można cofnąć.",
-                "cancel": "Anuluj",
-                "this_task": "to zadanie",
-                "add_title": "Nowe zadanie",
-                "add_hint": "Wpisz treść zadania i kliknij Dodaj",
-                "add_placeholder": "Np.: Kupić produkty o 18:00",
-                "add_confirm": "Dodaj",
-                "week_range": "Tydzień: {start} – {end}",
-            },
-            "en": {
-                "seg_day": "Day",
-                "seg_week": "Week",
-                "seg_month": "Month",
-                "tasks_title": "Tasks & Notes",
-                "delete": "Delete",
-                "delete_tooltip": "Delete selected task",
-                "schedule_title": "Day schedule",
-                "fab_tooltip": "Add task",
-                "empty_day": "No events for this day. Click + to add.",
-                "empty_week": "No events this week. Click + to add.",
-                "empty_month": "No events this month yet. Click + to add.",
-                "delete_title": "Delete task",
-                "delete_message": "Delete \u00AB{task}\u00BB? This action cannot be undone.",
-                "cancel": "Cancel",
-                "this_task": "this task",
-                "add_title": "New task",
-                "add_hint": "Enter task text and click Add",
-                "add_placeholder": "E.g.: Buy groceries at 6 PM",
-                "add_confirm": "Add",
-                "week_range": "Week: {start} – {end}",
-            },
-        }
-
     def t(self, key: str) -> str:
-        return self.translations.get(self.lang, {}).get(key, key)
+        return translation_table(self.lang).get(key, key)
 
+    @profiling.action("action.set_language")
     def _on_lang_changed(self, idx: int):
         lang = self.lang_combo.currentData() or "ru"
         self.set_language(lang)
 
     def set_language(self, lang: str, initial: bool = False):
-        if lang not in ("ru", "pl", "en"):
+        if lang not in LANGUAGES:
             lang = "ru"
         self.lang = lang
-        # Save language to settings.json
-        try:
-            import os, json
-            cache_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache"))
-            os.makedirs(cache_dir, exist_ok=True)
-            settings_path = os.path.join(cache_dir, "settings.json")
-
-            # read existing settings
-            data = {}
-            if os.path.exists(settings_path):
-                with open(settings_path, "r") as f:
-                    data = json.load(f)
-
-            data["lang"] = self.lang  # update language
-
-            with open(settings_path, "w") as f:
-                json.dump(data, f)
-        except Exception:
-            pass
+        # Save language to settings.json (при старте язык только что прочитан оттуда)
+        if not initial:
+            save_setting("lang", self.lang)
         # Установить локаль Qt для форматирования дат и календаря
         locale_map = {
             "ru": QLocale(QLocale.Russian, QLocale.Russia),
@@ -1223,4 +792,10 @@ class MainWindow(QMainWindow):
             pass
         # FAB
         self.fab_add.setToolTip(self.t("fab_tooltip"))
+        # Поиск
+        self.search_box.setPlaceholderText(self.t("search_placeholder"))
+        for i, key in enumerate(("search_any_status", "search_open", "search_done")):
+            self.search_status.setItemText(i, self.t(key))
+        for i, key in enumerate(("search_everywhere", "search_in_view")):
+            self.search_scope.setItemText(i, self.t(key))
 
@@ -0,0 +1,322 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+from ui.shadows import draw_shadow
+
+# Пастельные маркеры карточек (по кругу внутри дня)
+MARKER_COLORS = ["#FBCFE8", "#BBF7D0", "#FEF3C7", "#BFDBFE", "#E9D5FF"]
+
+# Роли модели расписания
+ROW_KIND_ROLE = Qt.UserRole + 1   # "header" | "task" | "empty"
+TASK_ROLE = Qt.UserRole + 2       # dict задачи
+COLOR_ROLE = Qt.UserRole + 3      # цвет маркера
+DATE_ROLE = Qt.UserRole + 4       # "YYYY-MM-DD" дня строки
+WEATHER_ROLE = Qt.UserRole + 5    # прогноз на день задачи по её месту (или None)
+
+# Геометрия — как у прежних карточек-виджетов (отступы 16/12, промежуток 10).
+# Все строки (и заголовки) одной высоты: QListView с uniformItemSizes
+# раскладывает тысячи строк без вызова sizeHint для каждой.
+SIDE_MARGIN = 16
+CARD_PADDING_H = 12
+CARD_PADDING_V = 10
+CARD_GAP = 10
+MARKER_WIDTH = 6
+SHADOW_BLUR = 4
+
+THEMES = {
+    "light": {
+        "card": "#FFFFFF", "card_hover": "#F9FAFB", "border": "#E5E7EB", "border_hover": "#D1D5DB",
+        "text": "#1F2937", "muted": "#6B7280", "done": "#9CA3AF", "radius": 12,
+        "shadow": QColor(0, 0, 0, 30),
+    },
+    "dark": {
+        "card": "#000000", "card_hover": "#0A0A0A", "border": "#1A1A1A", "border_hover": "#333333",
+        "text": "#E5E7EB", "muted": "#6B7280", "done": "#9CA3AF", "radius": 14,
+        "shadow": QColor(0, 0, 0, 30),
+    },
+}
+
+
+def _place(location: str) -> str:
+    return " ".join(location.split()).casefold()
+
+
+def weather_text(location: str, forecast: dict | None) -> str:
+    """«Краков · 12°/5° · 0.5 мм» — место и (если уже есть) прогноз."""
+    if not forecast:
+        return location
+    # Open-Meteo может вернуть null в любом поле — показываем только то, что есть
+    temps = "/".join(f"{forecast[k]:.0f}°" for k in ("tmax", "tmin") if forecast.get(k) is not None)
+    parts = [location]
+    if temps:
+        parts.append(temps)
+    if forecast.get("precipitation"):
+        parts.append(f"{forecast['precipitation']:.1f} mm")
+    return " · ".join(parts)
+
+
+class ScheduleModel(QAbstractListModel):
+    """Плоский список строк правой панели: заголовки дней и задачи.
+
+    Каждая строка — dict с ключом "kind":
+      {"kind": "header", "date": "2025-01-06", "text": "Пн, 6 янв"}
+      {"kind": "task", "date": "2025-01-06", "task": {...}, "color": "#FBCFE8"}
+      {"kind": "empty", "text": "..."}
+
+    Полная пересборка (set_days) — только при смене дня/режима. Отметка,
+    добавление и удаление меняют одну строку (плюс заголовок дня, если он
+    появился или опустел) через словарь id задачи -> номер строки.
+
+    Погода хранится отдельно от задач: (место, дата) -> прогноз; set_weather
+    перерисовывает только карточки этого места.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_by_id = {}
+        self._headers = False
+        self._empty_text = ""
+        self._weather = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == ROW_KIND_ROLE:
+            return row["kind"]
+        if role == Qt.DisplayRole:
+            return row["task"]["text"] if row["kind"] == "task" else row["text"]
+        if role == TASK_ROLE:
+            return row.get("task")
+        if role == COLOR_ROLE:
+            return row.get("color")
+        if role == DATE_ROLE:
+            return row.get("date")
+        if role == WEATHER_ROLE:
+            location = row.get("task", {}).get("location")
+            return self._weather.get((_place(location), row["date"])) if location else None
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled if index.isValid() else Qt.NoItemFlags
+
+    def set_days(self, days, headers, empty_text: str):
+        """days: [(date, header_text, [task, ...]), ...] в порядке отображения."""
+        rows = []
+        for date, header_text, tasks in days:
+            if headers:
+                rows.append({"kind": "header", "date": date, "text": header_text})
+            for idx, t in enumerate(tasks):
+                rows.append({"kind": "task", "date": date, "task": dict(t),
+                             "color": MARKER_COLORS[idx % len(MARKER_COLORS)]})
+        self._headers = headers
+        self._empty_text = empty_text
+        self._weather = {}
+        if not rows:
+            rows.append(self._empty_row())
+        self.beginResetModel()
+        self._rows = rows
+        self._reindex(0)
+        self.endResetModel()
+
+    def locations(self):
+        """Различные места задач в показанных строках (для загрузки погоды)."""
+        seen = {}
+        for r in self._rows:
+            location = r["kind"] == "task" and r["task"].get("location")
+            if location:
+                seen.setdefault(_place(location), location)
+        return list(seen.values())
+
+    def set_weather(self, location: str, rows: dict):
+        """rows: {"YYYY-MM-DD": прогноз} для места location."""
+        place = _place(location)
+        for date, forecast in rows.items():
+            self._weather[(place, date)] = forecast
+        for row, r in enumerate(self._rows):
+            if (r["kind"] == "task" and r["date"] in rows
+                    and _place(r["task"].get("location") or "") == place):
+                idx = self.index(row)
+                self.dataChanged.emit(idx, idx, [WEATHER_ROLE])
+
+    # ---- Точечные обновления ----
+    def _empty_row(self):
+        return {"kind": "empty", "text": self._empty_text}
+
+    def _reindex(self, start: int):
+        """Пересчитать номера строк задач начиная со start (после вставки/удаления)."""
+        if start == 0:
+            self._row_by_id = {}
+        for row in range(start, len(self._rows)):
+            r = self._rows[row]
+            if r["kind"] == "task":
+                self._row_by_id[r["task"]["id"]] = row
+
+    def update_task(self, task_id: int, **fields):
+        row = self._row_by_id.get(task_id)
+        if row is None:
+            return
+        self._rows[row]["task"].update(fields)
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx, [Qt.DisplayRole, TASK_ROLE])
+
+    def insert_task(self, task: dict, header_text: str = ""):
+        """Добавить задачу в конец её дня; день (с заголовком) создаётся при необходимости."""
+        date = task["task_date"]
+        if self._rows and self._rows[0]["kind"] == "empty":
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            del self._rows[0]
+            self.endRemoveRows()
+
+        # Строки идут по возрастанию даты: ищем конец нужного дня
+        row, count = 0, 0
+        while row < len(self._rows) and self._rows[row]["date"] <= date:
+            if self._rows[row]["date"] == date and self._rows[row]["kind"] == "task":
+                count += 1
+            row += 1
+        new_rows = []
+        if self._headers and not any(r["date"] == date for r in self._rows[max(0, row - 1):row]):
+            new_rows.append({"kind": "header", "date": date, "text": header_text})
+        new_rows.append({"kind": "task", "date": date, "task": dict(task),
+                         "color": MARKER_COLORS[count % len(MARKER_COLORS)]})
+
+        self.beginInsertRows(QModelIndex(), row, row + len(new_rows) - 1)
+        self._rows[row:row] = new_rows
+        self._reindex(row)
+        self.endInsertRows()
+
+    def remove_task(self, task_id: int):
+        row = self._row_by_id.pop(task_id, None)
+        if row is None:
+            return
+        first = row
+        # Последняя задача дня — убираем и заголовок
+        if (self._headers and row > 0 and self._rows[row - 1]["kind"] == "header"
+                and (row + 1 >= len(self._rows) or self._rows[row + 1]["kind"] == "header")):
+            first = row - 1
+        self.beginRemoveRows(QModelIndex(), first, row)
+        del self._rows[first:row + 1]
+        self._reindex(first)
+        self.endRemoveRows()
+        if not self._rows:
+            self.beginInsertRows(QModelIndex(), 0, 0)
+            self._rows.append(self._empty_row())
+            self.endInsertRows()
+
+
+class ScheduleDelegate(QStyledItemDelegate):
+    """Рисует карточки задач, заголовки дней и маркеры без виджетов.
+
+    QListView вызывает paint() только для видимых строк, поэтому стоимость
+    перерисовки не зависит от числа задач в неделе/месяце.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.colors = THEMES["dark"]
+        # sizeHint вызывается для каждой строки при раскладке — высоту строки
+        # считаем один раз на шрифт
+        self._line_heights = {}
+
+    def set_theme(self, theme: str):
+        self.colors = THEMES.get(theme, THEMES["dark"])
+
+    def _line_height(self, font):
+        key = font.key()
+        h = self._line_heights.get(key)
+        if h is None:
+            h = self._line_heights[key] = QFontMetrics(font).height()
+        return h
+
+    def sizeHint(self, option, index):
+        line = self._line_height(option.font)
+        return QSize(option.rect.width(), line + 2 * CARD_PADDING_V + CARD_GAP)
+
+    def paint(self, painter: QPainter, option, index):
+        kind = index.data(ROW_KIND_ROLE)
+        c = self.colors
+        painter.save()
+        # Тень не выходит за строку: иначе частичная перерисовка соседа её обрежет
+        painter.setClipRect(option.rect)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(option.font)
+        rect = option.rect.adjusted(SIDE_MARGIN, 0, -SIDE_MARGIN, 0)
+
+        if kind == "header":
+            painter.setPen(QColor(c["muted"]))
+            # Заголовок прижат к своим карточкам (к низу строки)
+            text_rect = rect.adjusted(4, 0, -4, -2)
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignBottom, index.data(Qt.DisplayRole))
+        elif kind == "empty":
+            painter.setPen(QColor(c["muted"]))
+            painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter | Qt.TextWordWrap, index.data(Qt.DisplayRole))
+        else:
+            self._paint_card(painter, option, index, rect)
+        painter.restore()
+
+    def _paint_card(self, painter, option, index, rect):
+        c = self.colors
+        task = index.data(TASK_ROLE)
+        card = QRectF(rect.adjusted(0, CARD_GAP // 2, 0, -(CARD_GAP - CARD_GAP // 2)))
+        radius = c["radius"]
+        hover = bool(option.state & QStyle.State_MouseOver)
+
+        # Тень — закешированная картинка (или плоская/никакой, по настройке)
+        draw_shadow(painter, card, radius, SHADOW_BLUR, 2, c["shadow"])
+
+        painter.setPen(QPen(QColor(c["border_hover"] if hover else c["border"]), 1))
+        painter.setBrush(QColor(c["card_hover"] if hover else c["card"]))
+        painter.drawRoundedRect(card.adjusted(0.5, 0.5, -0.5, -0.5), radius, radius)
+
+        # Маркер
+        marker = QRectF(card.left() + CARD_PADDING_H, card.top() + CARD_PADDING_V,
+                        MARKER_WIDTH, card.height() - 2 * CARD_PADDING_V)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(index.data(COLOR_ROLE)))
+        painter.drawRoundedRect(marker, 3, 3)
+
+        # Текст (зачёркнут и приглушён для выполненных)
+        font = painter.font()
+        font.setStrikeOut(bool(task["done"]))
+        painter.setFont(font)
+        painter.setPen(QColor(c["done"] if task["done"] else c["text"]))
+        text_rect = card.adjusted(CARD_PADDING_H + MARKER_WIDTH + 10, 0, -CARD_PADDING_H, 0)
+
+        # Место и погода — справа, не больше половины карточки
+        if task.get("location"):
+            font.setStrikeOut(False)
+            metrics = QFontMetrics(font)
+            side = metrics.elidedText(weather_text(task["location"], index.data(WEATHER_ROLE)),
+                                      Qt.ElideRight, int(text_rect.width() / 2))
+            side_width = metrics.horizontalAdvance(side)
+            painter.setFont(font)
+            painter.setPen(QColor(c["muted"]))
+            painter.drawText(text_rect, Qt.AlignRight | Qt.AlignVCenter, side)
+            text_rect = text_rect.adjusted(0, 0, -(side_width + 10), 0)
+            font.setStrikeOut(bool(task["done"]))
+            painter.setFont(font)
+            painter.setPen(QColor(c["done"] if task["done"] else c["text"]))
+
+        text = QFontMetrics(font).elidedText(task["text"], Qt.ElideRight, int(text_rect.width()))
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+
+
+class ScheduleView(QListView):
+    """Виртуализированный список расписания (день/неделя/месяц)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover, True)
@@ -0,0 +1,94 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from backend.database import search_tasks
+
+# Пауза после последнего нажатия клавиши перед запросом
+DEBOUNCE_MS = 150
+# Больше строк в правой панели всё равно никто не пролистает
+RESULT_LIMIT = 500
+
+
+class _SearchSignals(QObject):
+    # (номер запроса, задачи или исключение) — emit из рабочего потока,
+    # Qt доставляет в GUI-поток через очередь событий
+    done = Signal(int, object)
+
+
+class _SearchJob(QRunnable):
+    def __init__(self, signals: _SearchSignals, seq: int, params: dict):
+        super().__init__()
+        # Без родителя: живёт, пока на него ссылается задание, даже если
+        # окно (и контроллер) уже закрыты
+        self.signals = signals
+        self.seq = seq
+        self.params = params
+
+    def run(self):
+        try:
+            result = search_tasks(limit=RESULT_LIMIT, **self.params)
+        except Exception as e:  # ошибка хранилища не должна ронять пул потоков
+            result = e
+        try:
+            self.signals.done.emit(self.seq, result)
+        except RuntimeError:
+            # Приложение завершается: получателя уже нет
+            pass
+
+
+class SearchController(QObject):
+    """Поиск по задачам вне GUI-потока.
+
+    request() перезапускает таймер (ввод с клавиатуры), run_now() ищет сразу.
+    Запросы выполняются в QThreadPool; каждый получает номер, и результат
+    устаревшего запроса (пользователь успел ввести ещё символ) отбрасывается.
+    Первый запрос строит индекс (около секунды на 100k задач) — warm_up()
+    делает это заранее.
+    """
+
+    # Только для актуального запроса
+    results = Signal(list)
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._seq = 0
+        self._params = None
+        self._pool = QThreadPool.globalInstance()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self.run_now)
+        self._signals = _SearchSignals()
+        self._signals.done.connect(self._on_done)
+
+    def active(self) -> bool:
+        return self._params is not None
+
+    def request(self, params: dict | None):
+        """params: аргументы search_tasks (query, done, start, end) или None — поиск выключен."""
+        self._params = params
+        if params is None:
+            # Ответы ещё не завершённых запросов больше не нужны
+            self._seq += 1
+            self._timer.stop()
+            return
+        self._timer.start()
+
+    def run_now(self):
+        self._timer.stop()
+        if self._params is None:
+            return
+        self._seq += 1
+        self._pool.start(_SearchJob(self._signals, self._seq, dict(self._params)))
+
+    def warm_up(self):
+        # Пустой запрос: только загрузка/сборка индекса в фоне
+        self._pool.start(_SearchJob(self._signals, -1, {"query": ""}))
+
+    def _on_done(self, seq: int, result):
+        if seq != self._seq or self._params is None:
+            return
+        if isinstance(result, Exception):
+            self.failed.emit(str(result))
+        else:
+            self.results.emit(result)
@@ -0,0 +1,150 @@
+from functools import lru_cache
+
+from PySide6.QtCore import QEvent, QObject, QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import (
+    QGraphicsBlurEffect, QGraphicsPixmapItem, QGraphicsScene, QStyle, QStyleOption, QWidget,
+)
+
+# Качество теней (настройка "shadows" в settings.json):
+#   "high" — размытая тень из закешированной nine-slice картинки
+#   "low"  — плоский полупрозрачный прямоугольник со смещением, без размытия
+#   "off"  — без теней (слабые машины)
+QUALITIES = ("off", "low", "high")
+DEFAULT_QUALITY = "high"
+
+_quality = DEFAULT_QUALITY
+
+
+def set_quality(value: str):
+    global _quality
+    _quality = value if value in QUALITIES else DEFAULT_QUALITY
+
+
+@lru_cache(maxsize=64)
+def _shadow_pixmap(radius: int, blur: int, rgba: int, dpr: float) -> QPixmap:
+    """Размытая тень минимального размера: углы (blur + radius) и центр 1px.
+
+    Размытие считается один раз на сочетание радиуса, размытия, цвета и DPR;
+    отрисовка любой карточки — 9 drawPixmap без offscreen-прохода.
+    """
+    corner = blur + radius
+    side = int((2 * corner + 1) * dpr)
+    src = QImage(side, side, QImage.Format_ARGB32_Premultiplied)
+    src.fill(Qt.transparent)
+    p = QPainter(src)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.scale(dpr, dpr)
+    p.setPen(Qt.NoPen)
+    p.setBrush(QColor.fromRgba(rgba))
+    p.drawRoundedRect(QRectF(blur, blur, 2 * radius + 1, 2 * radius + 1), radius, radius)
+    p.end()
+
+    # Тот же blur, что у QGraphicsDropShadowEffect, но один раз
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(src))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur * dpr)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+    out = QImage(side, side, QImage.Format_ARGB32_Premultiplied)
+    out.fill(Qt.transparent)
+    p = QPainter(out)
+    scene.render(p, QRectF(0, 0, side, side), QRectF(0, 0, side, side))
+    p.end()
+
+    pixmap = QPixmap.fromImage(out)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def draw_shadow(painter: QPainter, rect: QRectF, radius: int, blur: int, y_offset: int, color: QColor):
+    """Нарисовать тень под прямоугольником rect с учётом текущего качества."""
+    if _quality == "off":
+        return
+    rect = QRectF(rect)
+    if _quality == "low" or blur <= 0:
+        painter.save()
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(rect.translated(0, y_offset), radius, radius)
+        painter.restore()
+        return
+
+    dpr = painter.device().devicePixelRatioF()
+    pixmap = _shadow_pixmap(radius, blur, color.rgba(), dpr)
+    corner = blur + radius
+    target = rect.adjusted(-blur, -blur, blur, blur).translated(0, y_offset)
+    # Углы не больше половины цели — для совсем маленьких прямоугольников
+    cx = min(corner, target.width() / 2)
+    cy = min(corner, target.height() / 2)
+    # Колонки/строки цели и источника (источник — в физических пикселях)
+    tx = (target.left(), target.left() + cx, target.right() - cx, target.right())
+    ty = (target.top(), target.top() + cy, target.bottom() - cy, target.bottom())
+    full = (2 * corner + 1) * dpr
+    sx = (0, cx * dpr, full - cx * dpr, full)
+    sy = (0, cy * dpr, full - cy * dpr, full)
+    for i in range(3):
+        for j in range(3):
+            t = QRectF(tx[i], ty[j], tx[i + 1] - tx[i], ty[j + 1] - ty[j])
+            if t.width() <= 0 or t.height() <= 0:
+                continue
+            s = QRectF(sx[i], sy[j], sx[i + 1] - sx[i], sy[j + 1] - sy[j])
+            painter.drawPixmap(t, pixmap, s)
+
+
+class _ShadowSpec:
+    __slots__ = ("radius", "blur", "y_offset", "color")
+
+    def __init__(self, radius, blur, y_offset, color):
+        self.radius = radius
+        self.blur = blur
+        self.y_offset = y_offset
+        self.color = color
+
+
+class _GeometryWatcher(QObject):
+    # Тень выходит за границы виджета — при сдвиге/ресайзе перерисовываем родителя
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide):
+            parent = obj.parentWidget()
+            if isinstance(parent, ShadowHost):
+                parent.update()
+        return False
+
+
+_watcher = None
+
+
+def set_shadow(widget: QWidget, radius: int = 12, y_offset: int = 4, blur: int = 22, color=(0, 0, 0, 40)):
+    """Пометить виджет: тень под ним рисует родитель-ShadowHost."""
+    global _watcher
+    if _watcher is None:
+        _watcher = _GeometryWatcher()
+    widget._shadow = _ShadowSpec(radius, blur, y_offset, QColor(*color))
+    widget.installEventFilter(_watcher)
+
+
+class ShadowHost(QWidget):
+    """Контейнер, рисующий тени дочерних виджетов поверх своего фона.
+
+    Замена QGraphicsDropShadowEffect: эффект заставляет виджет и всех его
+    потомков рендериться offscreen с размытием на каждой перерисовке, а здесь
+    тень — готовая картинка, которая рисуется до отрисовки детей.
+    """
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        # Фон из stylesheet (для наследников QWidget сам не рисуется)
+        opt = QStyleOption()
+        opt.initFrom(self)
+        self.style().drawPrimitive(QStyle.PE_Widget, opt, painter, self)
+        if _quality == "off":
+            return
+        painter.setRenderHint(QPainter.Antialiasing)
+        for child in self.findChildren(QWidget, options=Qt.FindDirectChildrenOnly):
+            spec = getattr(child, "_shadow", None)
+            if spec is None or not child.isVisible():
+                continue
+            draw_shadow(painter, QRectF(child.geometry()), spec.radius, spec.blur, spec.y_offset, spec.color)
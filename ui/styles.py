@@ -0,0 +1,394 @@
+# Таблицы стилей тем — готовые строки уровня модуля: окно только переключает
+# их, не собирая заново, а поштучные стили виджетов не используются (цвета
+# карточек и маркеров рисует ScheduleDelegate, ui/schedule_view.py).
+
+LIGHT = """
+/* Base: светлая, минималистичная палитра */
+QWidget { font-family: 'Inter', 'Segoe UI', system-ui, -apple-system, Arial; font-size: 14px; color: #1F2937; background: #F8FAFC; }
+
+/* Header */
+#headerBar { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
+#headerBar QLabel#appTitle { color: #111827; font-size: 20px; font-weight: 700; letter-spacing: 0.2px; }
+QPushButton#profileButton { background: #F3F4F6; border: 1px solid #E5E7EB; color: #6B7280; border-radius: 18px; padding: 6px 10px; }
+QPushButton#profileButton:hover { background: #E5E7EB; }
+
+/* Segmented control */
+QPushButton#segButton { background: #F3F4F6; border: 1px solid #E5E7EB; color: #4B5563; border-radius: 8px; padding: 6px 12px; }
+QPushButton#segButton:hover { background: #EAECEF; }
+QPushButton#segButton:checked { background: #EEF2FF; color: #4F46E5; border-color: #C7D2FE; }
+
+/* Language Combo — improved pastel/rounded design */
+QComboBox#langCombo {
+    background: #FFFFFF;
+    border: 1.5px solid #D8DAE0;
+    color: #374151;
+    border-radius: 12px;
+    padding: 8px 40px 8px 14px;
+    min-width: 150px;
+    combobox-popup: 0;
+}
+
+QComboBox#langCombo:hover {
+    background: #F4F6FB;
+    border-color: #C7D2FE;
+}
+
+QComboBox#langCombo:focus {
+    border-color: #A5B4FC;
+}
+
+QComboBox#langCombo:disabled {
+    color: #9CA3AF;
+    background: #F3F4F6;
+}
+
+/* Dropdown arrow container */
+QComboBox#langCombo::drop-down {
+    subcontrol-origin: padding;
+    subcontrol-position: top right;
+    width: 32px;
+    border-left: 1px solid #D8DAE0;
+    background: #F4F6FB;
+    border-top-right-radius: 12px;
+    border-bottom-right-radius: 12px;
+}
+
+QComboBox#langCombo::drop-down:hover {
+    background: #ECEFFF;
+    border-left: 1px solid #C7D2FE;
+}
+
+/* Arrow icons */
+QComboBox#langCombo::down-arrow {
+    image: url(ui/assets/chevron-down.svg);
+    width: 14px;
+    height: 14px;
+    margin-top: 1px;
+}
+
+QComboBox#langCombo::down-arrow:on {
+    image: url(ui/assets/chevron-up.svg);
+    width: 14px;
+    height: 14px;
+    margin-top: 1px;
+}
+
+/* Opened state */
+QComboBox#langCombo:on {
+    border-color: #A5B4FC;
+}
+
+QComboBox#langCombo::drop-down:on {
+    background: #EEF2FF;
+    border-left: 1px solid #A5B4FC;
+}
+
+/* Popup list */
+QComboBox#langCombo QAbstractItemView {
+    background: #FFFFFF;
+    border: 1.5px solid #D8DAE0;
+    border-radius: 12px;
+    outline: none;
+    padding: 6px 0;
+}
+
+QComboBox#langCombo QAbstractItemView::item {
+    padding: 10px 14px;
+    color: #111827;
+    border-radius: 6px;
+}
+
+QComboBox#langCombo QAbstractItemView::item:hover {
+    background: #F4F6FB;
+}
+
+QComboBox#langCombo QAbstractItemView::item:selected {
+    background: #EEF2FF;
+    color: #4F46E5;
+}
+
+/* Left column */
+#leftColumn { }
+QCalendarWidget#monthCalendar { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
+QCalendarWidget#monthCalendar QWidget#qt_calendar_navigationbar { background: #FFFFFF; }
+QCalendarWidget#monthCalendar QToolButton { color: #374151; background: transparent; border: none; padding: 6px; }
+QCalendarWidget#monthCalendar QToolButton:hover { background: #F3F4F6; border-radius: 6px; }
+QCalendarWidget#monthCalendar QAbstractItemView:enabled { selection-background-color: #EDE9FE; selection-color: #4F46E5; background: #FFFFFF; color: #111827; outline: none; }
+
+#tasksPanel { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
+#tasksPanel QLabel#sectionTitle { font-weight: 700; color: #111827; }
+QListView#tasksList { border: 1px solid #E5E7EB; border-radius: 10px; padding: 6px; background: #FFFFFF; }
+QListView#tasksList::item { padding: 8px 10px; }
+QListView#tasksList::item:hover { background: #F9FAFB; }
+QListView#tasksList::item:selected { background: #EEF2FF; color: #4F46E5; }
+QListView#tasksList::item:alternate { background: #FAFAFA; }
+
+/* Явный квадратный чекбокс у задач */
+QListView#tasksList::indicator {
+    width: 18px;
+    height: 18px;
+    margin-right: 8px; /* отступ от текста */
+}
+QListView#tasksList::indicator:unchecked {
+    border: 2px solid #D1D5DB; /* явная рамка */
+    background: #FFFFFF;       /* белый фон */
+    border-radius: 3px;        /* почти квадратный, без сильного скругления */
+}
+QListView#tasksList::indicator:unchecked:hover {
+    border-color: #9CA3AF;
+    background: #F9FAFB;
+}
+QListView#tasksList::indicator:checked {
+    border: 2px solid #8B5CF6;
+    background: #8B5CF6;      /* заливка акцентом; галочка будет контрастной */
+    border-radius: 3px;
+}
+QListView#tasksList::indicator:checked:hover {
+    background: #7C3AED;
+    border-color: #7C3AED;
+}
+
+/* Right column */
+#dayHeader { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 12px; }
+QLabel#sectionTitle { font-weight: 700; color: #111827; }
+QLabel#muted { color: #6B7280; }
+#dayScroll { border: 1px solid #E5E7EB; border-radius: 12px; background: #FFFFFF; }
+
+/* Search bar */
+QLineEdit#searchBox { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 10px; padding: 7px 10px; }
+QLineEdit#searchBox:focus { border-color: #C7D2FE; }
+QComboBox#searchFilter { background: #FFFFFF; border: 1px solid #E5E7EB; color: #374151; border-radius: 10px; padding: 6px 10px; }
+QComboBox#searchFilter:hover { border-color: #C7D2FE; }
+QComboBox#searchFilter QAbstractItemView { background: #FFFFFF; border: 1px solid #E5E7EB; selection-background-color: #EEF2FF; selection-color: #4F46E5; }
+/* Карточки событий рисует ScheduleDelegate (ui/schedule_view.py, THEMES) */
+
+/* FAB */
+QPushButton#fabAdd { background: #8B5CF6; color: #FFFFFF; border: none; border-radius: 24px; font-size: 20px; font-weight: 700; padding: 8px 14px; }
+QPushButton#fabAdd:hover { background: #7C3AED; }
+QPushButton#fabAdd:pressed { background: #6D28D9; }
+
+/* Add Task Dialog */
+QDialog#addDialog { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 14px; }
+QDialog#addDialog QLabel#addTitle { font-size: 16px; font-weight: 700; color: #111827; }
+QDialog#addDialog QLabel#addHint { color: #6B7280; }
+QLineEdit#addInput { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 10px; padding: 8px 10px; }
+QLineEdit#addInput:focus { border-color: #C7D2FE; box-shadow: 0 0 0 3px rgba(99,102,241,0.15); }
+QPushButton#btnPrimary { background: #8B5CF6; color: #FFFFFF; border: none; border-radius: 10px; padding: 8px 14px; font-weight: 600; }
+QPushButton#btnPrimary:hover { background: #7C3AED; }
+QPushButton#btnPrimary:pressed { background: #6D28D9; }
+QPushButton#btnPrimary:disabled { background: #E5E7EB; color: #9CA3AF; }
+QPushButton#btnSecondary { background: #F3F4F6; color: #374151; border: 1px solid #E5E7EB; border-radius: 10px; padding: 8px 14px; }
+QPushButton#btnSecondary:hover { background: #EAECEF; }
+
+/* Confirm Dialog (удаление) */
+QDialog#confirmDialog { background: #FFFFFF; border: 1px solid #E5E7EB; border-radius: 14px; }
+QDialog#confirmDialog QLabel#confirmTitle { font-size: 16px; font-weight: 700; color: #111827; }
+QDialog#confirmDialog QLabel#confirmMessage { color: #374151; }
+QPushButton#btnDanger { background: #EF4444; color: #FFFFFF; border: none; border-radius: 10px; padding: 8px 14px; font-weight: 600; }
+QPushButton#btnDanger:hover { background: #DC2626; }
+QPushButton#btnDanger:pressed { background: #B91C1C; }
+
+/* Scrollbars (light) */
+QScrollBar:vertical { background: transparent; width: 10px; margin: 2px; }
+QScrollBar::handle:vertical { background: #E5E7EB; min-height: 24px; border-radius: 5px; }
+QScrollBar::handle:vertical:hover { background: #D1D5DB; }
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0; }
+QScrollBar:horizontal { background: transparent; height: 10px; margin: 2px; }
+QScrollBar::handle:horizontal { background: #E5E7EB; min-width: 24px; border-radius: 5px; }
+QScrollBar::handle:horizontal:hover { background: #D1D5DB; }
+QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal { width: 0; }
+
+QPushButton#themeButton {
+    background: #F3F4F6;
+    color: #6B7280;
+    border: 1px solid #E5E7EB;
+    border-radius: 10px;
+    padding: 6px 10px;
+}
+QPushButton#themeButton:hover { background: #EAECEF; }
+
+/* Оверлей плавной смены темы (toggle_theme) */
+QWidget#themeOverlay { background: #000000; }
+"""
+
+DARK = """
+/* AMOLED DARK THEME — ultra deep black + subtle animations */
+QWidget { 
+    font-family: 'Inter', 'Segoe UI', system-ui, -apple-system, Arial; 
+    font-size: 14px; 
+    color: #E5E7EB; 
+    background: #000000;
+}
+
+/* HEADER */
+#headerBar { background: #000000; border: 1px solid #1A1A1A; border-radius: 14px; }
+#headerBar QLabel#appTitle { color: #FFFFFF; }
+
+/* SEGMENTED BUTTONS */
+QPushButton#segButton { 
+    background: #0D0D0D;
+    border: 1px solid #1F1F1F;
+    color: #D1D5DB;
+    border-radius: 10px;
+    padding: 6px 12px;
+}
+QPushButton#segButton:hover { background: #1A1A1A; }
+QPushButton#segButton:checked { 
+    background: #4F46E5;
+    color: #FFFFFF;
+    border-color: #6366F1;
+}
+
+/* LANGUAGE SELECTOR */
+QComboBox#langCombo {
+    background: #0D0D0D;
+    border: 1.5px solid #4F46E5;
+    color: #E5E7EB;
+    border-radius: 12px;
+    padding: 8px 40px 8px 14px;
+    min-width: 150px;
+    combobox-popup: 0;
+}
+QComboBox#langCombo:hover {
+    background: #111111;
+    border-color: #6366F1;
+}
+QComboBox#langCombo::drop-down {
+    background: #0D0D0D;
+    width: 36px;
+    border: none;
+    border-top-right-radius: 12px;
+    border-bottom-right-radius: 12px;
+}
+QComboBox#langCombo::drop-down:hover {
+    background: #111111;
+}
+QComboBox#langCombo::down-arrow {
+    image: url(ui/assets/chevron-down-white.svg);
+    width: 14px;
+    height: 14px;
+    margin-top: 1px;
+}
+QComboBox#langCombo::down-arrow:on {
+    image: url(ui/assets/chevron-up-white.svg);
+    width: 14px;
+    height: 14px;
+    margin-top: 1px;
+}
+
+QComboBox#langCombo QAbstractItemView { 
+    background: #000000; 
+    color: #FFFFFF; 
+    border: 1px solid #1F1F1F; 
+    selection-background-color: #1A1A1A;
+}
+
+/* TASKS PANEL */
+#tasksPanel { background: #000000; border: 1px solid #1F1F1F; border-radius: 14px; }
+
+QListView#tasksList {
+    background: #000000;
+    border: 1px solid #1A1A1A;
+    color: #F1F5F9;
+}
+QListView#tasksList::item:hover { background: #111111; }
+QListView#tasksList::item:selected { background: #1A1A1A; }
+QListView#tasksList::item {
+    padding: 8px 10px;
+}
+QListView#tasksList::item:alternate {
+    background: #080808;
+}
+
+/* CHECKBOXES */
+QListView#tasksList::indicator {
+    width: 18px;
+    height: 18px;
+    border-radius: 4px;
+}
+QListView#tasksList::indicator:unchecked {
+    background: #000000;
+    border: 2px solid #3A3A3A;
+}
+QListView#tasksList::indicator:checked {
+    background: #6366F1;
+    border: 2px solid #6366F1;
+}
+
+/* DAY HEADER */
+#dayHeader { background: #000000; border: 1px solid #1A1A1A; border-radius: 14px; }
+
+/* EVENT CARDS — рисует ScheduleDelegate (ui/schedule_view.py, THEMES) */
+
+/* SEARCH BAR */
+QLineEdit#searchBox {
+    background: #0D0D0D;
+    border: 1px solid #1F1F1F;
+    color: #E5E7EB;
+    border-radius: 10px;
+    padding: 7px 10px;
+}
+QLineEdit#searchBox:focus { border-color: #4F46E5; }
+QComboBox#searchFilter {
+    background: #0D0D0D;
+    border: 1px solid #1F1F1F;
+    color: #E5E7EB;
+    border-radius: 10px;
+    padding: 6px 10px;
+}
+QComboBox#searchFilter:hover { border-color: #6366F1; }
+QComboBox#searchFilter QAbstractItemView {
+    background: #000000;
+    color: #FFFFFF;
+    border: 1px solid #1F1F1F;
+    selection-background-color: #4F46E5;
+}
+
+/* FAB */
+QPushButton#fabAdd {
+    background: #6366F1;
+    color: #FFFFFF;
+    border-radius: 24px;
+    font-size: 20px;
+    font-weight: bold;
+}
+QPushButton#fabAdd:hover {
+    background: #4F46E5;
+}
+QPushButton#fabAdd:pressed {
+    background: #4338CA;
+}
+
+/* THEME BUTTON */
+QPushButton#themeButton {
+    background: #0D0D0D;
+    border: 1px solid #1F1F1F;
+    color: #E5E7EB;
+    border-radius: 10px;
+    padding: 6px 10px;
+}
+QPushButton#themeButton:hover {
+    background: #1A1A1A;
+}
+
+/* SCROLLBAR */
+QScrollBar:vertical {
+    background: transparent;
+    width: 10px;
+}
+QScrollBar::handle:vertical {
+    background: #1F1F1F;
+    border-radius: 4px;
+    min-height: 24px;
+}
+QScrollBar::handle:vertical:hover { background: #333333; }
+
+/* Оверлей плавной смены темы (toggle_theme) */
+QWidget#themeOverlay { background: #000000; }
+"""
+
+THEMES = {"light": LIGHT.strip(), "dark": DARK.strip()}
+
+
+def stylesheet(theme: str) -> str:
+    return THEMES.get(theme, THEMES["dark"])
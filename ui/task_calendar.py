@@ -0,0 +1,82 @@
+from PySide6.QtCore import QDate, QRectF, Qt
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import QCalendarWidget
+
+from backend.database import count_tasks_range
+
+# Цвета отметок дня: есть невыполненные / всё выполнено
+BADGE_COLORS = {
+    "light": {"open": "#6366F1", "done": "#10B981", "text": "#6B7280"},
+    "dark": {"open": "#818CF8", "done": "#34D399", "text": "#9CA3AF"},
+}
+
+
+def _iso(d: QDate) -> str:
+    return d.toString("yyyy-MM-dd")
+
+
+class TaskCalendar(QCalendarWidget):
+    """Календарь с отметкой дней, в которых есть задачи (точка + «выполнено/всего»).
+
+    Счётчики берутся одним запросом count_tasks_range на всю видимую сетку
+    месяца и кешируются до изменения задач в этом диапазоне (invalidate),
+    так что перерисовка ячеек не обращается к хранилищу.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.colors = BADGE_COLORS["dark"]
+        # (год, месяц) -> (начало, конец, {"YYYY-MM-DD": (всего, выполнено)})
+        self._pages = {}
+        self._badge_font = None
+
+    def set_theme(self, theme: str):
+        self.colors = BADGE_COLORS.get(theme, BADGE_COLORS["dark"])
+        self.updateCells()
+
+    def _page_range(self, year: int, month: int):
+        # Сетка показывает 6 недель: хвост прошлого и начало следующего месяца
+        first = QDate(year, month, 1)
+        lead = (first.dayOfWeek() - self.firstDayOfWeek().value) % 7 or 7
+        start = first.addDays(-lead)
+        return _iso(start), _iso(start.addDays(41))
+
+    def _counts(self):
+        key = (self.yearShown(), self.monthShown())
+        page = self._pages.get(key)
+        if page is None:
+            start, end = self._page_range(*key)
+            page = self._pages[key] = (start, end, count_tasks_range(start, end))
+        return page[2]
+
+    def invalidate(self, date_str: str | None = None):
+        """Сбросить счётчики страниц, в которые попадает date_str (или все)."""
+        if date_str is None:
+            self._pages.clear()
+        else:
+            for key, (start, end, _) in list(self._pages.items()):
+                if start <= date_str <= end:
+                    del self._pages[key]
+        self.updateCells()
+
+    def paintCell(self, painter: QPainter, rect, date: QDate):
+        super().paintCell(painter, rect, date)
+        counts = self._counts().get(_iso(date))
+        if not counts:
+            return
+        total, done = counts
+        c = self.colors
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        # Точка у левого нижнего угла ячейки
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(c["done"] if done == total else c["open"]))
+        painter.drawEllipse(QRectF(rect.left() + 3, rect.bottom() - 6, 4, 4))
+        # «выполнено/всего» мелким шрифтом в правом верхнем углу
+        if self._badge_font is None:
+            self._badge_font = QFont(painter.font())
+            self._badge_font.setPixelSize(8)
+        painter.setFont(self._badge_font)
+        painter.setPen(QColor(c["text"]))
+        painter.drawText(QRectF(rect).adjusted(0, 0, -2, 0), Qt.AlignRight | Qt.AlignTop, f"{done}/{total}")
+        painter.restore()
@@ -0,0 +1,99 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+
+
+class TaskListModel(QAbstractListModel):
+    """Задачи выбранного дня для QListView.
+
+    Модель хранит копии задач (dict из backend.database) и меняется точечно:
+    insert_task / update_task / remove_task шлют rowsInserted, dataChanged и
+    rowsRemoved только для затронутой строки. Полный сброс (set_tasks) нужен
+    лишь при смене дня.
+
+    Изменения от пользователя (чекбокс, редактирование текста) модель
+    применяет к себе и сообщает сигналом taskEdited(task_id, field, value) —
+    сохранение в БД делает окно.
+    """
+    taskEdited = Signal(int, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = []
+
+    # ---- Qt API ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        t = self._tasks[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return t["text"]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if t["done"] else Qt.Unchecked
+        if role == Qt.UserRole:
+            return t["id"]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return (Qt.ItemIsEnabled | Qt.ItemIsSelectable
+                | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        t = self._tasks[index.row()]
+        if role == Qt.CheckStateRole:
+            done = Qt.CheckState(value) == Qt.Checked
+            if done == t["done"]:
+                return False
+            t["done"] = done
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            self.taskEdited.emit(t["id"], "done", done)
+            return True
+        if role == Qt.EditRole:
+            text = str(value).strip()
+            if not text or text == t["text"]:
+                return False
+            t["text"] = text
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            self.taskEdited.emit(t["id"], "text", text)
+            return True
+        return False
+
+    # ---- Точечные обновления ----
+    def set_tasks(self, tasks):
+        self.beginResetModel()
+        self._tasks = [dict(t) for t in tasks]
+        self.endResetModel()
+
+    def row_of(self, task_id: int) -> int:
+        for row, t in enumerate(self._tasks):
+            if t["id"] == task_id:
+                return row
+        return -1
+
+    def insert_task(self, task: dict):
+        row = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.append(dict(task))
+        self.endInsertRows()
+        return self.index(row)
+
+    def update_task(self, task_id: int, **fields):
+        row = self.row_of(task_id)
+        if row < 0:
+            return
+        self._tasks[row].update(fields)
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx)
+
+    def remove_task(self, task_id: int):
+        row = self.row_of(task_id)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tasks[row]
+        self.endRemoveRows()
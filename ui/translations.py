@@ -0,0 +1,126 @@
+from functools import lru_cache
+
+# Строки интерфейса по языкам. Таблица языка собирается при первом обращении
+# (table), так что при старте строится только активный язык.
+
+SUPPORTED = ("ru", "pl", "en")
+
+
+def _ru():
+    return {
+        "seg_day": "День",
+        "seg_week": "Неделя",
+        "seg_month": "Месяц",
+        "tasks_title": "Задачи и заметки",
+        "delete": "Удалить",
+        "delete_tooltip": "Удалить выбранную задачу",
+        "schedule_title": "Расписание дня",
+        "fab_tooltip": "Добавить задачу",
+        "empty_day": "На этот день нет событий. Нажмите + чтобы добавить.",
+        "empty_week": "На эту неделю нет событий. Нажмите + чтобы добавить.",
+        "empty_month": "В этом месяце пока нет событий. Нажмите + чтобы добавить.",
+        "delete_title": "Удалить задачу",
+        "delete_message": "Удалить «{task}»? Это действие нельзя отменить.",
+        "cancel": "Отмена",
+        "this_task": "эту задачу",
+        "add_title": "Новая задача",
+        "add_hint": "Введите текст задачи и нажмите Добавить",
+        "add_placeholder": "Например: Купить продукты в 18:00",
+        "add_location_placeholder": "Место (необязательно): например, Краков",
+        "add_confirm": "Добавить",
+        "week_range": "Неделя: {start} – {end}",
+        "save_error_title": "Ошибка сохранения",
+        "save_error": "Не удалось сохранить задачи: {error}\nИзменения сохранятся при следующей успешной записи.",
+        "search_placeholder": "Поиск задач…",
+        "search_any_status": "Все",
+        "search_open": "Невыполненные",
+        "search_done": "Выполненные",
+        "search_everywhere": "За всё время",
+        "search_in_view": "В показанном периоде",
+        "search_found": "Найдено: {n}",
+        "search_empty": "Ничего не найдено.",
+        "search_error": "Ошибка поиска: {error}",
+    }
+
+
+def _pl():
+    return {
+        "seg_day": "Dzień",
+        "seg_week": "Tydzień",
+        "seg_month": "Miesiąc",
+        "tasks_title": "Zadania i notatki",
+        "delete": "Usuń",
+        "delete_tooltip": "Usuń wybrane zadanie",
+        "schedule_title": "Plan dnia",
+        "fab_tooltip": "Dodaj zadanie",
+        "empty_day": "Brak wydarzeń na ten dzień. Kliknij + aby dodać.",
+        "empty_week": "Brak wydarzeń w tym tygodniu. Kliknij + aby dodać.",
+        "empty_month": "W tym miesiącu brak wydarzeń. Kliknij + aby dodać.",
+        "delete_title": "Usunąć zadanie",
+        "delete_message": "Usunąć \u00AB{task}\u00BB? Tej operacji nie można cofnąć.",
+        "cancel": "Anuluj",
+        "this_task": "to zadanie",
+        "add_title": "Nowe zadanie",
+        "add_hint": "Wpisz treść zadania i kliknij Dodaj",
+        "add_placeholder": "Np.: Kupić produkty o 18:00",
+        "add_location_placeholder": "Miejsce (opcjonalnie), np. Kraków",
+        "add_confirm": "Dodaj",
+        "week_range": "Tydzień: {start} – {end}",
+        "save_error_title": "Błąd zapisu",
+        "save_error": "Nie udało się zapisać zadań: {error}\nZmiany zostaną zapisane przy następnym udanym zapisie.",
+        "search_placeholder": "Szukaj zadań…",
+        "search_any_status": "Wszystkie",
+        "search_open": "Niewykonane",
+        "search_done": "Wykonane",
+        "search_everywhere": "Cały czas",
+        "search_in_view": "W pokazanym okresie",
+        "search_found": "Znaleziono: {n}",
+        "search_empty": "Nic nie znaleziono.",
+        "search_error": "Błąd wyszukiwania: {error}",
+    }
+
+
+def _en():
+    return {
+        "seg_day": "Day",
+        "seg_week": "Week",
+        "seg_month": "Month",
+        "tasks_title": "Tasks & Notes",
+        "delete": "Delete",
+        "delete_tooltip": "Delete selected task",
+        "schedule_title": "Day schedule",
+        "fab_tooltip": "Add task",
+        "empty_day": "No events for this day. Click + to add.",
+        "empty_week": "No events this week. Click + to add.",
+        "empty_month": "No events this month yet. Click + to add.",
+        "delete_title": "Delete task",
+        "delete_message": "Delete \u00AB{task}\u00BB? This action cannot be undone.",
+        "cancel": "Cancel",
+        "this_task": "this task",
+        "add_title": "New task",
+        "add_hint": "Enter task text and click Add",
+        "add_placeholder": "E.g.: Buy groceries at 6 PM",
+        "add_location_placeholder": "Place (optional), e.g. Kraków",
+        "add_confirm": "Add",
+        "week_range": "Week: {start} – {end}",
+        "save_error_title": "Save failed",
+        "save_error": "Could not save tasks: {error}\nChanges will be written on the next successful save.",
+        "search_placeholder": "Search tasks…",
+        "search_any_status": "All",
+        "search_open": "Open",
+        "search_done": "Done",
+        "search_everywhere": "All dates",
+        "search_in_view": "Shown period",
+        "search_found": "Found: {n}",
+        "search_empty": "Nothing found.",
+        "search_error": "Search failed: {error}",
+    }
+
+
+_LOADERS = {"ru": _ru, "pl": _pl, "en": _en}
+
+
+@lru_cache(maxsize=None)
+def table(lang: str) -> dict:
+    loader = _LOADERS.get(lang)
+    return loader() if loader else {}
@@ -0,0 +1,127 @@
+import threading
+from collections import deque
+
+from PySide6.QtCore import QObject, Signal
+
+from backend.logic import WeatherError, get_weather_range
+
+# Столько же потоков, сколько соединений в пуле WeatherClient
+MAX_THREADS = 4
+
+
+def _key(location: str, start: str, end: str):
+    return " ".join(location.split()).casefold(), start, end
+
+
+class _WeatherSignals(QObject):
+    # (ключ запроса, {дата: прогноз} или WeatherError) — из рабочего потока
+    done = Signal(object, object)
+
+
+class _WeatherJob:
+    def __init__(self, signals: _WeatherSignals, key, location: str, start: str, end: str):
+        self.signals = signals
+        self.key = key
+        self.location = location
+        self.start = start
+        self.end = end
+
+    def run(self):
+        try:
+            result = get_weather_range(self.location, self.start, self.end)
+        except WeatherError as e:
+            result = e
+        except Exception as e:  # ошибка разбора ответа и т. п. — не роняем пул
+            result = WeatherError(str(e))
+        try:
+            self.signals.done.emit(self.key, result)
+        except RuntimeError:
+            # Приложение завершается: получателя уже нет
+            pass
+
+
+class WeatherService(QObject):
+    """Загрузка прогноза вне GUI-потока (backend.logic блокирует до 10+ с).
+
+    request() ставит get_weather_range в очередь своих рабочих потоков;
+    ответ приходит сигналом ready/failed в GUI-поток.
+
+    - Дедупликация: одинаковый запрос (локация, начало, конец), пока первый
+      ещё выполняется, не создаёт второго — оба получат один ответ.
+    - Отмена: cancel_all() (например, при смене дня в календаре) снимает
+      ещё не начатые задания с очереди, а ответы уже идущих отбрасывает.
+      Сам HTTP-запрос прервать нельзя; его результат всё равно попадёт
+      в кеш прогнозов и пригодится следующему запросу.
+    - Потоки — daemon-потоки Python, а не QThreadPool: пул при удалении ждёт
+      свои задания, и закрытие окна висело бы до таймаутов сети (с
+      повторами — больше минуты). Незавершённый запрос просто бросается.
+    """
+
+    # (локация, начало, конец, {"YYYY-MM-DD": прогноз})
+    ready = Signal(str, str, str, object)
+    # (локация, текст ошибки)
+    failed = Signal(str, str)
+
+    def __init__(self, parent=None, max_threads: int = MAX_THREADS):
+        super().__init__(parent)
+        self._max_threads = max_threads
+        self._threads = 0
+        self._idle = 0
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._signals = _WeatherSignals()
+        self._signals.done.connect(self._on_done)
+        # ключ -> [задание, нужен ли ответ, исходная строка локации]
+        self._inflight = {}
+
+    def pending(self) -> int:
+        return sum(1 for _, wanted, _ in self._inflight.values() if wanted)
+
+    def request(self, location: str, start: str, end: str):
+        if not location or not location.strip():
+            return
+        key = _key(location, start, end)
+        entry = self._inflight.get(key)
+        if entry is not None:
+            # Такой запрос уже в работе (возможно, отменённый) — ждём его ответа
+            entry[1] = True
+            return
+        job = _WeatherJob(self._signals, key, location, start, end)
+        self._inflight[key] = [job, True, location]
+        with self._cond:
+            self._queue.append(job)
+            if len(self._queue) > self._idle and self._threads < self._max_threads:
+                self._threads += 1
+                threading.Thread(target=self._work, name="weather", daemon=True).start()
+            self._cond.notify()
+
+    def cancel_all(self):
+        with self._cond:
+            for key, entry in list(self._inflight.items()):
+                if entry[0] in self._queue:
+                    # Ещё не начато — снимаем с очереди
+                    self._queue.remove(entry[0])
+                    del self._inflight[key]
+                else:
+                    entry[1] = False
+
+    def _work(self):
+        # Рабочий поток живёт до конца процесса и ждёт следующих заданий
+        while True:
+            with self._cond:
+                self._idle += 1
+                while not self._queue:
+                    self._cond.wait()
+                self._idle -= 1
+                job = self._queue.popleft()
+            job.run()
+
+    def _on_done(self, key, result):
+        entry = self._inflight.pop(key, None)
+        if entry is None or not entry[1]:
+            return
+        _, start, end = key
+        if isinstance(result, WeatherError):
+            self.failed.emit(entry[2], str(result))
+        else:
+            self.ready.emit(entry[2], start, end, result)